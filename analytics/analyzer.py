@@ -11,8 +11,7 @@ import numpy as np
 import sys
 import os
 import logging
-from datetime import datetime, timedelta
-from collections import defaultdict
+from types import MappingProxyType
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,15 +20,32 @@ from utils.indicators import (
     calculate_rsi, detect_circuit_breaker_events, is_volume_spike,
     calculate_macd, calculate_bollinger_bands
 )
+from utils._njit import njit
+from utils._ranking import top_n_positions
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    from joblib import Parallel, delayed
+except ImportError:
+    Parallel = None
+
+# Logging is configured by the application entry point (main.py)
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _summary_stats(values):
+    """
+    Calculate mean, median, standard deviation, min and max of a float64 array.
+    
+    Args:
+        values (np.ndarray): Non-empty 1-D float64 array
+        
+    Returns:
+        tuple: (mean, median, std, min, max)
+    """
+    return values.mean(), np.median(values), values.std(), values.min(), values.max()
+
+
 class MarketAnalyzer:
     """
     Class for analyzing market data, detecting patterns, and calculating indicators.
@@ -43,21 +59,203 @@ class MarketAnalyzer:
             stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
             company_info (dict): Dictionary mapping company symbols to their information
         """
+        self._latest_cache = {}
+        # Invalidation epoch for the market summary cache, bumped on every
+        # reassignment of stock_data, analysis_results or per-symbol results
+        self._epoch = 0
+        self._summary_cache = {}
         self.stock_data = stock_data
         self.company_info = company_info
         self.analysis_results = {}
         
-        # Initialize storage for specific analyses
-        self.rsi_values = {}
-        self.circuit_breakers = {}
-        self.volume_spikes = {}
+        # Initialize storage for specific analyses. Per-symbol results are
+        # kept as parallel (symbol, value) arrays so that summary reductions
+        # run on contiguous numpy buffers; dict views are built on demand.
+        self._rsi_symbols = np.empty(0, dtype=object)
+        self._rsi_values = np.empty(0, dtype=np.float64)
+        self._circuit_symbols = np.empty(0, dtype=object)
+        self._upper_counts = np.zeros(0, dtype=np.int64)
+        self._lower_counts = np.zeros(0, dtype=np.int64)
+        self._spike_symbols = np.empty(0, dtype=object)
+        self._spike_counts = np.zeros(0, dtype=np.int64)
+        self._rsi_matrix = None
         self.sector_performance = {}
         
         if stock_data is not None:
-            logger.info(f"MarketAnalyzer initialized with {len(stock_data.index.get_level_values(1).unique())} companies")
+            logger.info("MarketAnalyzer initialized with %d companies", len(self._symbols))
         else:
             logger.info("MarketAnalyzer initialized without data")
     
+    @property
+    def stock_data(self):
+        """pd.DataFrame: Stock data with hierarchical index (date, symbol)"""
+        return self._stock_data
+    
+    @stock_data.setter
+    def stock_data(self, value):
+        # Keep the (date, symbol) index lexsorted so xs() and date slices take
+        # pandas' binary-search path; sorting returns a new frame, leaving the
+        # caller's data untouched
+        if value is not None and not value.index.is_monotonic_increasing:
+            value = value.sort_index()
+        if value is not None:
+            value = self._downcast_prices(value)
+        self._stock_data = value
+        # Reassigning the data invalidates every derived cache
+        self._latest_cache = {}
+        self._epoch += 1
+        if value is None:
+            self._symbols = np.empty(0, dtype=object)
+            self._symbol_codes = np.empty(0, dtype=np.intp)
+            self._close_wide = None
+            return
+        
+        # Integer code of every row's symbol and the unique symbols they index,
+        # extracted once so methods don't re-scan the index level
+        self._symbol_codes, symbols = pd.factorize(value.index.get_level_values('symbol'))
+        self._symbols = np.asarray(symbols, dtype=object)
+        # Dense (date x symbol) close-price matrix, pivoted once per dataset;
+        # column j holds the symbol with code j
+        self._close_wide = value['close'].unstack('symbol').reindex(columns=symbols)
+    
+    @staticmethod
+    def _downcast_prices(data):
+        """
+        Store the OHLC columns as float32.
+        
+        Prices carry far fewer significant digits than float32 holds, and the
+        rankers, RSI and breadth passes are memory-bound, so halving the width
+        halves the bytes they stream. Volume keeps its integer dtype.
+        
+        Args:
+            data (pd.DataFrame): Stock data with OHLCV columns
+            
+        Returns:
+            pd.DataFrame: The data with float32 price columns (a new frame if any column changed)
+        """
+        dtypes = {
+            col: np.float32 for col in ('open', 'high', 'low', 'close')
+            if col in data.columns and data[col].dtype != np.float32
+        }
+        return data.astype(dtypes) if dtypes else data
+    
+    @property
+    def analysis_results(self):
+        """
+        Mapping: Results of the latest analysis run, as a read-only view.
+        
+        Assign a new dictionary to change the results; in-place edits raise
+        TypeError, so the cached market summary can't go stale. Per-symbol results given under
+        the 'rsi', 'upper_circuit_counts'/'lower_circuit_counts' and
+        'volume_spike_counts' keys are loaded into the per-symbol arrays.
+        """
+        return self._analysis_results
+    
+    @analysis_results.setter
+    def analysis_results(self, value):
+        if 'rsi' in value:
+            self.rsi_values = value['rsi']
+        if 'upper_circuit_counts' in value and 'lower_circuit_counts' in value:
+            self.circuit_breakers = {'upper': value['upper_circuit_counts'], 'lower': value['lower_circuit_counts']}
+        if 'volume_spike_counts' in value:
+            self.volume_spikes = value['volume_spike_counts']
+        self._analysis_results = MappingProxyType(dict(value))
+        self._epoch += 1
+    
+    def _get_latest(self):
+        """
+        Get the latest trading date and the cross-section of stock data for it.
+        
+        The result is memoized on an invalidation token built from the identity
+        and length of stock_data, so the getters share a single level scan and
+        xs() call until the data changes.
+        
+        Returns:
+            tuple: (latest_date, DataFrame of the latest day indexed by symbol)
+        """
+        token = (id(self.stock_data), len(self.stock_data))
+        cached = self._latest_cache.get(token)
+        if cached is None:
+            # The index is sorted by date, so the last row holds the latest date
+            latest_date = self.stock_data.index[-1][0]
+            latest_data = self.stock_data.xs(latest_date, level='date')
+            cached = (latest_date, latest_data)
+            self._latest_cache = {token: cached}
+        return cached
+    
+    @property
+    def rsi_values(self):
+        """dict: Latest RSI value for each symbol"""
+        return dict(zip(self._rsi_symbols.tolist(), self._rsi_values.tolist()))
+    
+    @rsi_values.setter
+    def rsi_values(self, values):
+        self._rsi_symbols = np.array(list(values), dtype=object)
+        self._rsi_values = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+        self._epoch += 1
+    
+    @property
+    def circuit_breakers(self):
+        """dict: Upper and lower circuit breaker counts for symbols that hit one"""
+        symbols = self._circuit_symbols.tolist()
+        return {
+            'upper': {s: c for s, c in zip(symbols, self._upper_counts.tolist()) if c > 0},
+            'lower': {s: c for s, c in zip(symbols, self._lower_counts.tolist()) if c > 0}
+        }
+    
+    @circuit_breakers.setter
+    def circuit_breakers(self, counts):
+        upper = counts.get('upper', {})
+        lower = counts.get('lower', {})
+        symbols = list(dict.fromkeys([*upper, *lower]))
+        self._circuit_symbols = np.array(symbols, dtype=object)
+        self._upper_counts = np.array([upper.get(s, 0) for s in symbols], dtype=np.int64)
+        self._lower_counts = np.array([lower.get(s, 0) for s in symbols], dtype=np.int64)
+        self._epoch += 1
+    
+    @property
+    def volume_spikes(self):
+        """dict: Volume spike counts for symbols with at least one spike"""
+        return {s: c for s, c in zip(self._spike_symbols.tolist(), self._spike_counts.tolist()) if c > 0}
+    
+    @volume_spikes.setter
+    def volume_spikes(self, counts):
+        self._spike_symbols = np.array(list(counts), dtype=object)
+        self._spike_counts = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        self._epoch += 1
+    
+    def _has_analysis(self):
+        """
+        Check whether any analysis results have been stored.
+        
+        Returns:
+            bool: True if analysis results or per-symbol arrays are available
+        """
+        return bool(self.analysis_results) or any(
+            arr.size for arr in (self._rsi_values, self._circuit_symbols, self._spike_symbols)
+        )
+    
+    def _latest_pct_change(self):
+        """
+        Calculate the open-to-close percent change for the latest trading day.
+        
+        Works on the raw float arrays with in-place ufuncs, so no intermediate
+        Series are aligned and the cached latest-day slice is never mutated.
+        
+        Returns:
+            tuple: (symbol array, percent change array)
+        """
+        latest_date, latest_data = self._get_latest()
+        
+        o = latest_data['open'].to_numpy()
+        c = latest_data['close'].to_numpy()
+        pct = np.empty(o.shape, dtype=np.result_type(o, c, np.float32))
+        np.subtract(c, o, out=pct)
+        np.divide(pct, o, out=pct)
+        pct *= 100.0
+        
+        return latest_data.index.to_numpy(), pct
+    
     def get_top_gainers(self, n=10):
         """
         Get the top n gainers (companies with highest percent change).
@@ -73,25 +271,13 @@ class MarketAnalyzer:
             return {}
         
         try:
-            # Get the latest date in the data
-            latest_date = self.stock_data.index.get_level_values('date').max()
-            
-            # Get all records for the latest date
-            latest_data = self.stock_data.xs(latest_date, level='date')
+            symbols, pct = self._latest_pct_change()
+            idx = top_n_positions(pct, n)
             
-            # Calculate percent change
-            latest_data['pct_change'] = ((latest_data['close'] - latest_data['open']) / latest_data['open']) * 100
-            
-            # Sort by percent change in descending order
-            sorted_by_change = latest_data.sort_values('pct_change', ascending=False)
-            
-            # Get top n
-            top_n = sorted_by_change.head(n)
-            
-            # Return as dictionary
-            return dict(zip(top_n.index.get_level_values('symbol'), top_n['pct_change']))
+            # Unbox in C with tolist() rather than iterating numpy scalars
+            return dict(zip(symbols[idx].tolist(), pct[idx].tolist()))
         except Exception as e:
-            logger.error(f"Error getting top gainers: {str(e)}")
+            logger.error("Error getting top gainers: %s", e)
             return {}
     
     def get_top_losers(self, n=10):
@@ -109,25 +295,13 @@ class MarketAnalyzer:
             return {}
         
         try:
-            # Get the latest date in the data
-            latest_date = self.stock_data.index.get_level_values('date').max()
-            
-            # Get all records for the latest date
-            latest_data = self.stock_data.xs(latest_date, level='date')
-            
-            # Calculate percent change
-            latest_data['pct_change'] = ((latest_data['close'] - latest_data['open']) / latest_data['open']) * 100
-            
-            # Sort by percent change in ascending order
-            sorted_by_change = latest_data.sort_values('pct_change', ascending=True)
-            
-            # Get top n
-            top_n = sorted_by_change.head(n)
+            symbols, pct = self._latest_pct_change()
+            idx = top_n_positions(pct, n, largest=False)
             
             # Return as dictionary
-            return dict(zip(top_n.index.get_level_values('symbol'), top_n['pct_change']))
+            return dict(zip(symbols[idx].tolist(), pct[idx].tolist()))
         except Exception as e:
-            logger.error(f"Error getting top losers: {str(e)}")
+            logger.error("Error getting top losers: %s", e)
             return {}
     
     def get_volume_leaders(self, n=10):
@@ -145,32 +319,202 @@ class MarketAnalyzer:
             return {}
         
         try:
-            # Get the latest date in the data
-            latest_date = self.stock_data.index.get_level_values('date').max()
+            latest_date, latest_data = self._get_latest()
             
-            # Get all records for the latest date
-            latest_data = self.stock_data.xs(latest_date, level='date')
-            
-            # Sort by volume in descending order
-            sorted_by_volume = latest_data.sort_values('volume', ascending=False)
+            symbols = latest_data.index.to_numpy()
+            vol = latest_data['volume'].to_numpy()
             
-            # Get top n
-            top_n = sorted_by_volume.head(n)
+            idx = top_n_positions(vol, n)
             
             # Return as dictionary
-            return dict(zip(top_n.index.get_level_values('symbol'), top_n['volume']))
+            return dict(zip(symbols[idx].tolist(), vol[idx].tolist()))
         except Exception as e:
-            logger.error(f"Error getting volume leaders: {str(e)}")
+            logger.error("Error getting volume leaders: %s", e)
             return {}
     
+    def calculate_rsi_values(self, period=None):
+        """
+        Calculate RSI for every company in a single pass over the close-price matrix.
+        
+        The full (dates x symbols) RSI matrix is kept for later use and the
+        latest valid RSI of each company is stored in rsi_values.
+        
+        Args:
+            period (int, optional): Period for RSI calculation, defaults to config value
+            
+        Returns:
+            dict: Dictionary mapping symbols to their latest RSI value
+        """
+        if self.stock_data is None:
+            logger.warning("No stock data available")
+            return {}
+        
+        if period is None:
+            period = config.RSI_PERIOD
+        
+        # calculate_rsi works column-wise, so one call covers all companies
+        close_wide = self._close_wide
+        rsi_matrix = calculate_rsi(close_wide, period).to_numpy(dtype=np.float64)
+        self._rsi_matrix = rsi_matrix
+        
+        # Pick the last non-NaN row of each column
+        valid = ~np.isnan(rsi_matrix)
+        has_value = valid.any(axis=0)
+        last_row = rsi_matrix.shape[0] - 1 - valid[::-1].argmax(axis=0)
+        latest = rsi_matrix[last_row, np.arange(rsi_matrix.shape[1])]
+        
+        self._rsi_symbols = close_wide.columns.to_numpy(dtype=object)[has_value]
+        self._rsi_values = latest[has_value]
+        self._epoch += 1
+        
+        return self.rsi_values
+    
+    def detect_circuit_breakers(self, threshold=None):
+        """
+        Count upper and lower circuit breaker events for every company.
+        
+        Daily returns are taken over the whole close-price matrix at once and
+        the events are tallied per symbol code with np.bincount, so the counts
+        land directly in the per-symbol arrays used by the market summary.
+        
+        Args:
+            threshold (dict, optional): Dictionary with 'upper' and 'lower' thresholds, defaults to config values
+            
+        Returns:
+            dict: Upper and lower circuit breaker counts for symbols that hit one
+        """
+        if self.stock_data is None:
+            logger.warning("No stock data available")
+            return {}
+        
+        if threshold is None:
+            upper, lower = config.CIRCUIT_BREAKER_THRESHOLD.upper, config.CIRCUIT_BREAKER_THRESHOLD.lower
+        else:
+            upper, lower = threshold['upper'], threshold['lower']
+        
+        close = self._close_wide.to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = close[1:] / close[:-1] - 1.0
+        
+        # Column positions of the events are the symbol codes
+        n_symbols = len(self._symbols)
+        upper_codes = np.nonzero(returns > upper)[1]
+        lower_codes = np.nonzero(returns < lower)[1]
+        
+        self._circuit_symbols = self._symbols
+        self._upper_counts = np.bincount(upper_codes, minlength=n_symbols).astype(np.int64)
+        self._lower_counts = np.bincount(lower_codes, minlength=n_symbols).astype(np.int64)
+        self._epoch += 1
+        
+        return self.circuit_breakers
+    
+    def detect_volume_spikes(self, threshold=2.0, periods=20):
+        """
+        Count volume spikes for every company in a single pass over the volume matrix.
+        
+        Args:
+            threshold (float): Multiple of average volume to consider a spike, defaults to 2.0
+            periods (int): The number of periods to average over, defaults to 20
+            
+        Returns:
+            dict: Volume spike counts for symbols with at least one spike
+        """
+        if self.stock_data is None:
+            logger.warning("No stock data available")
+            return {}
+        
+        volume_wide = self.stock_data['volume'].unstack('symbol').reindex(columns=self._symbols)
+        spikes = is_volume_spike(volume_wide, threshold, periods).to_numpy()
+        
+        self._spike_symbols = self._symbols
+        self._spike_counts = spikes.sum(axis=0).astype(np.int64)
+        self._epoch += 1
+        
+        return self.volume_spikes
+    
+    def calculate_sector_performance(self):
+        """
+        Calculate the average return of each sector over the loaded period.
+        
+        A company's return is measured from its first to its last available close.
+        
+        Returns:
+            dict: Dictionary mapping sectors to their average percent return
+        """
+        if self.stock_data is None:
+            logger.warning("No stock data available")
+            return {}
+        
+        close_wide = self._close_wide
+        first = close_wide.bfill().iloc[0].to_numpy(dtype=np.float64)
+        last = close_wide.ffill().iloc[-1].to_numpy(dtype=np.float64)
+        returns = (last - first) / first * 100
+        
+        company_info = self.company_info or {}
+        sectors = [company_info.get(s, {}).get('sector', 'Unknown') for s in close_wide.columns]
+        
+        self.sector_performance = pd.Series(returns, index=close_wide.columns).groupby(sectors).mean().to_dict()
+        return self.sector_performance
+    
+    def run_comprehensive_analysis(self, n_jobs=-1):
+        """
+        Run RSI, circuit breaker, volume spike and sector analysis.
+        
+        Each analysis already covers every company with one vectorized pass,
+        so the analyses themselves are the units of work: they run concurrently
+        on joblib's threading backend (the numpy and pandas kernels release
+        the GIL) and sequentially when joblib is not installed.
+        
+        Args:
+            n_jobs (int): Number of worker threads, defaults to -1 (all cores)
+            
+        Returns:
+            Mapping: Read-only view of the results of each analysis
+        """
+        if self.stock_data is None:
+            logger.warning("No stock data available")
+            return {}
+        
+        tasks = {
+            'rsi_values': self.calculate_rsi_values,
+            'circuit_breakers': self.detect_circuit_breakers,
+            'volume_spikes': self.detect_volume_spikes,
+            'sector_performance': self.calculate_sector_performance
+        }
+        
+        if Parallel is not None:
+            results = Parallel(n_jobs=n_jobs, backend='threading')(delayed(task)() for task in tasks.values())
+        else:
+            results = [task() for task in tasks.values()]
+        
+        self.analysis_results = dict(zip(tasks, results))
+        return self.analysis_results
+    
     def get_market_summary(self):
         """
         Generate a summary of the market based on the latest analysis.
         
+        The summary is cached until stock_data, analysis_results or the
+        per-symbol results are reassigned, so repeated calls (e.g. dashboard
+        refreshes) reduce to a dictionary lookup.
+        
+        Returns:
+            dict: Dictionary with market summary metrics
+        """
+        summary = self._summary_cache.get(self._epoch)
+        if summary is None:
+            summary = self._compute_summary()
+            self._summary_cache = {self._epoch: summary}
+        return summary
+    
+    def _compute_summary(self):
+        """
+        Compute the market summary returned by get_market_summary.
+        
         Returns:
             dict: Dictionary with market summary metrics
         """
-        if not self.analysis_results:
+        if not self._has_analysis():
             logger.warning("No analysis results available. Run comprehensive analysis first.")
             return {}
         
@@ -179,34 +523,16 @@ class MarketAnalyzer:
         # Calculate market breadth (advancing vs. declining stocks)
         if self.stock_data is not None:
             try:
-                # Get the latest two trading days
-                dates = sorted(self.stock_data.index.get_level_values('date').unique())[-2:]
-                if len(dates) >= 2:
-                    prev_date, curr_date = dates
-                    
-                    advancing = 0
-                    declining = 0
-                    unchanged = 0
+                # Compare the last two rows of the close-price matrix;
+                # companies missing on either day are masked out as NaN
+                close_wide = self._close_wide
+                if len(close_wide) >= 2:
+                    diff = close_wide.iloc[-1].to_numpy() - close_wide.iloc[-2].to_numpy()
+                    diff = diff[~np.isnan(diff)]
                     
-                    # Get unique companies
-                    companies = self.stock_data.index.get_level_values('symbol').unique()
-                    
-                    for company in companies:
-                        try:
-                            # Get close prices for the company
-                            idx = pd.IndexSlice
-                            prev_price = self.stock_data.loc[idx[prev_date, company], 'close'].iloc[0]
-                            curr_price = self.stock_data.loc[idx[curr_date, company], 'close'].iloc[0]
-                            
-                            # Compare prices
-                            if curr_price > prev_price:
-                                advancing += 1
-                            elif curr_price < prev_price:
-                                declining += 1
-                            else:
-                                unchanged += 1
-                        except:
-                            pass
+                    advancing = int((diff > 0).sum())
+                    declining = int((diff < 0).sum())
+                    unchanged = int((diff == 0).sum())
                     
                     summary['market_breadth'] = {
                         'advancing': advancing,
@@ -216,44 +542,44 @@ class MarketAnalyzer:
                         'advance_decline_ratio': advancing / declining if declining > 0 else float('inf')
                     }
             except Exception as e:
-                logger.error(f"Error calculating market breadth: {str(e)}")
+                logger.error("Error calculating market breadth: %s", e)
         
         # Add RSI distribution
-        if 'rsi' in self.analysis_results:
-            rsi_values = list(self.analysis_results['rsi'].values())
-            if rsi_values:
-                summary['rsi_metrics'] = {
-                    'mean': np.mean(rsi_values),
-                    'median': np.median(rsi_values),
-                    'std': np.std(rsi_values),
-                    'min': min(rsi_values),
-                    'max': max(rsi_values)
-                }
+        if self._rsi_values.size:
+            rsi_mean, rsi_median, rsi_std, rsi_min, rsi_max = _summary_stats(self._rsi_values)
+            summary['rsi_metrics'] = {
+                'mean': rsi_mean,
+                'median': rsi_median,
+                'std': rsi_std,
+                'min': rsi_min,
+                'max': rsi_max
+            }
         
         # Add sector performance
-        if 'sector_performance' in self.analysis_results:
+        if self.analysis_results.get('sector_performance'):
+            sector_perf = self.analysis_results['sector_performance']
+            sectors = list(sector_perf)
+            returns = np.fromiter(sector_perf.values(), dtype=np.float64, count=len(sector_perf))
             summary['sector_metrics'] = {
-                'best_sector': max(self.analysis_results['sector_performance'].items(), 
-                                    key=lambda x: x[1])[0],
-                'worst_sector': min(self.analysis_results['sector_performance'].items(), 
-                                     key=lambda x: x[1])[0],
-                'market_return': np.mean(list(self.analysis_results['sector_performance'].values()))
+                'best_sector': sectors[returns.argmax()],
+                'worst_sector': sectors[returns.argmin()],
+                'market_return': returns.mean()
             }
         
         # Add circuit breaker information
-        if 'upper_circuit_counts' in self.analysis_results and 'lower_circuit_counts' in self.analysis_results:
+        if self._circuit_symbols.size:
             summary['circuit_metrics'] = {
-                'total_upper_circuits': sum(self.analysis_results['upper_circuit_counts'].values()),
-                'total_lower_circuits': sum(self.analysis_results['lower_circuit_counts'].values()),
-                'companies_hit_upper': len(self.analysis_results['upper_circuit_counts']),
-                'companies_hit_lower': len(self.analysis_results['lower_circuit_counts'])
+                'total_upper_circuits': int(self._upper_counts.sum()),
+                'total_lower_circuits': int(self._lower_counts.sum()),
+                'companies_hit_upper': int((self._upper_counts > 0).sum()),
+                'companies_hit_lower': int((self._lower_counts > 0).sum())
             }
         
         # Add volume information
-        if 'volume_spike_counts' in self.analysis_results:
+        if self._spike_symbols.size:
             summary['volume_metrics'] = {
-                'total_spikes': sum(self.analysis_results['volume_spike_counts'].values()),
-                'companies_with_spikes': len(self.analysis_results['volume_spike_counts'])
+                'total_spikes': int(self._spike_counts.sum()),
+                'companies_with_spikes': int((self._spike_counts > 0).sum())
             }
         
         return summary
@@ -11,27 +11,150 @@ import numpy as np
 import sys
 import os
 import logging
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (once, so reloads don't keep
+# growing sys.path)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 import config
 from utils.indicators import calculate_rsi, calculate_macd
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the application entry point (main.py)
 logger = logging.getLogger(__name__)
 
 
+def company_info_to_df(company_info):
+    """
+    Convert company information to a typed DataFrame with one row per company.
+    
+    The fundamentals used by the filters are stored as float64 columns and the
+    sector as a categorical column, so filters compare contiguous arrays
+    instead of boxed dictionary values.
+    
+    Args:
+        company_info (dict): Dictionary of company information
+        
+    Returns:
+        pd.DataFrame: Company information indexed by symbol
+    """
+    company_df = pd.DataFrame.from_dict(company_info, orient='index')
+    
+    for column in ('market_cap', 'pe_ratio', 'eps'):
+        if column in company_df:
+            company_df[column] = pd.to_numeric(company_df[column], errors='coerce').astype(np.float64)
+    
+    if 'sector' in company_df:
+        company_df['sector'] = company_df['sector'].astype('category')
+    
+    return company_df
+
+
+def _company_frame(company_info):
+    """
+    Get company information as a DataFrame, converting a dictionary if needed.
+    
+    Args:
+        company_info (dict or pd.DataFrame): Dictionary of company information,
+            or a DataFrame from company_info_to_df
+        
+    Returns:
+        pd.DataFrame: Company information indexed by symbol
+    """
+    if isinstance(company_info, pd.DataFrame):
+        return company_info
+    return company_info_to_df(company_info)
+
+
+def _in_range(values, min_value=None, max_value=None):
+    """
+    Get a boolean mask of values within an inclusive range.
+    
+    Args:
+        values (pd.Series): Values to check; missing or non-numeric values never match
+        min_value (float, optional): Minimum value
+        max_value (float, optional): Maximum value
+        
+    Returns:
+        pd.Series: Boolean mask aligned with values
+    """
+    lower = min_value if min_value is not None else -np.inf
+    upper = max_value if max_value is not None else np.inf
+    return pd.to_numeric(values, errors='coerce').between(lower, upper)
+
+
+def _mask_to_list(mask):
+    """
+    Get the symbols selected by a boolean mask.
+    
+    Args:
+        mask (pd.Series): Boolean mask indexed by symbol
+        
+    Returns:
+        list: List of company symbols where the mask is True
+    """
+    return mask.index[mask.to_numpy(dtype=bool)].tolist()
+
+
+def _as_of_position(index, as_of_date):
+    """
+    Get the row position of the last trading day on or before a date.
+    
+    Uses a binary search on the sorted date index, so dates without trading
+    (weekends, holidays) snap back to the previous trading day.
+    
+    Args:
+        index (pd.Index): Sorted date index
+        as_of_date (str or datetime): Date to look up
+        
+    Returns:
+        int: Row position, or None if the date is before the first trading day
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        as_of_date = pd.Timestamp(as_of_date)
+    pos = index.searchsorted(as_of_date, side='right') - 1
+    return pos if pos >= 0 else None
+
+
+def _sector_mask(company_df, sectors):
+    """
+    Get the boolean mask behind filter_by_sector.
+    
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    if 'sector' not in company_df:
+        return pd.Series(False, index=company_df.index)
+    return company_df['sector'].isin(sectors)
+
+
+def _range_mask(company_df, column, min_value=None, max_value=None):
+    """
+    Get a boolean mask of companies whose value in a column is within a range.
+    
+    Args:
+        company_df (pd.DataFrame): Company information indexed by symbol
+        column (str): Column to check; if it is missing, no company matches
+        min_value (float, optional): Minimum value
+        max_value (float, optional): Maximum value
+        
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    if column not in company_df:
+        return pd.Series(False, index=company_df.index)
+    return _in_range(company_df[column], min_value, max_value)
+
+
 def filter_by_sector(company_info, sector):
     """
     Filter companies by sector.
     
     Args:
-        company_info (dict): Dictionary of company information
+        company_info (dict or pd.DataFrame): Dictionary of company information
         sector (str or list): Sector(s) to filter by
         
     Returns:
@@ -42,12 +165,9 @@ def filter_by_sector(company_info, sector):
     else:
         sectors = sector
     
-    filtered_companies = []
-    for symbol, info in company_info.items():
-        if 'sector' in info and info['sector'] in sectors:
-            filtered_companies.append(symbol)
+    filtered_companies = _mask_to_list(_sector_mask(_company_frame(company_info), sectors))
     
-    logger.info(f"Filtered {len(filtered_companies)} companies in sector(s): {sectors}")
+    logger.info("Filtered %d companies in sector(s): %s", len(filtered_companies), sectors)
     return filtered_companies
 
 
@@ -56,31 +176,19 @@ def filter_by_market_cap(company_info, min_market_cap=None, max_market_cap=None)
     Filter companies by market capitalization range.
     
     Args:
-        company_info (dict): Dictionary of company information
+        company_info (dict or pd.DataFrame): Dictionary of company information
         min_market_cap (float, optional): Minimum market cap value
         max_market_cap (float, optional): Maximum market cap value
         
     Returns:
         list: List of company symbols within the specified market cap range
     """
-    filtered_companies = []
-    for symbol, info in company_info.items():
-        if 'market_cap' not in info:
-            continue
-        
-        market_cap = info['market_cap']
-        
-        if min_market_cap is not None and market_cap < min_market_cap:
-            continue
-        
-        if max_market_cap is not None and market_cap > max_market_cap:
-            continue
-        
-        filtered_companies.append(symbol)
+    mask = _range_mask(_company_frame(company_info), 'market_cap', min_market_cap, max_market_cap)
+    filtered_companies = _mask_to_list(mask)
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by market cap range: "
-                f"[{min_market_cap if min_market_cap is not None else 'min'}, "
-                f"{max_market_cap if max_market_cap is not None else 'max'}]")
+    logger.info("Filtered %d companies by market cap range: [%s, %s]", len(filtered_companies),
+                min_market_cap if min_market_cap is not None else 'min',
+                max_market_cap if max_market_cap is not None else 'max')
     
     return filtered_companies
 
@@ -90,31 +198,18 @@ def filter_by_pe_ratio(company_info, min_pe=None, max_pe=None):
     Filter companies by P/E ratio range.
     
     Args:
-        company_info (dict): Dictionary of company information
+        company_info (dict or pd.DataFrame): Dictionary of company information
         min_pe (float, optional): Minimum P/E ratio
         max_pe (float, optional): Maximum P/E ratio
         
     Returns:
         list: List of company symbols within the specified P/E ratio range
     """
-    filtered_companies = []
-    for symbol, info in company_info.items():
-        if 'pe_ratio' not in info or info['pe_ratio'] is None:
-            continue
-        
-        pe_ratio = info['pe_ratio']
-        
-        if min_pe is not None and pe_ratio < min_pe:
-            continue
-        
-        if max_pe is not None and pe_ratio > max_pe:
-            continue
-        
-        filtered_companies.append(symbol)
+    filtered_companies = _mask_to_list(_range_mask(_company_frame(company_info), 'pe_ratio', min_pe, max_pe))
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by P/E ratio range: "
-                f"[{min_pe if min_pe is not None else 'min'}, "
-                f"{max_pe if max_pe is not None else 'max'}]")
+    logger.info("Filtered %d companies by P/E ratio range: [%s, %s]", len(filtered_companies),
+                min_pe if min_pe is not None else 'min',
+                max_pe if max_pe is not None else 'max')
     
     return filtered_companies
 
@@ -124,36 +219,54 @@ def filter_by_eps(company_info, min_eps=None, max_eps=None):
     Filter companies by EPS (Earnings Per Share) range.
     
     Args:
-        company_info (dict): Dictionary of company information
+        company_info (dict or pd.DataFrame): Dictionary of company information
         min_eps (float, optional): Minimum EPS value
         max_eps (float, optional): Maximum EPS value
         
     Returns:
         list: List of company symbols within the specified EPS range
     """
-    filtered_companies = []
-    for symbol, info in company_info.items():
-        if 'eps' not in info or info['eps'] is None:
-            continue
-        
-        eps = info['eps']
-        
-        if min_eps is not None and eps < min_eps:
-            continue
-        
-        if max_eps is not None and eps > max_eps:
-            continue
-        
-        filtered_companies.append(symbol)
+    filtered_companies = _mask_to_list(_range_mask(_company_frame(company_info), 'eps', min_eps, max_eps))
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by EPS range: "
-                f"[{min_eps if min_eps is not None else 'min'}, "
-                f"{max_eps if max_eps is not None else 'max'}]")
+    logger.info("Filtered %d companies by EPS range: [%s, %s]", len(filtered_companies),
+                min_eps if min_eps is not None else 'min',
+                max_eps if max_eps is not None else 'max')
     
     return filtered_companies
 
 
-def filter_by_rsi(stock_data, min_rsi=None, max_rsi=None, period=None, as_of_date=None):
+def _rsi_mask(close_wide, min_rsi=None, max_rsi=None, period=None, as_of_date=None, rsi=None):
+    """
+    Get the boolean mask behind filter_by_rsi.
+    
+    Args:
+        rsi (pd.DataFrame, optional): Precomputed RSI of close_wide for the period
+        
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    if period is None:
+        period = config.RSI_PERIOD
+    
+    # Calculate RSI for every company in a single pass
+    if rsi is None:
+        rsi = calculate_rsi(close_wide, period)
+    
+    # Get RSI as of specified date or latest valid (non-NaN) RSI
+    if as_of_date is not None:
+        pos = _as_of_position(rsi.index, as_of_date)
+        if pos is None:
+            return pd.Series(False, index=close_wide.columns)
+        rsi_row = rsi.iloc[pos]
+    else:
+        rsi_row = rsi.ffill().iloc[-1]
+    
+    # Companies with insufficient history have NaN RSI, which never matches
+    return _in_range(rsi_row, min_rsi, max_rsi)
+
+
+def filter_by_rsi(stock_data, min_rsi=None, max_rsi=None, period=None, as_of_date=None,
+                  close_wide=None):
     """
     Filter companies by RSI (Relative Strength Index) range.
     
@@ -162,60 +275,61 @@ def filter_by_rsi(stock_data, min_rsi=None, max_rsi=None, period=None, as_of_dat
         min_rsi (float, optional): Minimum RSI value
         max_rsi (float, optional): Maximum RSI value
         period (int, optional): Period for RSI calculation, defaults to config value
-        as_of_date (str, optional): Date to calculate RSI as of, defaults to latest date
+        as_of_date (str, optional): Date to calculate RSI as of, defaults to latest date;
+            non-trading dates use the previous trading day
+        close_wide (pd.DataFrame, optional): Close prices pivoted to one column per company,
+            derived from stock_data if not provided
         
     Returns:
         list: List of company symbols within the specified RSI range
     """
-    if period is None:
-        period = config.RSI_PERIOD
+    # Companies with too short a history get NaN RSI and never match, so a
+    # single handler covers unexpected calculation errors for all of them
+    try:
+        if close_wide is None:
+            close_wide = stock_data['close'].unstack(level=1)
+        filtered_companies = _mask_to_list(_rsi_mask(close_wide, min_rsi, max_rsi, period, as_of_date))
+    except Exception as e:
+        logger.warning("Error calculating RSI: %s", e)
+        filtered_companies = []
     
-    filtered_companies = []
+    logger.info("Filtered %d companies by RSI range: [%s, %s]", len(filtered_companies),
+                min_rsi if min_rsi is not None else 'min',
+                max_rsi if max_rsi is not None else 'max')
     
-    # Get unique companies
-    companies = stock_data.index.get_level_values(1).unique()
+    return filtered_companies
+
+
+def _volume_mask(volume_wide, min_volume=None, max_volume=None, avg_period=20, as_of_date=None,
+                 avg_volume=None):
+    """
+    Get the boolean mask behind filter_by_volume.
     
-    for company in companies:
-        try:
-            # Get close prices for the company
-            company_data = stock_data.xs(company, level=1)['close']
-            
-            # Calculate RSI
-            rsi = calculate_rsi(company_data, period)
-            
-            # Get RSI as of specified date or latest date
-            if as_of_date is not None:
-                if as_of_date not in rsi.index:
-                    continue
-                rsi_value = rsi[as_of_date]
-            else:
-                # Get latest valid (non-NaN) RSI
-                valid_rsi = rsi.dropna()
-                if valid_rsi.empty:
-                    continue
-                rsi_value = valid_rsi.iloc[-1]
-            
-            # Check if RSI is within range
-            if min_rsi is not None and rsi_value < min_rsi:
-                continue
-            
-            if max_rsi is not None and rsi_value > max_rsi:
-                continue
-            
-            filtered_companies.append(company)
+    Args:
+        avg_volume (pd.DataFrame, optional): Precomputed moving average of volume_wide
         
-        except Exception as e:
-            logger.warning(f"Error calculating RSI for {company}: {str(e)}")
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    # Calculate the moving average of every company in a single rolling pass
+    if avg_volume is None:
+        avg_volume = volume_wide.rolling(window=avg_period, min_periods=avg_period).mean()
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by RSI range: "
-                f"[{min_rsi if min_rsi is not None else 'min'}, "
-                f"{max_rsi if max_rsi is not None else 'max'}]")
+    # Get average volume as of specified date or latest valid (non-NaN) value
+    if as_of_date is not None:
+        pos = _as_of_position(avg_volume.index, as_of_date)
+        if pos is None:
+            return pd.Series(False, index=volume_wide.columns)
+        volume_row = avg_volume.iloc[pos]
+    else:
+        volume_row = avg_volume.ffill().iloc[-1]
     
-    return filtered_companies
+    # Companies with insufficient history have NaN averages, which never match
+    return _in_range(volume_row, min_volume, max_volume)
 
 
 def filter_by_volume(stock_data, min_volume=None, max_volume=None, 
-                     avg_period=20, as_of_date=None):
+                     avg_period=20, as_of_date=None, volume_wide=None):
     """
     Filter companies by trading volume range.
     
@@ -224,53 +338,55 @@ def filter_by_volume(stock_data, min_volume=None, max_volume=None,
         min_volume (float, optional): Minimum volume value
         max_volume (float, optional): Maximum volume value
         avg_period (int, optional): Period for average volume calculation, defaults to 20
-        as_of_date (str, optional): Date to calculate volume as of, defaults to latest date
+        as_of_date (str, optional): Date to calculate volume as of, defaults to latest date;
+            non-trading dates use the previous trading day
+        volume_wide (pd.DataFrame, optional): Volumes pivoted to one column per company,
+            derived from stock_data if not provided
         
     Returns:
         list: List of company symbols within the specified volume range
     """
-    filtered_companies = []
+    try:
+        if volume_wide is None:
+            volume_wide = stock_data['volume'].unstack(level=1)
+        mask = _volume_mask(volume_wide, min_volume, max_volume, avg_period, as_of_date)
+        filtered_companies = _mask_to_list(mask)
+    except Exception as e:
+        logger.warning("Error calculating average volume: %s", e)
+        filtered_companies = []
     
-    # Get unique companies
-    companies = stock_data.index.get_level_values(1).unique()
+    logger.info("Filtered %d companies by average volume range: [%s, %s]", len(filtered_companies),
+                min_volume if min_volume is not None else 'min',
+                max_volume if max_volume is not None else 'max')
     
-    for company in companies:
-        try:
-            # Get volume data for the company
-            company_data = stock_data.xs(company, level=1)['volume']
-            
-            # Calculate average volume
-            avg_volume = company_data.rolling(window=avg_period).mean()
-            
-            # Get volume as of specified date or latest date
-            if as_of_date is not None:
-                if as_of_date not in avg_volume.index:
-                    continue
-                volume_value = avg_volume[as_of_date]
-            else:
-                # Get latest valid (non-NaN) volume
-                valid_volume = avg_volume.dropna()
-                if valid_volume.empty:
-                    continue
-                volume_value = valid_volume.iloc[-1]
-            
-            # Check if volume is within range
-            if min_volume is not None and volume_value < min_volume:
-                continue
-            
-            if max_volume is not None and volume_value > max_volume:
-                continue
-            
-            filtered_companies.append(company)
-        
-        except Exception as e:
-            logger.warning(f"Error calculating average volume for {company}: {str(e)}")
+    return filtered_companies
+
+
+def _price_change_mask(stock_data, min_change=None, max_change=None, start_date=None, end_date=None):
+    """
+    Get the boolean mask behind filter_by_price_change.
+    
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    # Set default dates if not provided
+    if start_date is None:
+        start_date = stock_data.index.get_level_values(0).min()
+    if end_date is None:
+        end_date = stock_data.index.get_level_values(0).max()
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by average volume range: "
-                f"[{min_volume if min_volume is not None else 'min'}, "
-                f"{max_volume if max_volume is not None else 'max'}]")
+    # Get first and last close prices of every company within the period
+    # with a single slice and groupby
+    idx = pd.IndexSlice
+    close = stock_data.loc[idx[start_date:end_date, :], 'close']
+    prices = close.groupby(level=1).agg(['first', 'last', 'size'])
     
-    return filtered_companies
+    # Calculate price change percentage; need at least two prices
+    price_change = (prices['last'] / prices['first'] - 1) * 100
+    price_change[prices['size'] < 2] = np.nan
+    
+    # Check if price change is within range
+    return _in_range(price_change, min_change, max_change)
 
 
 def filter_by_price_change(stock_data, min_change=None, max_change=None,
@@ -288,49 +404,40 @@ def filter_by_price_change(stock_data, min_change=None, max_change=None,
     Returns:
         list: List of company symbols within the specified price change range
     """
-    # Set default dates if not provided
-    if start_date is None:
-        start_date = stock_data.index.get_level_values(0).min()
-    if end_date is None:
-        end_date = stock_data.index.get_level_values(0).max()
+    try:
+        mask = _price_change_mask(stock_data, min_change, max_change, start_date, end_date)
+        filtered_companies = _mask_to_list(mask)
+    except Exception as e:
+        logger.warning("Error calculating price change: %s", e)
+        filtered_companies = []
     
-    filtered_companies = []
+    logger.info("Filtered %d companies by price change range: [%s%%, %s%%] from %s to %s",
+                len(filtered_companies),
+                min_change if min_change is not None else 'min',
+                max_change if max_change is not None else 'max',
+                start_date if start_date is not None else 'start',
+                end_date if end_date is not None else 'end')
     
-    # Get unique companies
-    companies = stock_data.index.get_level_values(1).unique()
-    
-    for company in companies:
-        try:
-            # Get close prices for the company
-            idx = pd.IndexSlice
-            company_data = stock_data.loc[idx[start_date:end_date, company], 'close']
-            
-            if company_data.empty or len(company_data) < 2:
-                continue
-            
-            # Calculate price change percentage
-            start_price = company_data.iloc[0]
-            end_price = company_data.iloc[-1]
-            price_change = (end_price / start_price - 1) * 100
-            
-            # Check if price change is within range
-            if min_change is not None and price_change < min_change:
-                continue
-            
-            if max_change is not None and price_change > max_change:
-                continue
-            
-            filtered_companies.append(company)
-        
-        except Exception as e:
-            logger.warning(f"Error calculating price change for {company}: {str(e)}")
+    return filtered_companies
+
+
+def _circuit_breaker_mask(circuit_data, circuit_type=None, min_count=1):
+    """
+    Get the boolean mask behind filter_by_circuit_breakers.
     
-    logger.info(f"Filtered {len(filtered_companies)} companies by price change range: "
-                f"[{min_change if min_change is not None else 'min'}%, "
-                f"{max_change if max_change is not None else 'max'}%] "
-                f"from {start_date} to {end_date}")
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    # Count events for all companies in one pass over the whole block
+    values = circuit_data.to_numpy()
+    if circuit_type:
+        # Count specific circuit type
+        counts = (values == circuit_type).sum(axis=0)
+    else:
+        # Count any circuit (not 'None')
+        counts = (values != 'None').sum(axis=0)
     
-    return filtered_companies
+    return pd.Series(counts >= min_count, index=circuit_data.columns)
 
 
 def filter_by_circuit_breakers(circuit_data, circuit_type=None, min_count=1):
@@ -345,93 +452,142 @@ def filter_by_circuit_breakers(circuit_data, circuit_type=None, min_count=1):
     Returns:
         list: List of company symbols with the specified circuit breaker events
     """
-    filtered_companies = []
+    filtered_companies = _mask_to_list(_circuit_breaker_mask(circuit_data, circuit_type, min_count))
     
-    for company in circuit_data.columns:
-        if circuit_type:
-            # Count specific circuit type
-            count = (circuit_data[company] == circuit_type).sum()
-        else:
-            # Count any circuit (not 'None')
-            count = (circuit_data[company] != 'None').sum()
+    logger.info("Filtered %d companies with at least %d %s circuit breaker events",
+                len(filtered_companies), min_count, circuit_type if circuit_type else "any")
+    
+    return filtered_companies
+
+
+def _trading_day_positions(valid, idx=None):
+    """
+    Get the row positions of each company's current and previous trading day.
+    
+    Args:
+        valid (np.ndarray): Boolean (dates x companies) array marking rows with a price
+        idx (int, optional): Row to use as the current day; companies without a price
+            on it get no position. Defaults to each company's latest trading day
         
-        if count >= min_count:
-            filtered_companies.append(company)
+    Returns:
+        tuple: (current positions, previous positions), -1 where there is none
+    """
+    n_dates, n_companies = valid.shape
+    last_valid = np.maximum.accumulate(
+        np.where(valid, np.arange(n_dates)[:, None], -1), axis=0)
     
-    circuit_str = circuit_type if circuit_type else "any"
-    logger.info(f"Filtered {len(filtered_companies)} companies with at least {min_count} "
-                f"{circuit_str} circuit breaker events")
+    if idx is not None:
+        cur_pos = np.where(valid[idx], idx, -1)
+    else:
+        cur_pos = last_valid[-1]
     
-    return filtered_companies
+    prev_pos = np.where(cur_pos > 0, last_valid[np.maximum(cur_pos - 1, 0), np.arange(n_companies)], -1)
+    prev_pos[cur_pos < 0] = -1
+    return cur_pos, prev_pos
 
 
-def filter_by_macd_signal(stock_data, signal_type='crossover', as_of_date=None):
+def _macd_signal_mask(signal_type, macd_prev, macd_cur, signal_prev, signal_cur):
     """
-    Filter companies by MACD signal.
+    Evaluate a MACD signal for every company.
     
     Args:
-        stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
         signal_type (str): Type of MACD signal ('crossover', 'crossunder', 'positive', 'negative')
-        as_of_date (str, optional): Date to check for MACD signal, defaults to latest date
+        macd_prev (np.ndarray): MACD line on each company's previous trading day
+        macd_cur (np.ndarray): MACD line on each company's current trading day
+        signal_prev (np.ndarray): Signal line on each company's previous trading day
+        signal_cur (np.ndarray): Signal line on each company's current trading day
         
     Returns:
-        list: List of company symbols with the specified MACD signal
+        np.ndarray: Boolean mask of companies with the specified signal
     """
-    filtered_companies = []
+    if signal_type == 'crossover':
+        # MACD crossed above signal line
+        return (macd_prev <= signal_prev) & (macd_cur > signal_cur)
+    elif signal_type == 'crossunder':
+        # MACD crossed below signal line
+        return (macd_prev >= signal_prev) & (macd_cur < signal_cur)
+    elif signal_type == 'positive':
+        # MACD above signal line
+        return macd_cur > signal_cur
+    elif signal_type == 'negative':
+        # MACD below signal line
+        return macd_cur < signal_cur
+    return np.zeros(len(macd_cur), dtype=bool)
+
+
+def _macd_mask(close_wide, signal_type='crossover', as_of_date=None, macd=None):
+    """
+    Get the boolean mask behind filter_by_macd_signal.
     
-    # Get unique companies
-    companies = stock_data.index.get_level_values(1).unique()
+    Args:
+        macd (tuple, optional): Precomputed calculate_macd result for close_wide
+        
+    Returns:
+        pd.Series: Boolean mask indexed by symbol
+    """
+    no_signal = pd.Series(False, index=close_wide.columns)
     
-    for company in companies:
-        try:
-            # Get close prices for the company
-            company_data = stock_data.xs(company, level=1)['close']
-            
-            # Calculate MACD
-            macd_line, signal_line, histogram = calculate_macd(company_data)
-            
-            # Get index for checking signal
-            if as_of_date is not None:
-                if as_of_date not in macd_line.index:
-                    continue
-                idx = macd_line.index.get_loc(as_of_date)
-            else:
-                # Use latest available data
-                idx = -1
-            
-            # Check if we have enough data
-            if len(macd_line) < 2 or len(signal_line) < 2:
-                continue
-            
-            if idx == 0:
-                # Need at least one prior data point
-                continue
-            
-            # Check for the specified signal
-            if signal_type == 'crossover':
-                # MACD crossed above signal line
-                if macd_line.iloc[idx-1] <= signal_line.iloc[idx-1] and macd_line.iloc[idx] > signal_line.iloc[idx]:
-                    filtered_companies.append(company)
-            
-            elif signal_type == 'crossunder':
-                # MACD crossed below signal line
-                if macd_line.iloc[idx-1] >= signal_line.iloc[idx-1] and macd_line.iloc[idx] < signal_line.iloc[idx]:
-                    filtered_companies.append(company)
-            
-            elif signal_type == 'positive':
-                # MACD above signal line
-                if macd_line.iloc[idx] > signal_line.iloc[idx]:
-                    filtered_companies.append(company)
-            
-            elif signal_type == 'negative':
-                # MACD below signal line
-                if macd_line.iloc[idx] < signal_line.iloc[idx]:
-                    filtered_companies.append(company)
+    # Calculate MACD for every company in a single pass
+    if macd is None:
+        macd = calculate_macd(close_wide)
+    macd_line, signal_line, histogram = macd
+    
+    valid = close_wide.notna().to_numpy()
+    if len(valid) < 2:
+        # Need at least one prior data point
+        return no_signal
+    
+    # Get the rows to check for every company; with an as-of date, only
+    # companies that traded on that date are considered
+    if as_of_date is not None:
+        pos = _as_of_position(close_wide.index, as_of_date)
+        if pos is None:
+            return no_signal
+        cur_pos, prev_pos = _trading_day_positions(valid, pos)
+    else:
+        # Use latest available data
+        cur_pos, prev_pos = _trading_day_positions(valid)
+    
+    # Positions of -1 mark companies without a prior trading day; their
+    # gathered values are masked out below along with any NaN values
+    cols = np.arange(valid.shape[1])
+    macd_values = macd_line.to_numpy()
+    signal_values = signal_line.to_numpy()
+    macd_prev, macd_cur = macd_values[prev_pos, cols], macd_values[cur_pos, cols]
+    signal_prev, signal_cur = signal_values[prev_pos, cols], signal_values[cur_pos, cols]
+    has_signal = ((prev_pos >= 0) & ~np.isnan(macd_prev) & ~np.isnan(macd_cur)
+                  & ~np.isnan(signal_prev) & ~np.isnan(signal_cur))
+    
+    # Check for the specified signal
+    signal = _macd_signal_mask(signal_type, macd_prev, macd_cur, signal_prev, signal_cur)
+    
+    return pd.Series(signal & has_signal, index=close_wide.columns)
+
+
+def filter_by_macd_signal(stock_data, signal_type='crossover', as_of_date=None, close_wide=None):
+    """
+    Filter companies by MACD signal.
+    
+    Args:
+        stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
+        signal_type (str): Type of MACD signal ('crossover', 'crossunder', 'positive', 'negative')
+        as_of_date (str, optional): Date to check for MACD signal, defaults to latest date;
+            non-trading dates use the previous trading day
+        close_wide (pd.DataFrame, optional): Close prices pivoted to one column per company,
+            derived from stock_data if not provided
         
-        except Exception as e:
-            logger.warning(f"Error checking MACD signal for {company}: {str(e)}")
+    Returns:
+        list: List of company symbols with the specified MACD signal
+    """
+    try:
+        if close_wide is None:
+            close_wide = stock_data['close'].unstack(level=1)
+        filtered_companies = _mask_to_list(_macd_mask(close_wide, signal_type, as_of_date))
+    except Exception as e:
+        logger.warning("Error checking MACD signal: %s", e)
+        filtered_companies = []
     
-    logger.info(f"Filtered {len(filtered_companies)} companies with MACD {signal_type} signal")
+    logger.info("Filtered %d companies with MACD %s signal", len(filtered_companies), signal_type)
     
     return filtered_companies
 
@@ -453,31 +609,36 @@ def combine_filters(company_lists, operation='and'):
     if len(company_lists) == 1:
         return company_lists[0]
     
-    # Convert all lists to sets
-    company_sets = [set(company_list) for company_list in company_lists]
+    # Index every symbol once, then mark each list's members in one row of a
+    # (lists x symbols) boolean matrix
+    symbols = pd.Index(pd.unique(np.concatenate(
+        [np.asarray(company_list, dtype=object) for company_list in company_lists])))
+    masks = np.zeros((len(company_lists), len(symbols)), dtype=bool)
+    for row, company_list in zip(masks, company_lists):
+        row[symbols.get_indexer(company_list)] = True
     
-    # Combine sets using the specified operation
+    # Combine masks using the specified operation
     if operation.lower() == 'and':
-        result = company_sets[0]
-        for company_set in company_sets[1:]:
-            result = result.intersection(company_set)
+        combined = np.logical_and.reduce(masks, axis=0)
     elif operation.lower() == 'or':
-        result = company_sets[0]
-        for company_set in company_sets[1:]:
-            result = result.union(company_set)
+        combined = np.logical_or.reduce(masks, axis=0)
     else:
-        logger.error(f"Unsupported operation: {operation}")
+        logger.error("Unsupported operation: %s", operation)
         return []
     
-    logger.info(f"Combined {len(company_lists)} filter lists using '{operation}' "
-                f"operation, resulting in {len(result)} companies")
+    result = symbols[combined].tolist()
+    
+    logger.info("Combined %d filter lists using '%s' operation, resulting in %d companies",
+                len(company_lists), operation, len(result))
     
-    return list(result)
+    return result
 
 
 class CompanyFilterBuilder:
     """
     A builder class for creating and combining multiple company filters.
+    
+    Filters are queued when added and evaluated concurrently by build().
     """
     
     def __init__(self, stock_data=None, company_info=None):
@@ -486,11 +647,222 @@ class CompanyFilterBuilder:
         
         Args:
             stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
-            company_info (dict): Dictionary of company information
+            company_info (dict or pd.DataFrame): Dictionary of company information,
+                or a DataFrame from company_info_to_df
         """
+        # Sort once so date slices and symbol lookups hit the lexsorted path
+        if stock_data is not None and not stock_data.index.is_monotonic_increasing:
+            stock_data = stock_data.sort_index()
         self.stock_data = stock_data
         self.company_info = company_info
         self.filters = []
+        self._wide_cache = {}
+        self._indicator_cache = {}
+        self._cache_locks = {}
+        
+        # Symbol universe of the stock data, sorted like the columns of the
+        # pivoted frames so positions in either line up
+        self._symbols = stock_data.index.unique(level=1).sort_values() if stock_data is not None else pd.Index([])
+        self._company_df = None
+        
+        # Streaming indicator state, created by the first update() call
+        self._rsi_state = None
+        self._macd_state = None
+    
+    def _wide(self, column):
+        """
+        Get a stock data column pivoted to one column per company.
+        
+        The pivot is done on first use and shared by all later filters.
+        
+        Args:
+            column (str): Name of the stock data column, e.g. 'close' or 'volume'
+            
+        Returns:
+            pd.DataFrame: DataFrame with date index and one column per company
+        """
+        return self._cached(self._wide_cache, column,
+                            lambda: self.stock_data[column].unstack(level=1))
+    
+    def _cached(self, cache, key, compute):
+        """
+        Get a cached value, computing it at most once even when filters run concurrently.
+        
+        Args:
+            cache (dict): Cache to look the key up in
+            key (hashable): Cache key, unique across the builder's caches
+            compute (callable): Function returning the value on a cache miss
+            
+        Returns:
+            object: The cached value
+        """
+        if key not in cache:
+            # dict.setdefault is atomic, so every thread gets the same lock
+            with self._cache_locks.setdefault(key, threading.Lock()):
+                if key not in cache:
+                    cache[key] = compute()
+        return cache[key]
+    
+    def _indicator(self, name, period=None):
+        """
+        Get an indicator over all companies, computed once and shared by filters.
+        
+        Several filters on the same builder (e.g. RSI ranges or MACD signals
+        with different thresholds) then reuse one pass over the price history.
+        
+        Args:
+            name (str): 'rsi', 'macd' or 'avg_volume'
+            period (int, optional): RSI period or volume averaging period
+            
+        Returns:
+            pd.DataFrame or tuple: The indicator, as returned by its calculation
+        """
+        def compute():
+            if name == 'rsi':
+                return calculate_rsi(self._wide('close'), period)
+            elif name == 'macd':
+                return calculate_macd(self._wide('close'))
+            return self._wide('volume').rolling(window=period, min_periods=period).mean()
+        
+        return self._cached(self._indicator_cache, (name, period), compute)
+    
+    def _init_rsi_state(self, period):
+        """
+        Build the streaming RSI state from the loaded close prices.
+        
+        The state keeps the last `period` gains and losses of every company in
+        a ring buffer, so each update only replaces one row of it.
+        
+        Args:
+            period (int): Period for RSI calculation
+            
+        Returns:
+            dict: RSI state
+        """
+        close_wide = self._wide('close')
+        n_companies = len(close_wide.columns)
+        
+        # Changes are taken between consecutive rows, and missing changes count
+        # as zero, exactly as in calculate_rsi
+        delta = close_wide.diff().to_numpy(dtype=np.float64)[-period:]
+        gains = np.zeros((period, n_companies))
+        losses = np.zeros((period, n_companies))
+        gains[period - len(delta):] = np.where(delta > 0, delta, 0.0)
+        losses[period - len(delta):] = np.where(delta < 0, -delta, 0.0)
+        
+        return {
+            'period': period,
+            'gains': gains,
+            'losses': losses,
+            'pos': 0,
+            'last_close': close_wide.iloc[-1].to_numpy(dtype=np.float64),
+            'count': close_wide.notna().sum().to_numpy(),
+            'rsi': self._indicator('rsi', period).ffill().iloc[-1].to_numpy(dtype=np.float64)
+        }
+    
+    def _init_macd_state(self):
+        """
+        Build the streaming MACD state from the loaded close prices.
+        
+        Returns:
+            dict: MACD state with the fast and slow EMAs, and the MACD and signal
+                lines on each company's current and previous trading day
+        """
+        close_wide = self._wide('close')
+        valid = close_wide.notna().to_numpy()
+        macd_line, signal_line, histogram = self._indicator('macd')
+        
+        cols = np.arange(valid.shape[1])
+        cur_pos, prev_pos = _trading_day_positions(valid)
+        macd_values = macd_line.to_numpy()
+        signal_values = signal_line.to_numpy()
+        
+        def gather(values, pos):
+            return np.where(pos >= 0, values[pos, cols], np.nan)
+        
+        return {
+            'ema_fast': close_wide.ewm(span=12, adjust=False, ignore_na=True).mean().iloc[-1].to_numpy(),
+            'ema_slow': close_wide.ewm(span=26, adjust=False, ignore_na=True).mean().iloc[-1].to_numpy(),
+            'macd_cur': gather(macd_values, cur_pos),
+            'macd_prev': gather(macd_values, prev_pos),
+            'signal_cur': gather(signal_values, cur_pos),
+            'signal_prev': gather(signal_values, prev_pos)
+        }
+    
+    def update(self, new_close):
+        """
+        Advance the streaming RSI and MACD state by one trading day.
+        
+        Applies the RSI moving-average and EMA recurrences to one row of close
+        prices, so a refresh costs O(companies) instead of recomputing the
+        indicators over the whole history. Afterwards by_rsi (with the period
+        used for the state) and by_macd_signal read the streamed values when no
+        as_of_date is given; the other filters keep using the loaded stock data.
+        
+        Args:
+            new_close (pd.Series): Close prices of the new trading day indexed by symbol;
+                symbols outside the loaded stock data are ignored
+            
+        Returns:
+            CompanyFilterBuilder: Self for method chaining
+        """
+        if self.stock_data is None:
+            logger.error("Stock data not available for streaming update")
+            return self
+        
+        if self._rsi_state is None:
+            self._rsi_state = self._init_rsi_state(config.RSI_PERIOD)
+        if self._macd_state is None:
+            self._macd_state = self._init_macd_state()
+        
+        close = new_close.reindex(self._symbols).to_numpy(dtype=np.float64)
+        has_price = ~np.isnan(close)
+        
+        # RSI: replace the oldest gain/loss in the ring buffer
+        state = self._rsi_state
+        period = state['period']
+        delta = close - state['last_close']
+        state['gains'][state['pos']] = np.where(delta > 0, delta, 0.0)
+        state['losses'][state['pos']] = np.where(delta < 0, -delta, 0.0)
+        state['pos'] = (state['pos'] + 1) % period
+        state['last_close'] = close
+        state['count'] = state['count'] + has_price
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = state['gains'].sum(axis=0) / state['losses'].sum(axis=0)
+            rsi = 100 - (100 / (1 + rs))
+        rsi[has_price & (state['count'] < period)] = np.nan
+        state['rsi'] = np.where(has_price, rsi, state['rsi'])
+        
+        # MACD: ema = ema + alpha * (price - ema), starting from the first price
+        state = self._macd_state
+        
+        def ema_step(ema, values, span):
+            stepped = np.where(np.isnan(ema), values, ema + (2 / (span + 1)) * (values - ema))
+            return np.where(has_price, stepped, ema)
+        
+        state['ema_fast'] = ema_step(state['ema_fast'], close, 12)
+        state['ema_slow'] = ema_step(state['ema_slow'], close, 26)
+        macd = state['ema_fast'] - state['ema_slow']
+        signal = ema_step(state['signal_cur'], macd, 9)
+        
+        state['macd_prev'] = np.where(has_price, state['macd_cur'], state['macd_prev'])
+        state['signal_prev'] = np.where(has_price, state['signal_cur'], state['signal_prev'])
+        state['macd_cur'] = np.where(has_price, macd, state['macd_cur'])
+        state['signal_cur'] = signal
+        
+        return self
+    
+    def _company_table(self):
+        """
+        Get the company information as a DataFrame, converted on first use.
+        
+        Returns:
+            pd.DataFrame: Company information indexed by symbol
+        """
+        if self._company_df is None:
+            self._company_df = _company_frame(self.company_info)
+        return self._company_df
     
     def by_sector(self, sector):
         """
@@ -506,7 +878,8 @@ class CompanyFilterBuilder:
             logger.error("Company information not available for sector filter")
             return self
         
-        self.filters.append(filter_by_sector(self.company_info, sector))
+        sectors = [sector] if isinstance(sector, str) else sector
+        self.filters.append(partial(_sector_mask, self._company_table(), sectors))
         return self
     
     def by_market_cap(self, min_market_cap=None, max_market_cap=None):
@@ -524,7 +897,8 @@ class CompanyFilterBuilder:
             logger.error("Company information not available for market cap filter")
             return self
         
-        self.filters.append(filter_by_market_cap(self.company_info, min_market_cap, max_market_cap))
+        self.filters.append(partial(_range_mask, self._company_table(), 'market_cap',
+                                    min_market_cap, max_market_cap))
         return self
     
     def by_pe_ratio(self, min_pe=None, max_pe=None):
@@ -542,7 +916,7 @@ class CompanyFilterBuilder:
             logger.error("Company information not available for P/E ratio filter")
             return self
         
-        self.filters.append(filter_by_pe_ratio(self.company_info, min_pe, max_pe))
+        self.filters.append(partial(_range_mask, self._company_table(), 'pe_ratio', min_pe, max_pe))
         return self
     
     def by_eps(self, min_eps=None, max_eps=None):
@@ -560,7 +934,7 @@ class CompanyFilterBuilder:
             logger.error("Company information not available for EPS filter")
             return self
         
-        self.filters.append(filter_by_eps(self.company_info, min_eps, max_eps))
+        self.filters.append(partial(_range_mask, self._company_table(), 'eps', min_eps, max_eps))
         return self
     
     def by_rsi(self, min_rsi=None, max_rsi=None, period=None, as_of_date=None):
@@ -571,7 +945,8 @@ class CompanyFilterBuilder:
             min_rsi (float, optional): Minimum RSI value
             max_rsi (float, optional): Maximum RSI value
             period (int, optional): Period for RSI calculation, defaults to config value
-            as_of_date (str, optional): Date to calculate RSI as of, defaults to latest date
+            as_of_date (str, optional): Date to calculate RSI as of, defaults to latest date;
+            non-trading dates use the previous trading day
             
         Returns:
             CompanyFilterBuilder: Self for method chaining
@@ -580,7 +955,16 @@ class CompanyFilterBuilder:
             logger.error("Stock data not available for RSI filter")
             return self
         
-        self.filters.append(filter_by_rsi(self.stock_data, min_rsi, max_rsi, period, as_of_date))
+        state = self._rsi_state
+        if as_of_date is None and state is not None and state['period'] == (period or config.RSI_PERIOD):
+            # Read the RSI kept current by update(), as of now
+            self.filters.append(partial(_in_range, pd.Series(state['rsi'], index=self._symbols),
+                                        min_rsi, max_rsi))
+            return self
+        
+        period = period or config.RSI_PERIOD
+        self.filters.append(lambda: _rsi_mask(self._wide('close'), min_rsi, max_rsi, period, as_of_date,
+                                              rsi=self._indicator('rsi', period)))
         return self
     
     def by_volume(self, min_volume=None, max_volume=None, avg_period=20, as_of_date=None):
@@ -591,7 +975,8 @@ class CompanyFilterBuilder:
             min_volume (float, optional): Minimum volume value
             max_volume (float, optional): Maximum volume value
             avg_period (int, optional): Period for average volume calculation, defaults to 20
-            as_of_date (str, optional): Date to calculate volume as of, defaults to latest date
+            as_of_date (str, optional): Date to calculate volume as of, defaults to latest date;
+            non-trading dates use the previous trading day
             
         Returns:
             CompanyFilterBuilder: Self for method chaining
@@ -600,7 +985,9 @@ class CompanyFilterBuilder:
             logger.error("Stock data not available for volume filter")
             return self
         
-        self.filters.append(filter_by_volume(self.stock_data, min_volume, max_volume, avg_period, as_of_date))
+        self.filters.append(lambda: _volume_mask(self._wide('volume'), min_volume, max_volume, avg_period,
+                                                 as_of_date,
+                                                 avg_volume=self._indicator('avg_volume', avg_period)))
         return self
     
     def by_price_change(self, min_change=None, max_change=None, start_date=None, end_date=None):
@@ -620,8 +1007,8 @@ class CompanyFilterBuilder:
             logger.error("Stock data not available for price change filter")
             return self
         
-        self.filters.append(filter_by_price_change(
-            self.stock_data, min_change, max_change, start_date, end_date))
+        self.filters.append(partial(_price_change_mask, self.stock_data, min_change, max_change,
+                                    start_date, end_date))
         return self
     
     def by_macd_signal(self, signal_type='crossover', as_of_date=None):
@@ -630,7 +1017,8 @@ class CompanyFilterBuilder:
         
         Args:
             signal_type (str): Type of MACD signal ('crossover', 'crossunder', 'positive', 'negative')
-            as_of_date (str, optional): Date to check for MACD signal, defaults to latest date
+            as_of_date (str, optional): Date to check for MACD signal, defaults to latest date;
+            non-trading dates use the previous trading day
             
         Returns:
             CompanyFilterBuilder: Self for method chaining
@@ -639,7 +1027,17 @@ class CompanyFilterBuilder:
             logger.error("Stock data not available for MACD signal filter")
             return self
         
-        self.filters.append(filter_by_macd_signal(self.stock_data, signal_type, as_of_date))
+        state = self._macd_state
+        if as_of_date is None and state is not None:
+            # Read the MACD and signal lines kept current by update(), as of now
+            mask = _macd_signal_mask(signal_type, state['macd_prev'], state['macd_cur'],
+                                     state['signal_prev'], state['signal_cur'])
+            mask &= ~np.isnan(state['macd_prev'])
+            self.filters.append(partial(pd.Series, mask, index=self._symbols))
+            return self
+        
+        self.filters.append(lambda: _macd_mask(self._wide('close'), signal_type, as_of_date,
+                                               macd=self._indicator('macd')))
         return self
     
     def by_circuit_breakers(self, circuit_data, circuit_type=None, min_count=1):
@@ -654,7 +1052,7 @@ class CompanyFilterBuilder:
         Returns:
             CompanyFilterBuilder: Self for method chaining
         """
-        self.filters.append(filter_by_circuit_breakers(circuit_data, circuit_type, min_count))
+        self.filters.append(partial(_circuit_breaker_mask, circuit_data, circuit_type, min_count))
         return self
     
     def build(self, operation='and'):
@@ -671,4 +1069,35 @@ class CompanyFilterBuilder:
             logger.warning("No filters added, returning empty list")
             return []
         
-        return combine_filters(self.filters, operation)
+        # Evaluate the queued filters concurrently; they only read the stock
+        # data and the shared caches, and NumPy/pandas release the GIL in their
+        # inner loops
+        if len(self.filters) > 1:
+            max_workers = min(len(self.filters), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                filter_masks = list(executor.map(lambda evaluate: evaluate(), self.filters))
+        else:
+            filter_masks = [self.filters[0]()]
+        
+        # Align the masks on the union of their symbols (a symbol missing from
+        # a filter's universe doesn't pass it) and reduce them in one pass
+        symbols = filter_masks[0].index
+        for mask in filter_masks[1:]:
+            symbols = symbols.union(mask.index)
+        masks = np.vstack([mask.reindex(symbols, fill_value=False).to_numpy(dtype=bool)
+                           for mask in filter_masks])
+        
+        if operation.lower() == 'and':
+            combined = np.logical_and.reduce(masks, axis=0)
+        elif operation.lower() == 'or':
+            combined = np.logical_or.reduce(masks, axis=0)
+        else:
+            logger.error("Unsupported operation: %s", operation)
+            return []
+        
+        result = symbols[combined].tolist()
+        
+        logger.info("Combined %d filters using '%s' operation, resulting in %d companies",
+                    len(self.filters), operation, len(result))
+        
+        return result
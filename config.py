@@ -3,29 +3,59 @@ NEPSEZEN - Nepal Stock Exchange Simulator
 Configuration Settings Module
 """
 
-import os
+from dataclasses import dataclass
 from pathlib import Path
 
+
+@dataclass(frozen=True)
+class TradingHours:
+    """Market session times (HH:MM)"""
+    start: str
+    end: str
+
+
+@dataclass(frozen=True)
+class CircuitBreakerThreshold:
+    """Daily return limits that trigger a circuit breaker"""
+    upper: float
+    lower: float
+
+
+@dataclass(frozen=True)
+class EventImpact:
+    """Price impact of market events by severity"""
+    low: float
+    medium: float
+    high: float
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """Storage backend settings"""
+    type: str
+    connection_string: str
+
+
 # Path configurations
 BASE_DIR = Path(__file__).parent
-DATA_DIR = os.path.join(BASE_DIR, 'data')
-COMPANIES_DATA_FILE = os.path.join(DATA_DIR, 'companies.json')
-HISTORICAL_DATA_DIR = os.path.join(DATA_DIR, 'historical')
+DATA_DIR = BASE_DIR / 'data'
+COMPANIES_DATA_FILE = DATA_DIR / 'companies.json'
+HISTORICAL_DATA_DIR = DATA_DIR / 'historical'
 
 # Simulation configurations
 DEFAULT_SIMULATION_DAYS = 30
 TRADING_DAYS_PER_YEAR = 252  # Number of trading days in a year
-TRADING_HOURS = {
-    'start': '10:00',  # Market opens at 10:00 AM
-    'end': '15:00'     # Market closes at 3:00 PM
-}
+TRADING_HOURS = TradingHours(
+    start='10:00',  # Market opens at 10:00 AM
+    end='15:00'     # Market closes at 3:00 PM
+)
 
 # Market parameters
 MAX_DAILY_PRICE_CHANGE = 0.1  # Maximum 10% daily change by default
-CIRCUIT_BREAKER_THRESHOLD = {
-    'upper': 0.1,      # +10% upper circuit
-    'lower': -0.1      # -10% lower circuit
-}
+CIRCUIT_BREAKER_THRESHOLD = CircuitBreakerThreshold(
+    upper=0.1,      # +10% upper circuit
+    lower=-0.1      # -10% lower circuit
+)
 
 # Technical indicators parameters
 RSI_PERIOD = 14  # Default period for RSI calculation
@@ -38,11 +68,12 @@ SECTOR_EVENT_PROBABILITY = 0.15  # 15% chance of a sector-specific event each da
 COMPANY_EVENT_PROBABILITY = 0.05  # 5% chance of a company-specific event
 
 # Market event impact levels
-EVENT_IMPACT = {
-    'low': 0.01,       # 1% impact
-    'medium': 0.03,    # 3% impact
-    'high': 0.05       # 5% impact
-}
+EVENT_IMPACT = EventImpact(
+    low=0.01,       # 1% impact
+    medium=0.03,    # 3% impact
+    high=0.05       # 5% impact
+)
+EVENT_IMPACT_LEVELS = (EVENT_IMPACT.low, EVENT_IMPACT.medium, EVENT_IMPACT.high)
 
 # Dashboard settings
 DASHBOARD_REFRESH_RATE = 5  # Refresh dashboard every 5 seconds
@@ -59,7 +90,7 @@ API_KEYS = {
 }
 
 # Database settings (for future implementation)
-DATABASE_CONFIG = {
-    'type': 'file',  # Options: 'file', 'mongodb', 'sql'
-    'connection_string': '',
-}
+DATABASE_CONFIG = DatabaseConfig(
+    type='file',  # Options: 'file', 'mongodb', 'sql'
+    connection_string='',
+)
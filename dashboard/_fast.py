@@ -0,0 +1,67 @@
+"""
+NEPSEZEN - Nepal Stock Exchange Simulator
+Compiled Dashboard Kernels
+
+Numeric kernels behind the dashboard's market analysis. With numba they are
+compiled single-pass loops; without it they fall back to NumPy's C reductions
+instead of running the loops as plain Python.
+"""
+
+import numpy as np
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _breadth_sector_loop(pct, sector_ids, n_sectors):
+    """Single-pass breadth_sector, for compilation with numba"""
+    advances = 0
+    declines = 0
+    sector_sum = np.zeros(n_sectors)
+    sector_count = np.zeros(n_sectors, dtype=np.int64)
+
+    for i in range(len(pct)):
+        value = pct[i]
+        if value > 0:
+            advances += 1
+        elif value < 0:
+            declines += 1
+
+        sector = sector_ids[i]
+        if sector >= 0 and not np.isnan(value):
+            sector_sum[sector] += value
+            sector_count[sector] += 1
+
+    unchanged = len(pct) - advances - declines
+    return advances, declines, unchanged, sector_sum, sector_count
+
+
+def _breadth_sector_vectorized(pct, sector_ids, n_sectors):
+    """breadth_sector built from NumPy reductions, for use without numba"""
+    advances = np.count_nonzero(pct > 0)
+    declines = np.count_nonzero(pct < 0)
+
+    counted = (sector_ids >= 0) & ~np.isnan(pct)
+    sector_sum = np.bincount(sector_ids[counted], weights=pct[counted], minlength=n_sectors)
+    sector_count = np.bincount(sector_ids[counted], minlength=n_sectors)
+
+    unchanged = len(pct) - advances - declines
+    return advances, declines, unchanged, sector_sum, sector_count
+
+
+def breadth_sector(pct, sector_ids, n_sectors):
+    """
+    Count market breadth and total returns by sector
+
+    Args:
+        pct (np.ndarray): Percent change of each company
+        sector_ids (np.ndarray): Integer sector code of each company, -1 when unknown
+        n_sectors (int): Number of sector codes
+
+    Returns:
+        tuple: (advances, declines, unchanged, sector_sum, sector_count), where
+            the sector arrays hold the sum and number of non-NaN returns per code
+    """
+    if NUMBA_AVAILABLE:
+        return _breadth_sector_loop(pct, sector_ids, n_sectors)
+    return _breadth_sector_vectorized(pct, sector_ids, n_sectors)
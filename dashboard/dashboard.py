@@ -23,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from simulator.main_builder import MarketSimulation, PortfolioManager
 from analytics.analyzer import MarketAnalyzer
+from dashboard.simple_analyze import build_sector_lookup, simple_market_analysis
 from utils.visualizer import (
     plot_interactive_candlestick, plot_sector_performance,
     plot_volume_heatmap, plot_portfolio_performance, plot_circuit_breakers
@@ -38,6 +39,245 @@ if 'simulation' not in st.session_state:
     st.session_state.portfolio_manager = None
 
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_company_list(simulation_id, data_version, _simulation):
+    """
+    Get the detailed company list, rebuilt only when the market data changes.
+    
+    Args:
+        simulation_id (int): id() of the simulation, so sessions don't share entries
+        data_version (int): The simulation's data_version
+        _simulation (MarketSimulation): Simulation to read from (not hashed)
+        
+    Returns:
+        dict: Company details keyed by symbol
+    """
+    return _simulation.get_company_list(with_details=True)
+
+
+def get_company_details():
+    """Get the detailed company list of the current simulation from the cache"""
+    simulation = st.session_state.simulation
+    return _cached_company_list(id(simulation), simulation.data_version, simulation)
+
+
+def refresh_company_lookups():
+    """
+    Keep symbol-indexed latest price and sector Series in session state.
+    
+    They are rebuilt once per simulation data version, so per-widget lookups
+    are Series.get calls instead of walks through the nested company dicts.
+    """
+    data_version = st.session_state.simulation.data_version
+    if st.session_state.get('lookup_version') == data_version:
+        return
+    
+    info_df = pd.DataFrame.from_dict(get_company_details(), orient='index').reindex(
+        columns=['latest_price', 'sector'])
+    st.session_state.latest_price = info_df['latest_price'].astype('float64').fillna(0.0)
+    st.session_state.sector = info_df['sector']
+    st.session_state.lookup_version = data_version
+
+
+def _leaderboard_frame(values, column, fmt):
+    """
+    Build a display-ready leaderboard table.
+    
+    Args:
+        values (dict): Values keyed by symbol, in display order
+        column (str): Name of the value column
+        fmt (str): Format string for the values
+        
+    Returns:
+        pd.DataFrame: Symbol and formatted value columns
+    """
+    df = pd.Series(values, name=column, dtype='float64').rename_axis('Symbol').reset_index()
+    df[column] = df[column].map(fmt.format)
+    return df
+
+
+@st.cache_resource(max_entries=16)
+def _cached_sector_lookup(simulation_id, data_version, _simulation):
+    """
+    Get the simulation's sector codes, encoded once per data version.
+    
+    Args:
+        simulation_id (int): id() of the simulation, so sessions don't share entries
+        data_version (int): The simulation's data_version
+        _simulation (MarketSimulation): Simulation to read from (not hashed)
+        
+    Returns:
+        dict: Sector codes from build_sector_lookup
+    """
+    return build_sector_lookup(_simulation.company_info)
+
+
+@st.cache_data(show_spinner="Running market analysis...", max_entries=16)
+def _run_analysis(simulation_id, data_version, _stock_data, _company_info, _sector_lookup):
+    """
+    Run the simple market analysis, reusing the result while the data is unchanged.
+    
+    Args:
+        simulation_id (int): id() of the simulation, so sessions don't share entries
+        data_version (int): The simulation's data_version
+        _stock_data (pd.DataFrame): Stock data to analyze (not hashed)
+        _company_info (dict): Company information (not hashed)
+        _sector_lookup (dict): Sector codes from build_sector_lookup (not hashed)
+        
+    Returns:
+        dict: Dictionary with analysis results, including the leaderboard tables
+            already formatted for display
+    """
+    results = simple_market_analysis(_stock_data, _company_info, sector_lookup=_sector_lookup)
+    
+    # Format the leaderboards here, so reruns only display the cached tables
+    results['top_gainers_df'] = _leaderboard_frame(results['top_gainers'], 'Return (%)', "{:.2f}%")
+    results['top_losers_df'] = _leaderboard_frame(results['top_losers'], 'Return (%)', "{:.2f}%")
+    results['volume_leaders_df'] = _leaderboard_frame(results['volume_leaders'], 'Volume', "{:,.0f}")
+    return results
+
+
+def get_analysis_results(simulation):
+    """
+    Get the market analysis of the simulation's current data.
+    
+    Args:
+        simulation (MarketSimulation): Simulation to analyze
+        
+    Returns:
+        dict: Dictionary with analysis results, or None if there is no market data
+    """
+    stock_data = simulation.data_generator.stock_data if simulation.data_generator else None
+    if stock_data is None:
+        return None
+    sector_lookup = _cached_sector_lookup(id(simulation), simulation.data_version, simulation)
+    return _run_analysis(id(simulation), simulation.data_version, stock_data, simulation.company_info, sector_lookup)
+
+
+def _npr_fmt(values):
+    """
+    Format a Series of amounts as NPR currency strings.
+    
+    Args:
+        values (pd.Series): Amounts in NPR
+        
+    Returns:
+        pd.Series: Strings like "NPR 1,234.50"
+    """
+    return "NPR " + values.map("{:,.2f}".format)
+
+
+def _frame_key(data):
+    """
+    Get a cheap fingerprint of date-ordered market data for the figure caches.
+    
+    Args:
+        data (pd.DataFrame or pd.Series): Market data sorted by date
+        
+    Returns:
+        tuple: Row count and first and last index labels
+    """
+    if data.empty:
+        return (0,)
+    return (len(data), data.index[0], data.index[-1])
+
+
+# Figures are cached as resources: they are shared, not copied, between
+# reruns, and st.plotly_chart only reads them
+
+@st.cache_resource(max_entries=32)
+def _cached_candlestick(simulation_id, data_version, data_key, title, include_volume, include_rsi, include_bb,
+                        include_macd, _data):
+    """Build the candlestick chart of a company, reusing it while the inputs are unchanged"""
+    return plot_interactive_candlestick(
+        _data,
+        title=title,
+        include_volume=include_volume,
+        include_rsi=include_rsi,
+        include_bb=include_bb,
+        include_macd=include_macd
+    )
+
+
+@st.cache_resource(max_entries=16)
+def _cached_sector_performance(sector_perf, title="Sector Performance"):
+    """Build the sector performance chart, reusing it while the returns are unchanged"""
+    return plot_sector_performance(sector_perf, title=title)
+
+
+@st.cache_resource(max_entries=16)
+def _cached_portfolio_performance(manager_id, portfolio_name, n_points, last_date, title, _history_df):
+    """Build the portfolio performance chart, reusing it while the history is unchanged"""
+    return plot_portfolio_performance(_history_df, title=title)
+
+
+@st.cache_resource(max_entries=16)
+def _cached_volume_heatmap(simulation_id, data_version, data_key, companies, title, _volume_pivot):
+    """Build the volume heatmap, reusing it while the date range and companies are unchanged"""
+    return plot_volume_heatmap(_volume_pivot, list(companies), title=title)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _transactions_frame(manager_id, portfolio_name, n_transactions, last_timestamp, _transactions):
+    """
+    Get a portfolio's transactions, newest first.
+    
+    Within one portfolio manager transactions are only appended, in time order,
+    so reversing the list replaces a sort by timestamp. The manager is rebuilt
+    when the simulation is reloaded, so its id and the newest timestamp are part
+    of the key along with the count.
+    
+    Args:
+        manager_id (int): id() of the portfolio manager, so reloads and sessions
+            don't share entries
+        portfolio_name (str): Portfolio name
+        n_transactions (int): Number of transactions in the portfolio
+        last_timestamp (str): Timestamp of the newest transaction
+        _transactions (list): Transaction records (not hashed)
+        
+    Returns:
+        pd.DataFrame: Transactions in descending timestamp order
+    """
+    transactions_df = pd.DataFrame(_transactions[::-1])
+    # The log keeps JSON-friendly timestamp strings; parse them for display
+    if 'timestamp' in transactions_df:
+        transactions_df['timestamp'] = pd.to_datetime(transactions_df['timestamp'], format='%Y-%m-%d %H:%M:%S')
+    return transactions_df
+
+
+def refresh_analysis(simulation):
+    """
+    Get the session's market analysis, recomputing it only when the simulation data changed.
+    
+    Args:
+        simulation (MarketSimulation): Simulation to analyze
+        
+    Returns:
+        dict: Dictionary with analysis results, or None if there is no market data
+    """
+    if st.session_state.get('analysis_version') != simulation.data_version:
+        st.session_state.analysis_results = get_analysis_results(simulation)
+        st.session_state.analysis_version = simulation.data_version
+    return st.session_state.analysis_results
+
+
+@st.cache_resource(max_entries=16)
+def _sector_pie(labels, values):
+    """
+    Build the companies-by-sector donut chart.
+    
+    Args:
+        labels (tuple): Sector names
+        values (tuple): Number of companies in each sector
+        
+    Returns:
+        plotly.graph_objects.Figure: The Plotly figure object
+    """
+    fig = go.Figure(data=[go.Pie(labels=list(labels), values=list(values), hole=0.4)])
+    fig.update_layout(title="Companies by Sector")
+    return fig
+
+
 def load_simulation_data():
     """Load simulation data and initialize components"""
     simulation = st.session_state.simulation
@@ -60,6 +300,12 @@ def load_simulation_data():
             st.error("Failed to initialize simulation. Please check the logs.")
             return False
     
+    # Sort the market data once so date ranges can be sliced with binary
+    # searches; later simulated days are appended in date order
+    stock_data = simulation.data_generator.stock_data
+    if stock_data is not None and not stock_data.index.is_monotonic_increasing:
+        stock_data.sort_index(inplace=True)
+    
     # Initialize portfolio manager
     st.session_state.portfolio_manager = PortfolioManager(simulation)
     
@@ -67,6 +313,16 @@ def load_simulation_data():
     if st.session_state.portfolio_manager:
         st.session_state.portfolio_manager.create_portfolio("Demo Portfolio")
     
+    # Company names don't change during a simulation, so the company select
+    # box labels are built once per load
+    st.session_state.company_symbols = list(simulation.company_info.keys())
+    st.session_state.company_options = [
+        f"{symbol} - {info.get('company_name', 'Unknown')}" for symbol, info in simulation.company_info.items()
+    ]
+    
+    # Sectors are static too, so their company counts are aggregated once
+    st.session_state.sector_counts = simulation.get_sector_list()
+    
     st.session_state.loaded = True
     return True
 
@@ -79,37 +335,24 @@ def render_overview_tab():
     
     # Market status
     market_status = simulation.get_market_status()
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Mode", market_status.get('mode', 'Historical'))
-        if 'latest_date' in market_status:
-            st.metric("Latest Date", market_status.get('latest_date'))
-    
-    with col2:
-        st.metric("Total Companies", market_status.get('companies', 0))
-        
-    with col3:
-        st.metric("Trading Days", market_status.get('trading_days', 0))
-      # Run simplified market analysis if not done already
-    if 'analysis_results' not in st.session_state:
-        with st.spinner("Running market analysis..."):
-            # Use simple_analyze directly
-            try:
-                from dashboard.simple_analyze import simple_market_analysis
-                if hasattr(simulation, 'data_generator') and simulation.data_generator.stock_data is not None:
-                    st.session_state.analysis_results = simple_market_analysis(
-                        simulation.data_generator.stock_data, 
-                        simulation.company_info
-                    )
-                else:
-                    st.error("No market data available for analysis")
-                    st.session_state.analysis_results = None
-            except Exception as e:
-                st.error(f"Error analyzing market data: {str(e)}")
-                st.session_state.analysis_results = None
+    metrics = [
+        ("Mode", market_status.get('mode', 'Historical')),
+        ("Latest Date", market_status.get('latest_date', '-')),
+        ("Total Companies", market_status.get('companies', 0)),
+        ("Trading Days", market_status.get('trading_days', 0))
+    ]
     
-    analysis = st.session_state.analysis_results
+    # Emit all metrics in one row of columns
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value)
+      # Run simplified market analysis (only when the market data changed)
+    try:
+        analysis = refresh_analysis(simulation)
+        if analysis is None:
+            st.error("No market data available for analysis")
+    except Exception as e:
+        st.error(f"Error analyzing market data: {str(e)}")
+        analysis = None
     
     # Market Summary
     if analysis and 'market_breadth' in analysis:
@@ -130,7 +373,7 @@ def render_overview_tab():
         
         # Create sector performance chart
         try:
-            fig = plot_sector_performance(sector_perf)
+            fig = _cached_sector_performance(sector_perf)
             st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error plotting sector performance: {str(e)}")
@@ -142,46 +385,24 @@ def render_overview_tab():
             }).sort_values('Performance (%)', ascending=False)
             
             st.dataframe(sector_df)
-        st.plotly_chart(fig, use_container_width=True)
       # Top Gainers and Losers
     if analysis and 'top_gainers' in analysis and 'top_losers' in analysis:
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("Top Gainers")
-            gainers_df = pd.DataFrame({
-                'Symbol': list(analysis['top_gainers'].keys()),
-                'Return (%)': list(analysis['top_gainers'].values())
-            })
-            if not gainers_df.empty:
-                gainers_df['Return (%)'] = gainers_df['Return (%)'].apply(lambda x: f"{x:.2f}%")
-                st.dataframe(gainers_df, use_container_width=True)
+            if not analysis['top_gainers_df'].empty:
+                st.dataframe(analysis['top_gainers_df'], use_container_width=True)
         
         with col2:
             st.subheader("Top Losers")
-            losers_df = pd.DataFrame({
-                'Symbol': list(analysis['top_losers'].keys()),
-                'Return (%)': list(analysis['top_losers'].values())
-            })
-            if not losers_df.empty:
-                losers_df['Return (%)'] = losers_df['Return (%)'].apply(lambda x: f"{x:.2f}%")
-                st.dataframe(losers_df, use_container_width=True)
+            if not analysis['top_losers_df'].empty:
+                st.dataframe(analysis['top_losers_df'], use_container_width=True)
       # Volume Leaders 
     if analysis and 'volume_leaders' in analysis:
         st.subheader("Volume Leaders")
-        volume_df = pd.DataFrame({
-            'Symbol': list(analysis['volume_leaders'].keys()),
-            'Volume': list(analysis['volume_leaders'].values())
-        })
-        if not volume_df.empty:
-            volume_df['Volume'] = volume_df['Volume'].apply(lambda x: f"{x:,.0f}")
-            st.dataframe(volume_df, use_container_width=True)
-        fig.add_vline(x=30, line_dash="dash", line_color="green",
-                      annotation_text="Oversold (30)", annotation_position="top")
-        fig.add_vline(x=70, line_dash="dash", line_color="red",
-                      annotation_text="Overbought (70)", annotation_position="top")
-        
-        st.plotly_chart(fig, use_container_width=True)
+        if not analysis['volume_leaders_df'].empty:
+            st.dataframe(analysis['volume_leaders_df'], use_container_width=True)
 
 
 def render_stocks_tab():
@@ -191,27 +412,29 @@ def render_stocks_tab():
     simulation = st.session_state.simulation
     
     # Get company list for selection
-    companies = simulation.get_company_list(with_details=True)
+    companies = get_company_details()
     
-    # Create a selectbox for company selection
-    company_options = [(f"{symbol} - {info['name']}") for symbol, info in companies.items()]
-    selected_option = st.selectbox("Select a company", company_options, index=0)
-    
-    # Extract symbol from selected option
-    selected_symbol = selected_option.split(" - ")[0]
+    # Create a selectbox for company selection; it selects by position, so the
+    # symbol is looked up instead of parsed back out of the label
+    company_options = st.session_state.company_options
+    selected_index = st.selectbox("Select a company", range(len(company_options)), index=0,
+                                  format_func=company_options.__getitem__)
+    selected_symbol = st.session_state.company_symbols[selected_index]
     st.session_state.selected_company = selected_symbol
     
     # Get company details
     company_info = companies.get(selected_symbol, {})
+    refresh_company_lookups()
+    latest_price = st.session_state.latest_price.get(selected_symbol, 0.0)
     
     # Display company info
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Sector", company_info.get('sector', 'Unknown'))
+        st.metric("Sector", st.session_state.sector.get(selected_symbol, 'Unknown'))
         
     with col2:
-        if company_info.get('latest_price'):
-            st.metric("Latest Price", f"NPR {company_info['latest_price']:.2f}")
+        if latest_price:
+            st.metric("Latest Price", f"NPR {latest_price:.2f}")
             
     with col3:
         if company_info.get('pe_ratio'):
@@ -234,9 +457,8 @@ def render_stocks_tab():
         with col2:
             end_date = st.date_input("End Date", max_date, min_value=min_date, max_value=max_date)
         
-        # Filter data by date range
-        filtered_data = stock_data.loc[(stock_data.index >= pd.Timestamp(start_date)) & 
-                                       (stock_data.index <= pd.Timestamp(end_date))]
+        # Filter data by date range (the date index is sorted)
+        filtered_data = stock_data.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
         
         # Display interactive chart
         chart_options = st.multiselect(
@@ -250,13 +472,16 @@ def render_stocks_tab():
         include_bb = "Bollinger Bands" in chart_options
         include_macd = "MACD" in chart_options
         
-        fig = plot_interactive_candlestick(
-            filtered_data, 
-            title=f"{selected_symbol} - Stock Price",
-            include_volume=include_volume,
-            include_rsi=include_rsi,
-            include_bb=include_bb,
-            include_macd=include_macd
+        fig = _cached_candlestick(
+            id(simulation),
+            simulation.data_version,
+            _frame_key(filtered_data),
+            f"{selected_symbol} - Stock Price",
+            include_volume,
+            include_rsi,
+            include_bb,
+            include_macd,
+            filtered_data
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -300,7 +525,7 @@ def render_portfolio_tab():
             if submit and portfolio_name:
                 portfolio_manager.create_portfolio(portfolio_name, initial_balance)
                 st.success(f"Portfolio '{portfolio_name}' created!")
-                st.experimental_rerun()
+                st.rerun()
     
     # Display selected portfolio
     if selected_portfolio:
@@ -334,26 +559,33 @@ def render_portfolio_tab():
             history_df['date'] = pd.to_datetime(history_df['date'])
             history_df = history_df.set_index('date')
             
-            fig = plot_portfolio_performance(history_df, title=f"Portfolio Performance - {selected_portfolio}")
+            history = full_portfolio['history']
+            fig = _cached_portfolio_performance(id(portfolio_manager), selected_portfolio, len(history),
+                                                history[-1]['date'], f"Portfolio Performance - {selected_portfolio}",
+                                                history_df)
             st.plotly_chart(fig, use_container_width=True)
         
         # Holdings table
         st.subheader("Current Holdings")
         
         if portfolio['holdings']:
-            holdings_data = []
-            for symbol, holding in portfolio['holdings'].items():
-                holdings_data.append({
-                    'Symbol': symbol,
-                    'Shares': holding['shares'],
-                    'Average Cost': f"NPR {holding['average_price']:,.2f}",
-                    'Current Price': f"NPR {holding.get('current_price', 0):,.2f}",
-                    'Market Value': f"NPR {holding.get('current_value', 0):,.2f}",
-                    'Profit/Loss': f"NPR {holding.get('profit_loss', 0):,.2f}",
-                    'Return': f"{holding.get('profit_loss_pct', 0):,.2f}%"
-                })
+            # Build the table column-wise; holdings not yet valued show zeros
+            holdings_df = pd.DataFrame.from_dict(portfolio['holdings'], orient='index').reindex(
+                columns=['shares', 'average_price', 'current_price', 'current_value',
+                         'profit_loss', 'profit_loss_pct']).fillna(0)
+            for col in ['average_price', 'current_price', 'current_value', 'profit_loss']:
+                holdings_df[col] = _npr_fmt(holdings_df[col])
+            holdings_df['profit_loss_pct'] = holdings_df['profit_loss_pct'].map("{:,.2f}%".format)
+            holdings_df = holdings_df.rename(columns={
+                'shares': 'Shares',
+                'average_price': 'Average Cost',
+                'current_price': 'Current Price',
+                'current_value': 'Market Value',
+                'profit_loss': 'Profit/Loss',
+                'profit_loss_pct': 'Return'
+            }).rename_axis('Symbol').reset_index()
             
-            st.dataframe(pd.DataFrame(holdings_data), use_container_width=True)
+            st.dataframe(holdings_df, use_container_width=True)
         else:
             st.info("No holdings in this portfolio")
         
@@ -367,15 +599,16 @@ def render_portfolio_tab():
             
             with st.form("buy_form"):
                 # Get company list for selection
-                companies = st.session_state.simulation.get_company_list(with_details=True)
-                company_options = [(f"{symbol} - {info['name']}") for symbol, info in companies.items()]
+                company_options = st.session_state.company_options
                 
-                buy_company = st.selectbox("Select Company", company_options, key="buy_company")
-                buy_symbol = buy_company.split(" - ")[0]
+                buy_index = st.selectbox("Select Company", range(len(company_options)), key="buy_company",
+                                         format_func=company_options.__getitem__)
+                buy_symbol = st.session_state.company_symbols[buy_index]
                 buy_quantity = st.number_input("Quantity", min_value=1, value=100, step=10, key="buy_quantity")
                 
                 # Get current price
-                current_price = companies.get(buy_symbol, {}).get('latest_price', 0)
+                refresh_company_lookups()
+                current_price = st.session_state.latest_price.get(buy_symbol, 0.0)
                 st.text(f"Current Price: NPR {current_price:,.2f}")
                 st.text(f"Total Cost: NPR {current_price * buy_quantity:,.2f}")
                 
@@ -385,7 +618,7 @@ def render_portfolio_tab():
                     result = portfolio_manager.buy_stock(selected_portfolio, buy_symbol, buy_quantity)
                     if result:
                         st.success(f"Bought {buy_quantity} shares of {buy_symbol}")
-                        st.experimental_rerun()
+                        st.rerun()
                     else:
                         st.error("Transaction failed. Check portfolio balance or stock availability.")
         
@@ -416,7 +649,7 @@ def render_portfolio_tab():
                         result = portfolio_manager.sell_stock(selected_portfolio, sell_symbol, sell_quantity)
                         if result:
                             st.success(f"Sold {sell_quantity} shares of {sell_symbol}")
-                            st.experimental_rerun()
+                            st.rerun()
                         else:
                             st.error("Transaction failed.")
                 else:
@@ -429,9 +662,9 @@ def render_portfolio_tab():
             
             full_portfolio = portfolio_manager.get_portfolio(selected_portfolio, with_history=True)
             if 'transactions' in full_portfolio and full_portfolio['transactions']:
-                transactions_df = pd.DataFrame(full_portfolio['transactions'])
-                # Sort by timestamp in descending order
-                transactions_df = transactions_df.sort_values('timestamp', ascending=False)
+                transactions = full_portfolio['transactions']
+                transactions_df = _transactions_frame(id(portfolio_manager), selected_portfolio, len(transactions),
+                                                      transactions[-1].get('timestamp'), transactions)
                 st.dataframe(transactions_df, use_container_width=True)
             else:
                 st.info("No transactions recorded")
@@ -449,39 +682,39 @@ def render_analytics_tab():
         ["Sector Analysis", "Circuit Breakers", "Volume Analysis", "RSI Screening"]
     )
     
+    # Only the views that show market analysis results (re)compute them
+    analysis = {}
+    if analytics_type != "Volume Analysis":
+        analysis = refresh_analysis(simulation) or {}
+    
     if analytics_type == "Sector Analysis":
         st.subheader("Sector Analysis")
         
         # Get sector list
-        sectors = simulation.get_sector_list()
+        sectors = st.session_state.sector_counts
         
         # Show sector distribution
-        fig = px.pie(
-            values=list(sectors.values()),
-            names=list(sectors.keys()),
-            title="Companies by Sector",
-            hole=0.4
-        )
+        fig = _sector_pie(tuple(sectors.keys()), tuple(sectors.values()))
         st.plotly_chart(fig, use_container_width=True)
         
         # Sector performance
-        if 'analysis_results' in st.session_state and 'sector_performance' in st.session_state.analysis_results:
-            sector_perf = st.session_state.analysis_results['sector_performance']
+        if 'sector_performance' in analysis:
+            sector_perf = analysis['sector_performance']
             
             # Show sector performance bar chart
-            fig = plot_sector_performance(sector_perf, title="Sector Performance")
+            fig = _cached_sector_performance(sector_perf, title="Sector Performance")
             st.plotly_chart(fig, use_container_width=True)
         
     elif analytics_type == "Circuit Breakers":
         st.subheader("Circuit Breaker Analysis")
         
-        if 'analysis_results' in st.session_state and 'circuit_breakers' in st.session_state.analysis_results:
-            circuit_data = st.session_state.analysis_results['circuit_breakers']
+        if 'circuit_breakers' in analysis:
+            circuit_data = analysis['circuit_breakers']
             
             # Show circuit breaker stats
-            if 'upper_circuit_counts' in st.session_state.analysis_results and 'lower_circuit_counts' in st.session_state.analysis_results:
-                upper = st.session_state.analysis_results['upper_circuit_counts']
-                lower = st.session_state.analysis_results['lower_circuit_counts']
+            if 'upper_circuit_counts' in analysis and 'lower_circuit_counts' in analysis:
+                upper = analysis['upper_circuit_counts']
+                lower = analysis['lower_circuit_counts']
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -499,21 +732,12 @@ def render_analytics_tab():
                 # Show companies with most circuit breakers
                 st.subheader("Companies with Most Circuit Breakers")
                 
-                # Combine upper and lower circuit counts
-                all_circuits = {}
-                for symbol, count in upper.items():
-                    all_circuits[symbol] = {'symbol': symbol, 'upper': count, 'lower': 0}
-                
-                for symbol, count in lower.items():
-                    if symbol in all_circuits:
-                        all_circuits[symbol]['lower'] = count
-                    else:
-                        all_circuits[symbol] = {'symbol': symbol, 'upper': 0, 'lower': count}
-                
-                # Convert to dataframe
-                circuit_df = pd.DataFrame(list(all_circuits.values()))
+                # Combine upper and lower circuit counts with an outer join
+                circuit_df = pd.concat([pd.Series(upper, name='upper', dtype='int64'),
+                                        pd.Series(lower, name='lower', dtype='int64')],
+                                       axis=1).fillna(0).astype(int)
                 circuit_df['total'] = circuit_df['upper'] + circuit_df['lower']
-                circuit_df = circuit_df.sort_values('total', ascending=False).head(10)
+                circuit_df = circuit_df.nlargest(10, 'total').reset_index(names='symbol')
                 
                 # Display table
                 st.dataframe(circuit_df[['symbol', 'upper', 'lower', 'total']], use_container_width=True)
@@ -521,12 +745,13 @@ def render_analytics_tab():
     elif analytics_type == "Volume Analysis":
         st.subheader("Volume Analysis")
         
-        # Date range selection
+        # Date range selection; the full-market frame is shared, not copied,
+        # so it is only read here
         stock_data = simulation.get_stock_data()
         if stock_data is not None:
-            # Get min and max dates
-            min_date = stock_data.index.get_level_values(0).min().date()
-            max_date = stock_data.index.get_level_values(0).max().date()
+            # Get min and max dates from the ends of the sorted date level
+            min_date = stock_data.index[0][0].date()
+            max_date = stock_data.index[-1][0].date()
             
             col1, col2 = st.columns(2)
             with col1:
@@ -534,16 +759,18 @@ def render_analytics_tab():
             with col2:
                 end_date = st.date_input("End Date", max_date, min_value=min_date, max_value=max_date, key="vol_end")
             
-            # Filter data by date range
-            idx = pd.IndexSlice
-            filtered_data = stock_data.loc[idx[pd.Timestamp(start_date):pd.Timestamp(end_date), :], :]
+            # Filter volumes by date range with a binary search on the sorted date
+            # level; only the volume column is sliced, not the whole OHLCV block
+            start, stop = stock_data.index.slice_locs(pd.Timestamp(start_date), pd.Timestamp(end_date))
+            filtered_volume = stock_data['volume'].iloc[start:stop]
             
             # Top 10 companies by volume
             st.subheader("Top Companies by Trading Volume")
             
-            # Calculate total volume by company
-            volume_by_company = filtered_data.groupby(level=1)['volume'].sum().sort_values(ascending=False)
-            top_10_volume = volume_by_company.head(10)
+            # Pivot volumes to one column per company once; the totals and the
+            # heatmap are both read from it
+            pivot = filtered_volume.unstack(level=1, fill_value=0)
+            top_10_volume = pivot.sum().nlargest(10)
             
             # Plot bar chart
             fig = px.bar(
@@ -558,19 +785,18 @@ def render_analytics_tab():
             st.subheader("Volume Heatmap for Top Companies")
             
             # Prepare data for heatmap
-            top_companies = volume_by_company.head(10).index.tolist()
-            
-            # Create pivot table with dates and companies
-            volume_pivot = filtered_data.loc[idx[:, top_companies], 'volume'].unstack(level=1)
+            top_companies = top_10_volume.index.tolist()
+            volume_pivot = pivot[top_companies]
             
-            fig = plot_volume_heatmap(volume_pivot, top_companies, title="Trading Volume Heatmap")
+            fig = _cached_volume_heatmap(id(simulation), simulation.data_version, _frame_key(filtered_volume),
+                                         tuple(top_companies), "Trading Volume Heatmap", volume_pivot)
             st.plotly_chart(fig, use_container_width=True)
     
     elif analytics_type == "RSI Screening":
         st.subheader("RSI Screening")
         
-        if 'analysis_results' in st.session_state and 'rsi' in st.session_state.analysis_results:
-            rsi_values = st.session_state.analysis_results['rsi']
+        if 'rsi' in analysis:
+            rsi_values = analysis['rsi']
             
             # RSI range selection
             col1, col2 = st.columns(2)
@@ -579,39 +805,105 @@ def render_analytics_tab():
             with col2:
                 max_rsi = st.slider("Maximum RSI", min_value=0, max_value=100, value=100)
             
-            # Filter companies by RSI range
-            filtered_companies = {}
-            for symbol, rsi in rsi_values.items():
-                if min_rsi <= rsi <= max_rsi:
-                    filtered_companies[symbol] = rsi
-            
-            # Sort by RSI
-            sorted_companies = sorted(filtered_companies.items(), key=lambda x: x[1])
+            # Filter companies by RSI range and sort by RSI
+            rsi_series = pd.Series(rsi_values, dtype='float64')
+            filtered_rsi = rsi_series[rsi_series.between(min_rsi, max_rsi)].sort_values(kind='stable')
             
             # Show filtered companies
             st.subheader(f"Companies with RSI between {min_rsi} and {max_rsi}")
-            st.text(f"Found {len(sorted_companies)} companies")
+            st.text(f"Found {len(filtered_rsi)} companies")
             
-            if sorted_companies:
-                # Create dataframe for display
-                company_info = simulation.get_company_list(with_details=True)
-                
-                data = []
-                for symbol, rsi in sorted_companies:
-                    name = company_info.get(symbol, {}).get('name', 'Unknown')
-                    sector = company_info.get(symbol, {}).get('sector', 'Unknown')
-                    price = company_info.get(symbol, {}).get('latest_price', 0)
-                    
-                    data.append({
-                        'Symbol': symbol,
-                        'Company': name,
-                        'Sector': sector,
-                        'Latest Price': price,
-                        'RSI': rsi
-                    })
+            if not filtered_rsi.empty:
+                # Join the company details in one pass
+                info_df = pd.DataFrame.from_dict(get_company_details(), orient='index').reindex(
+                    columns=['name', 'sector', 'latest_price'])
+                result = filtered_rsi.to_frame('RSI').join(info_df).fillna(
+                    {'name': 'Unknown', 'sector': 'Unknown', 'latest_price': 0})
+                result = result.rename(columns={
+                    'name': 'Company',
+                    'sector': 'Sector',
+                    'latest_price': 'Latest Price'
+                }).rename_axis('Symbol').reset_index()
                 
                 # Display as dataframe
-                st.dataframe(pd.DataFrame(data), use_container_width=True)
+                st.dataframe(result[['Symbol', 'Company', 'Sector', 'Latest Price', 'RSI']],
+                             use_container_width=True)
+
+
+def render_live_status(simulation):
+    """
+    Render the real-time market status.
+    
+    Args:
+        simulation (MarketSimulation): Simulation to show the status of
+    """
+    # The market close callback only sets the event from the simulation
+    # thread; session state is updated here, on the script thread
+    close_event = st.session_state.get('close_event')
+    if close_event is not None and close_event.is_set():
+        close_event.clear()
+        st.session_state.realtime_running = False
+        st.session_state.analysis_version = None
+        st.rerun()
+    
+    if simulation.mode == "realtime" and simulation.realtime_simulator:
+        status = simulation.realtime_simulator.get_market_status()
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Time Elapsed", f"{status['minute']} min / {status['total_minutes']} min")
+            progress = status['time_elapsed_pct'] / 100
+            st.progress(progress)
+        
+        with col2:
+            st.metric("Advancing", status['advancing'])
+        
+        with col3:
+            st.metric("Declining", status['declining'])
+        
+        with col4:
+            st.metric("Total Volume", f"{status['total_volume']:,}")
+
+
+@st.fragment
+def render_data_management(simulation):
+    """
+    Render the data management controls.
+    
+    Runs as a fragment, so saving data reruns only this block instead of the
+    whole app; reloading still triggers a full rerun.
+    
+    Args:
+        simulation (MarketSimulation): Simulation to save or reload
+    """
+    st.subheader("Data Management")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        save_btn = st.button("Save Current Data")
+        if save_btn:
+            success_data = simulation.save_historical_data(format='parquet')
+            success_info = simulation.save_company_info()
+            
+            if success_data and success_info:
+                st.success("Data saved successfully")
+            else:
+                st.error("Error saving data")
+    
+    with col2:
+        load_btn = st.button("Reload Simulation")
+        if load_btn:
+            st.session_state.loaded = False
+            success = load_simulation_data()
+            if success:
+                st.success("Simulation reloaded successfully")
+                # The new data version marks the analysis stale; it is
+                # recomputed when a tab that shows it is rendered
+                st.rerun()
+            else:
+                st.error("Failed to reload simulation")
 
 
 def render_simulation_tab():
@@ -651,9 +943,9 @@ def render_simulation_tab():
             
             if result is not None:
                 st.success(f"Historical simulation completed for {days} trading days")
-                # Refresh analysis results
-                st.session_state.analysis_results = simulation.run_market_analysis()
-                st.experimental_rerun()
+                # The new data version marks the analysis stale; it is
+                # recomputed when a tab that shows it is rendered
+                st.rerun()
             else:
                 st.error("Failed to run historical simulation")
     
@@ -677,11 +969,15 @@ def render_simulation_tab():
                     # This function will be called when prices are updated
                     pass
                 
+                # This event is set when the market closes; the live status
+                # fragment picks it up on its next poll
+                close_event = threading.Event()
+                st.session_state.close_event = close_event
+                
                 def market_close_callback(data):
-                    # This function will be called when market closes
-                    st.session_state.realtime_running = False
-                    # Refresh analysis results
-                    st.session_state.analysis_results = simulation.run_market_analysis()
+                    # This function will be called from the simulation thread
+                    # when the market closes
+                    close_event.set()
                 
                 simulation.register_callback('price_update', price_update_callback)
                 simulation.register_callback('market_close', market_close_callback)
@@ -691,7 +987,7 @@ def render_simulation_tab():
                 if success:
                     st.session_state.realtime_running = True
                     st.success("Real-time simulation started")
-                    st.experimental_rerun()
+                    st.rerun()
                 else:
                     st.error("Failed to start real-time simulation")
         else:
@@ -701,61 +997,19 @@ def render_simulation_tab():
                 if success:
                     st.session_state.realtime_running = False
                     st.success("Real-time simulation stopped")
-                    st.experimental_rerun()
+                    st.rerun()
                 else:
                     st.error("Failed to stop real-time simulation")
     
     if st.session_state.realtime_running:
         st.info("Real-time simulation is running. The market data is being updated automatically.")
         
-        # Show real-time market status
-        if simulation.mode == "realtime" and simulation.realtime_simulator:
-            status = simulation.realtime_simulator.get_market_status()
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Time Elapsed", f"{status['minute']} min / {status['total_minutes']} min")
-                progress = status['time_elapsed_pct'] / 100
-                st.progress(progress)
-            
-            with col2:
-                st.metric("Advancing", status['advancing'])
-            
-            with col3:
-                st.metric("Declining", status['declining'])
-            
-            with col4:
-                st.metric("Total Volume", f"{status['total_volume']:,}")
+        # Poll the real-time market status in a fragment, so only this block
+        # reruns on each update instead of the whole app
+        st.fragment(run_every=interval_seconds)(render_live_status)(simulation)
     
     # Data management
-    st.subheader("Data Management")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        save_btn = st.button("Save Current Data")
-        if save_btn:
-            success_data = simulation.save_historical_data()
-            success_info = simulation.save_company_info()
-            
-            if success_data and success_info:
-                st.success("Data saved successfully")
-            else:
-                st.error("Error saving data")
-    
-    with col2:
-        load_btn = st.button("Reload Simulation")
-        if load_btn:
-            st.session_state.loaded = False
-            success = load_simulation_data()
-            if success:
-                st.success("Simulation reloaded successfully")
-                # Refresh analysis results
-                st.session_state.analysis_results = simulation.run_market_analysis()
-                st.experimental_rerun()
-            else:
-                st.error("Failed to reload simulation")
+    render_data_management(simulation)
 
 
 def main():
@@ -6,13 +6,77 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-def simple_market_analysis(stock_data, company_info):
+from utils.indicators import calculate_latest_rsi
+from dashboard._fast import breadth_sector
+from utils._ranking import top_n_positions
+
+__all__ = ['build_sector_lookup', 'latest_snapshot', 'simple_market_analysis']
+
+def _top_indices(values, n, largest=True):
+    """
+    Find the positions of the n largest (or smallest) values without a full sort
+    
+    Args:
+        values (np.ndarray): Values to rank; NaNs are never selected
+        n (int): Number of positions to return
+        largest (bool): Whether to select the largest instead of the smallest values
+    
+    Returns:
+        np.ndarray: Positions of the selected values, best first, ties by position
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    return valid[top_n_positions(values[valid], n, largest)]
+
+def latest_snapshot(stock_data):
+    """
+    Extract the latest trading day of the market data as plain column arrays
+    
+    Args:
+        stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
+    
+    Returns:
+        dict: Latest 'date' plus 'symbol', 'open', 'close' and 'volume' arrays
+    """
+    latest_date = stock_data.index.get_level_values('date').max()
+    latest_data = stock_data.xs(latest_date, level='date')
+    
+    snapshot = {
+        'date': latest_date,
+        'symbol': latest_data.index.get_level_values('symbol').to_numpy()
+    }
+    for column in ('open', 'close', 'volume'):
+        snapshot[column] = latest_data[column].to_numpy()
+    
+    return snapshot
+
+def build_sector_lookup(company_info):
+    """
+    Encode the companies' sectors as small integer codes
+    
+    Args:
+        company_info (dict): Dictionary with company information
+    
+    Returns:
+        dict: 'codes', a Series of sector codes indexed by symbol, and 'names',
+            an array of the sector names by code
+    """
+    symbols = sorted(symbol for symbol, info in company_info.items() if 'sector' in info)
+    sectors = pd.Categorical([company_info[symbol]['sector'] for symbol in symbols])
+    
+    return {
+        'codes': pd.Series(sectors.codes, index=symbols, dtype=np.intp),
+        'names': sectors.categories.to_numpy()
+    }
+
+def simple_market_analysis(stock_data, company_info, snapshot=None, sector_lookup=None):
     """
     Perform basic market analysis without requiring the full analyzer
     
     Args:
         stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
         company_info (dict): Dictionary with company information
+        snapshot (dict, optional): Latest day arrays from latest_snapshot, built from stock_data if omitted
+        sector_lookup (dict, optional): Sector codes from build_sector_lookup, built from company_info if omitted
     
     Returns:
         dict: Dictionary with analysis results
@@ -20,64 +84,74 @@ def simple_market_analysis(stock_data, company_info):
     results = {}
     
     # Get latest data
-    latest_date = stock_data.index.get_level_values('date').max()
-    latest_data = stock_data.xs(latest_date, level='date').copy()
+    if snapshot is None:
+        snapshot = latest_snapshot(stock_data)
+    symbols = snapshot['symbol']
+    volumes = snapshot['volume']
     
-    # Add percent change
-    latest_data['pct_change'] = ((latest_data['close'] - latest_data['open']) / latest_data['open']) * 100
+    # Add percent change, computed on the raw price arrays into a single
+    # output buffer instead of one temporary per operation. Prices already
+    # downcast to float32 stay float32; anything else is computed in float64
+    price_dtype = np.float32 if snapshot['open'].dtype == np.float32 else np.float64
+    open_prices = np.asarray(snapshot['open'], dtype=price_dtype)
+    close_prices = np.asarray(snapshot['close'], dtype=price_dtype)
+    pct_change = np.subtract(close_prices, open_prices)
+    np.divide(pct_change, open_prices, out=pct_change)
+    np.multiply(pct_change, 100.0, out=pct_change)
     
     # Get top gainers
-    top_gainers = latest_data.sort_values('pct_change', ascending=False).head(10)
-    results['top_gainers'] = dict(zip(top_gainers.index.get_level_values('symbol'), top_gainers['pct_change']))
+    top_gainers = _top_indices(pct_change, 10)
+    results['top_gainers'] = dict(zip(symbols[top_gainers], pct_change[top_gainers]))
     
     # Get top losers
-    top_losers = latest_data.sort_values('pct_change', ascending=True).head(10)
-    results['top_losers'] = dict(zip(top_losers.index.get_level_values('symbol'), top_losers['pct_change']))
+    top_losers = _top_indices(pct_change, 10, largest=False)
+    results['top_losers'] = dict(zip(symbols[top_losers], pct_change[top_losers]))
     
     # Get volume leaders
-    volume_leaders = latest_data.sort_values('volume', ascending=False).head(10)
-    results['volume_leaders'] = dict(zip(volume_leaders.index.get_level_values('symbol'), volume_leaders['volume']))
+    volume_leaders = _top_indices(volumes, 10)
+    results['volume_leaders'] = dict(zip(symbols[volume_leaders], volumes[volume_leaders]))
     
-    # Calculate market breadth
-    advances = (latest_data['pct_change'] > 0).sum()
-    declines = (latest_data['pct_change'] < 0).sum()
-    unchanged = len(latest_data) - advances - declines
+    # Look up each company's sector code, -1 when unknown
+    if company_info:
+        if sector_lookup is None:
+            sector_lookup = build_sector_lookup(company_info)
+        sector_names = sector_lookup['names']
+        sector_ids = sector_lookup['codes'].reindex(symbols, fill_value=-1).to_numpy()
+    else:
+        sector_ids, sector_names = np.full(len(symbols), -1, dtype=np.intp), []
+    
+    # Calculate market breadth and sector return totals in one pass
+    advances, declines, unchanged, sector_sum, sector_count = breadth_sector(
+        pct_change, sector_ids, len(sector_names))
     
     results['market_breadth'] = {
         'advances': advances,
         'declines': declines,
         'unchanged': unchanged,
-        'total': len(latest_data),
+        'total': len(symbols),
         'advance_decline_ratio': advances / declines if declines > 0 else float('inf')
     }
     
     # Calculate market average
     results['market_avg'] = {
-        'return': latest_data['pct_change'].mean(),
-        'volume': latest_data['volume'].mean()
+        'return': np.nanmean(pct_change),
+        'volume': np.nanmean(volumes)
     }
     
+    # Calculate the latest RSI of every company in one batch over the
+    # (dates x companies) close price matrix
+    latest_rsi = calculate_latest_rsi(stock_data['close'].unstack(level='symbol')).dropna()
+    results['rsi'] = dict(zip(latest_rsi.index.tolist(), latest_rsi.tolist()))
+    
     # Calculate sector performance if sector info available
     if company_info:
-        sector_returns = {}
-        sector_companies = {}
-        
-        for symbol, data in latest_data.iterrows():
-            if symbol in company_info and 'sector' in company_info[symbol]:
-                sector = company_info[symbol]['sector']
-                if sector not in sector_returns:
-                    sector_returns[sector] = []
-                    sector_companies[sector] = []
-                
-                sector_returns[sector].append(data['pct_change'])
-                sector_companies[sector].append(symbol)
-        
-        # Calculate average return by sector
-        sector_performance = {}
-        for sector, returns in sector_returns.items():
-            sector_performance[sector] = sum(returns) / len(returns)
+        # Average return and member companies of the sectors that traded
+        traded = np.flatnonzero(sector_count > 0)
+        sector_avg = sector_sum[traded] / sector_count[traded]
+        results['sector_performance'] = dict(zip(sector_names[traded].tolist(), sector_avg.tolist()))
         
-        results['sector_performance'] = sector_performance
-        results['sector_companies'] = sector_companies
+        known = sector_ids >= 0
+        results['sector_companies'] = pd.Series(symbols[known]).groupby(
+            sector_names[sector_ids[known]]).apply(list).to_dict()
     
     return results
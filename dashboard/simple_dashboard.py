@@ -8,91 +8,93 @@ import numpy as np
 import os
 import sys
 
-# Define simple market analysis function inline to avoid import issues
-def simple_market_analysis(stock_data, company_info):
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.simple_analyze import latest_snapshot, simple_market_analysis
+
+# Prices need far fewer significant digits than float64 holds; volume stays
+# int64, as generated volumes can exceed the int32 range
+MARKET_DTYPES = {'open': 'float32', 'high': 'float32', 'low': 'float32', 'close': 'float32', 'volume': 'int64'}
+
+@st.cache_data(show_spinner=False)
+def load_stock_data(file_path, mtime):
     """
-    Perform basic market analysis
+    Load market data from a Parquet or CSV file, parsing it only once per file version
     
     Args:
-        stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
-        company_info (dict): Dictionary with company information
+        file_path (str): Path to the .parquet or CSV file
+        mtime (float): Modification time of the file, so a rewritten file is read again
     
     Returns:
-        dict: Dictionary with analysis results
+        pd.DataFrame: DataFrame with hierarchical index (date, symbol) and OHLCV columns
     """
-    results = {}
-    
-    # Get latest data
-    latest_date = stock_data.index.get_level_values('date').max()
-    latest_data = stock_data.xs(latest_date, level='date').copy()
-    
-    # Add percent change
-    latest_data['pct_change'] = ((latest_data['close'] - latest_data['open']) / latest_data['open']) * 100
-    
-    # Get top gainers
-    top_gainers = latest_data.sort_values('pct_change', ascending=False).head(10)
-    results['top_gainers'] = dict(zip(top_gainers.index.get_level_values('symbol'), top_gainers['pct_change']))
+    # Parquet keeps the index, so only the columns need downcasting
+    if file_path.endswith('.parquet'):
+        return pd.read_parquet(file_path).astype(MARKET_DTYPES)
     
-    # Get top losers
-    top_losers = latest_data.sort_values('pct_change', ascending=True).head(10)
-    results['top_losers'] = dict(zip(top_losers.index.get_level_values('symbol'), top_losers['pct_change']))
+    # Parse with pyarrow (installed with streamlit) using known column types,
+    # so dates are parsed while reading and no inference pass is needed
+    stock_data = pd.read_csv(file_path, engine='pyarrow', parse_dates=['date'], dtype=MARKET_DTYPES)
+    # Set multi-index
+    return stock_data.set_index(['date', 'symbol'])
+
+# Results are keyed by the data file version and snapshot date; the market data
+# and snapshot arrays themselves are left unhashed
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_market_analysis(data_mtime, snapshot_date, company_info, _stock_data, _snapshot):
+    """
+    Perform basic market analysis, reusing the result while the data is unchanged
     
-    # Get volume leaders
-    volume_leaders = latest_data.sort_values('volume', ascending=False).head(10)
-    results['volume_leaders'] = dict(zip(volume_leaders.index.get_level_values('symbol'), volume_leaders['volume']))
+    Args:
+        data_mtime (float): Modification time of the loaded data file
+        snapshot_date (pd.Timestamp): Date of the latest day snapshot
+        company_info (dict): Dictionary with company information
+        _stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
+        _snapshot (dict): Latest day arrays from latest_snapshot
     
-    # Calculate market breadth
-    advances = (latest_data['pct_change'] > 0).sum()
-    declines = (latest_data['pct_change'] < 0).sum()
-    unchanged = len(latest_data) - advances - declines
+    Returns:
+        dict: Dictionary with analysis results
+    """
+    return simple_market_analysis(_stock_data, company_info, snapshot=_snapshot)
+
+def get_snapshot(stock_data, data_mtime):
+    """
+    Get the latest day snapshot, rebuilding it only when the data file or latest date changes
     
-    results['market_breadth'] = {
-        'advances': advances,
-        'declines': declines,
-        'unchanged': unchanged,
-        'total': len(latest_data),
-        'advance_decline_ratio': advances / declines if declines > 0 else float('inf')
-    }
+    Args:
+        stock_data (pd.DataFrame): DataFrame with hierarchical index (date, symbol) and OHLCV columns
+        data_mtime (float): Modification time of the loaded data file
     
-    # Calculate market average
-    results['market_avg'] = {
-        'return': latest_data['pct_change'].mean(),
-        'volume': latest_data['volume'].mean()
-    }
+    Returns:
+        dict: Latest day arrays from latest_snapshot
+    """
+    key = (data_mtime, stock_data.index.get_level_values('date').max())
+    if st.session_state.get('snap_key') != key:
+        st.session_state['snap'] = latest_snapshot(stock_data)
+        st.session_state['snap_key'] = key
+    return st.session_state['snap']
+
+def results_frame(values, label, column):
+    """
+    Build a table from analysis results keyed by symbol or sector
     
-    # Calculate sector performance if sector info available
-    if company_info:
-        sector_returns = {}
-        sector_companies = {}
-        
-        for symbol, data in latest_data.iterrows():
-            if symbol in company_info and 'sector' in company_info[symbol]:
-                sector = company_info[symbol]['sector']
-                if sector not in sector_returns:
-                    sector_returns[sector] = []
-                    sector_companies[sector] = []
-                
-                sector_returns[sector].append(data['pct_change'])
-                sector_companies[sector].append(symbol)
-        
-        # Calculate average return by sector
-        sector_performance = {}
-        for sector, returns in sector_returns.items():
-            sector_performance[sector] = sum(returns) / len(returns)
-        
-        results['sector_performance'] = sector_performance
-        results['sector_companies'] = sector_companies
+    Args:
+        values (dict): Numeric values keyed by label, in display order
+        label (str): Name of the label column
+        column (str): Name of the value column
     
-    return results
+    Returns:
+        pd.DataFrame: Label and value columns
+    """
+    return pd.Series(values, name=column, dtype='float64').rename_axis(label).reset_index()
 
 def main():
     # Load sample data
     try:
-        stock_data = pd.read_csv('data/historical/1month.csv')
-        # Convert string dates to datetime
-        stock_data['date'] = pd.to_datetime(stock_data['date'])
-        # Set multi-index
-        stock_data = stock_data.set_index(['date', 'symbol'])
+        parquet_path = 'data/historical/1month.parquet'
+        data_path = parquet_path if os.path.exists(parquet_path) else 'data/historical/1month.csv'
+        data_mtime = os.path.getmtime(data_path)
+        stock_data = load_stock_data(data_path, data_mtime)
         
         # Set page title
         st.set_page_config(page_title='NEPSEZEN Dashboard', layout='wide')
@@ -101,7 +103,8 @@ def main():
         st.title('NEPSEZEN - Nepal Stock Exchange Dashboard')
         
         # Perform simple analysis
-        analysis = simple_market_analysis(stock_data, {})
+        snapshot = get_snapshot(stock_data, data_mtime)
+        analysis = cached_market_analysis(data_mtime, snapshot['date'], {}, stock_data, snapshot)
         
         # Market breadth
         st.header('Market Overview')
@@ -120,51 +123,36 @@ def main():
             market_avg = analysis['market_avg']
             st.metric('Market Average Return', f"{market_avg.get('return', 0):.2f}%")
         
-        # Top gainers and losers
+        # Top gainers and losers; values stay numeric and are only formatted
+        # for display
         if analysis and 'top_gainers' in analysis and 'top_losers' in analysis:
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader('Top Gainers')
-                gainers_df = pd.DataFrame({
-                    'Symbol': list(analysis['top_gainers'].keys()),
-                    'Return (%)': list(analysis['top_gainers'].values())
-                })
+                gainers_df = results_frame(analysis['top_gainers'], 'Symbol', 'Return (%)')
                 if not gainers_df.empty:
-                    gainers_df['Return (%)'] = gainers_df['Return (%)'].apply(lambda x: f"{x:.2f}%")
-                    st.dataframe(gainers_df)
+                    st.dataframe(gainers_df.style.format({'Return (%)': '{:.2f}%'}), hide_index=True)
             
             with col2:
                 st.subheader('Top Losers')
-                losers_df = pd.DataFrame({
-                    'Symbol': list(analysis['top_losers'].keys()),
-                    'Return (%)': list(analysis['top_losers'].values())
-                })
+                losers_df = results_frame(analysis['top_losers'], 'Symbol', 'Return (%)')
                 if not losers_df.empty:
-                    losers_df['Return (%)'] = losers_df['Return (%)'].apply(lambda x: f"{x:.2f}%")
-                    st.dataframe(losers_df)
+                    st.dataframe(losers_df.style.format({'Return (%)': '{:.2f}%'}), hide_index=True)
                     
         # Volume leaders
         if analysis and 'volume_leaders' in analysis:
             st.subheader('Volume Leaders')
-            volume_df = pd.DataFrame({
-                'Symbol': list(analysis['volume_leaders'].keys()),
-                'Volume': list(analysis['volume_leaders'].values())
-            })
+            volume_df = results_frame(analysis['volume_leaders'], 'Symbol', 'Volume')
             if not volume_df.empty:
-                volume_df['Volume'] = volume_df['Volume'].apply(lambda x: f"{x:,.0f}")
-                st.dataframe(volume_df)
+                st.dataframe(volume_df.style.format({'Volume': '{:,.0f}'}), hide_index=True)
                 
         # If sector performance exists
         if analysis and 'sector_performance' in analysis:
             st.subheader('Sector Performance')
-            sector_df = pd.DataFrame({
-                'Sector': list(analysis['sector_performance'].keys()),
-                'Return (%)': list(analysis['sector_performance'].values())
-            })
+            sector_df = results_frame(analysis['sector_performance'], 'Sector', 'Return (%)')
             sector_df = sector_df.sort_values('Return (%)', ascending=False)
-            sector_df['Return (%)'] = sector_df['Return (%)'].apply(lambda x: f"{x:.2f}%")
-            st.dataframe(sector_df)
+            st.dataframe(sector_df.style.format({'Return (%)': '{:.2f}%'}), hide_index=True)
 
     except Exception as e:
         st.error(f'Error loading data: {str(e)}')
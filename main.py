@@ -8,42 +8,37 @@ in different modes (dashboard, simulation, etc.)
 
 import os
 import sys
-import argparse
 import logging
 from datetime import datetime
-import subprocess
 import importlib.util
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("nepsezen.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def _setup_logging():
+    """Configure logging to the log file and stdout (done by main, not on import)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("nepsezen.log"),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
 def check_dependencies():
     """Check if all required dependencies are installed"""
-    try:
-        # Try to import key libraries
-        import pandas as pd
-        import numpy as np
-        import matplotlib
-        import plotly
-        import streamlit
-        
-        logger.info("All core dependencies are installed")
-        return True
-    except ImportError as e:
-        logger.error(f"Missing dependency: {str(e)}")
-        logger.info("Please install all dependencies with: pip install -r requirements.txt")
-        return False
+    # Locate the key libraries without importing (and so executing) them
+    for name in ('pandas', 'numpy', 'matplotlib', 'plotly', 'streamlit'):
+        if importlib.util.find_spec(name) is None:
+            logger.error(f"Missing dependency: No module named '{name}'")
+            logger.info("Please install all dependencies with: pip install -r requirements.txt")
+            return False
+    
+    logger.info("All core dependencies are installed")
+    return True
 
 def run_dashboard():
-    """Run the Streamlit dashboard"""
+    """Run the Streamlit dashboard (replaces this process, so only returns on failure)"""
     logger.info("Starting NEPSEZEN dashboard...")
     
     # Construct the path to the dashboard script
@@ -58,9 +53,14 @@ def run_dashboard():
     
     try:
         logger.info(f"Running command: {' '.join(cmd)}")
-        subprocess.run(cmd)
-        return True
-    except Exception as e:
+        
+        # Hand the process over to Streamlit instead of keeping this
+        # interpreter alive as its parent; exec doesn't flush buffered output
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        sys.stdout.flush()
+        os.execvp(cmd[0], cmd)
+    except OSError as e:
         logger.error(f"Error running dashboard: {str(e)}")
         return False
 
@@ -128,6 +128,8 @@ def run_realtime_simulation(minutes=60, update_interval=5, volatility=1.0):
     try:
         # Import the main simulation module
         from simulator.main_builder import MarketSimulation
+        import signal
+        import threading
         import time
         
         # Initialize simulation
@@ -153,31 +155,46 @@ def run_realtime_simulation(minutes=60, update_interval=5, volatility=1.0):
         
         logger.info(f"Real-time simulation started with {update_interval}s updates")
         
-        # Run for specified duration
-        elapsed_time = 0
+        # Run for specified duration, waking up once per update interval or
+        # as soon as the market closes or the user interrupts
+        stop_event = threading.Event()
+        simulation.register_callback('market_close', lambda data: stop_event.set())
+        previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+        
+        start_time = time.monotonic()
+        deadline = start_time + minutes * 60
+        next_log_at = start_time + 60
         try:
-            while elapsed_time < minutes * 60:
-                time.sleep(update_interval)
-                elapsed_time += update_interval
+            while not stop_event.wait(max(0.0, min(update_interval, deadline - time.monotonic()))):
+                now = time.monotonic()
+                if now >= deadline:
+                    break
                 
                 # Get market status
                 if simulation.mode == "realtime" and simulation.realtime_simulator:
                     status = simulation.realtime_simulator.get_market_status()
                     
                     # Print status every minute
-                    if elapsed_time % 60 == 0:
-                        logger.info(f"Minute {elapsed_time//60}/{minutes}: "
+                    if now >= next_log_at:
+                        logger.info(f"Minute {int(now - start_time) // 60}/{minutes}: "
                                     f"Advancing: {status['advancing']}, "
                                     f"Declining: {status['declining']}, "
                                     f"Volume: {status['total_volume']:,}")
+                        next_log_at += 60
                 
-                # Check if market closed
+                # Check if market closed without notifying
                 if simulation.mode == "realtime" and not simulation.realtime_simulator.market_open:
-                    logger.info("Market has closed")
+                    stop_event.set()
                     break
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
         
-        except KeyboardInterrupt:
-            logger.info("Simulation interrupted by user")
+        if stop_event.is_set():
+            # Check if market closed
+            if simulation.mode == "realtime" and not simulation.realtime_simulator.market_open:
+                logger.info("Market has closed")
+            else:
+                logger.info("Simulation interrupted by user")
         
         # Stop simulation
         simulation.stop_realtime_simulation()
@@ -194,6 +211,10 @@ def run_realtime_simulation(minutes=60, update_interval=5, volatility=1.0):
 
 def main():
     """Main entry point"""
+    import argparse
+    
+    _setup_logging()
+    
     parser = argparse.ArgumentParser(description="NEPSEZEN - Nepal Stock Exchange Simulator")
     
     # Define command-line arguments
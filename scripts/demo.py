@@ -7,10 +7,13 @@ This script demonstrates key features of the NEPSEZEN simulator.
 
 import os
 import sys
+import argparse
+import copy
+import json
+import functools
 import time
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,64 +27,121 @@ from utils.visualizer import (
 )
 import config
 
+# Columns of the historical data files and the types they are read as; prices
+# need no more than float32, symbols repeat on every date, and generated
+# volumes can exceed even the int64 range
+MARKET_DTYPES = {
+    'date': 'datetime64[ns]',
+    'symbol': 'category',
+    'open': 'float32',
+    'high': 'float32',
+    'low': 'float32',
+    'close': 'float32',
+    'volume': 'float64'
+}
+
+# Analyzers by period and per-company market data by symbol, each stored with
+# the market data frame it was built from so a reloaded frame replaces it
+_ANALYZER_CACHE = {}
+_SYMBOL_HISTORY_CACHE = {}
+
 def load_company_data():
-    """Load company information"""
-    companies_file = os.path.join(config.DATA_DIR, 'companies.json')
+    """
+    Load company information
+    
+    The parsed file is cached until it changes on disk; each call returns its
+    own copy, since the data generator updates the company records it is given.
+    """
+    companies_file = config.COMPANIES_DATA_FILE
     if os.path.exists(companies_file):
-        with open(companies_file, 'r') as f:
-            import json
-            return json.load(f)
+        return copy.deepcopy(_read_company_data(str(companies_file), os.path.getmtime(companies_file)))
     return {}
 
+@functools.lru_cache(maxsize=8)
+def _read_company_data(file_path, mtime):
+    """Parse a company information file (cached per path and modification time)"""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
 def load_historical_data(period='1month'):
-    """Load historical market data"""
-    file_path = os.path.join(config.DATA_DIR, 'historical', f'{period}.csv')
+    """
+    Load historical market data indexed by (date, symbol)
+    
+    The prepared frame is cached in memory until the CSV changes on disk, and is
+    shared between callers, so it must not be modified in place.
+    """
+    file_path = config.HISTORICAL_DATA_DIR / f'{period}.csv'
     if os.path.exists(file_path):
-        data = pd.read_csv(file_path)
-        # Add date and symbol columns if they don't exist
-        if 'date' not in data.columns:
-            # Create a date range starting from today and going back
-            end_date = datetime.now()
-            if period == '1month':
-                days = 30
-            elif period == '3months':
-                days = 90
-            elif period == '6months':
-                days = 180
-            else:  # 1year
-                days = 365
-            
-            start_date = end_date - timedelta(days=days)
-            # Create a date range excluding weekends
-            date_range = []
-            current = start_date
-            while len(date_range) < len(data) // len(set(data.index)) if 'symbol' in data.columns else 10:
-                if current.weekday() < 5:  # Monday to Friday
-                    date_range.append(current)
-                current += timedelta(days=1)
-            
-            # Add date column
-            num_companies = len(data) // len(date_range)
-            all_dates = []
-            for d in date_range:
-                all_dates.extend([d] * num_companies)
-            data['date'] = all_dates[:len(data)]
-        
-        # Add symbol column if it doesn't exist
-        if 'symbol' not in data.columns:
-            # Create default symbols
-            symbols = [f'STOCK{i+1}' for i in range(len(data) // len(set(data['date'])) if 'date' in data.columns else 10)]
-            all_symbols = []
-            # Repeat symbols for each date
-            for _ in range(len(set(data['date'])) if 'date' in data.columns else 1):
-                all_symbols.extend(symbols)
-            data['symbol'] = all_symbols[:len(data)]
-        
-        # Convert date column to datetime
-        data['date'] = pd.to_datetime(data['date'])
-        return data
+        return _read_historical_data(str(file_path), os.path.getmtime(file_path))
     return pd.DataFrame()
 
+@functools.lru_cache(maxsize=8)
+def _read_historical_data(file_path, mtime):
+    """
+    Prepare a historical data CSV (cached per path and modification time)
+    
+    The prepared frame is also kept in a hidden Parquet file next to the CSV, so
+    later runs skip parsing and preparing the CSV while it is unchanged. It has a
+    private name because the dashboards load a plain '<period>.parquet' directly.
+    """
+    directory, name = os.path.split(file_path)
+    parquet_path = os.path.join(directory, f".{os.path.splitext(name)[0]}.demo-cache.parquet")
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= mtime:
+        try:
+            return pd.read_parquet(parquet_path)
+        except (ImportError, OSError, ValueError):
+            pass  # Unreadable or no Parquet engine; prepare the CSV again
+    
+    # Read only the market columns, with their types given up front and the
+    # dates parsed while reading
+    with open(file_path, 'r') as f:
+        header = f.readline().strip().split(',')
+    columns = [column for column in MARKET_DTYPES if column in header]
+    data = pd.read_csv(file_path, usecols=columns,
+                       dtype={column: MARKET_DTYPES[column] for column in columns if column != 'date'},
+                       parse_dates=['date'] if 'date' in columns else None)
+    
+    # Add date and symbol columns if they don't exist
+    if 'date' not in data.columns:
+        # One row per company for each of the business days up to today
+        num_companies = data['symbol'].nunique() if 'symbol' in data.columns else 10
+        num_days = -(-len(data) // num_companies)
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=num_days)
+        data['date'] = np.repeat(dates.to_numpy(), num_companies)[:len(data)]
+    
+    # Add symbol column if it doesn't exist
+    if 'symbol' not in data.columns:
+        # Create default symbols, repeated for each date
+        num_companies = -(-len(data) // data['date'].nunique())
+        symbols = np.array([f'STOCK{i+1}' for i in range(num_companies)])
+        data['symbol'] = np.tile(symbols, -(-len(data) // num_companies))[:len(data)]
+    
+    data = data.set_index(['date', 'symbol'])
+    
+    try:
+        data.to_parquet(parquet_path, index=True)
+    except (ImportError, OSError):
+        pass  # Parquet needs pyarrow; without it only the in-memory cache is used
+    return data
+
+def get_symbol_history(market_data, symbol):
+    """
+    Get one company's market data in date order, reusing earlier selections
+    
+    Args:
+        market_data (pd.DataFrame): Market data indexed by (date, symbol), from load_historical_data
+        symbol (str): Company symbol
+    
+    Returns:
+        pd.DataFrame: The company's rows of market_data sorted by date
+    """
+    cached = _SYMBOL_HISTORY_CACHE.get(symbol)
+    if cached is None or cached[0] is not market_data:
+        symbols = market_data.index.get_level_values('symbol')
+        cached = (market_data, market_data[symbols == symbol].sort_index(level='date'))
+        _SYMBOL_HISTORY_CACHE[symbol] = cached
+    return cached[1]
+
 def demo_market_overview():
     """Demonstrate market overview analysis"""
     print("\n" + "=" * 50)
@@ -98,14 +158,15 @@ def demo_market_overview():
     
     print(f"Loaded data for {len(company_data)} companies and {len(market_data)} market records.")
     
-    # Set up market data for analyzer
-    market_data_indexed = market_data.set_index(['date', 'symbol'])
-    
-    # Create analyzer
-    analyzer = MarketAnalyzer(market_data_indexed, company_data)
+    # Create the analyzer, or reuse it while the market data is unchanged
+    cached = _ANALYZER_CACHE.get('1month')
+    if cached is None or cached[0] is not market_data:
+        cached = (market_data, MarketAnalyzer(market_data, company_data))
+        _ANALYZER_CACHE['1month'] = cached
+    analyzer = cached[1]
     
     # Get latest date
-    latest_date = market_data['date'].max()
+    latest_date = market_data.index.get_level_values('date').max()
     
     # Print some analysis
     print(f"\nMarket Summary for {latest_date.strftime('%Y-%m-%d')}:")
@@ -148,13 +209,13 @@ def demo_technical_indicators():
     
     # Get data for a specific company
     symbol = "NABIL"  # Example company
-    company_data = market_data[market_data['symbol'] == symbol].sort_values('date')
+    company_data = get_symbol_history(market_data, symbol)
     
     if len(company_data) == 0:
-        available_symbols = market_data['symbol'].unique()
+        available_symbols = market_data.index.get_level_values('symbol').unique()
         if len(available_symbols) > 0:
             symbol = available_symbols[0]
-            company_data = market_data[market_data['symbol'] == symbol].sort_values('date')
+            company_data = get_symbol_history(market_data, symbol)
             print(f"Symbol NABIL not found, using {symbol} instead.")
         else:
             print("No company data available.")
@@ -215,8 +276,46 @@ def demo_technical_indicators():
     
     return company_data
 
-def demo_simulation():
-    """Demonstrate market simulation"""
+def summarize_day(day_data):
+    """
+    Summarize one simulated trading day from its price arrays
+    
+    Args:
+        day_data (pd.DataFrame): One day of OHLCV data indexed by (date, symbol)
+    
+    Returns:
+        dict: Date, breadth counts, market return (%) and the top gainer and
+            loser with their returns (%)
+    """
+    open_prices = day_data['open'].to_numpy(dtype=np.float64)
+    close_prices = day_data['close'].to_numpy(dtype=np.float64)
+    returns = (close_prices - open_prices) / open_prices * 100
+    
+    advances = int(np.count_nonzero(returns > 0))
+    declines = int(np.count_nonzero(returns < 0))
+    top_gainer = returns.argmax()
+    top_loser = returns.argmin()
+    symbols = day_data.index.get_level_values('symbol').to_numpy()
+    
+    return {
+        'date': day_data.index.get_level_values('date')[0].strftime('%Y-%m-%d'),
+        'advances': advances,
+        'declines': declines,
+        'unchanged': len(returns) - advances - declines,
+        'market_return': returns.mean(),
+        'top_gainer': symbols[top_gainer],
+        'top_gainer_return': returns[top_gainer],
+        'top_loser': symbols[top_loser],
+        'top_loser_return': returns[top_loser]
+    }
+
+def demo_simulation(pause=1.0):
+    """
+    Demonstrate market simulation
+    
+    Args:
+        pause (float): Seconds to pause between simulated days for readability, 0 for none
+    """
     print("\n" + "=" * 50)
     print("DEMO: Market Simulation")
     print("=" * 50)
@@ -234,45 +333,43 @@ def demo_simulation():
     # Initialize market factors
     data_gen.initialize_market_factors()
     
-    # Simulate 5 trading days
+    # Simulate 5 trading days in one batch
     print("\nSimulating 5 trading days...\n")
-    for i in range(5):
-        # Generate next day's data
-        day_data = data_gen.generate_next_day(volatility=0.015)
-          # Show summary
-        date = day_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-        advances = (day_data['close'] > day_data['open']).sum()
-        declines = (day_data['close'] < day_data['open']).sum()
-        unchanged = len(day_data) - advances - declines
-        
-        print(f"Day {i+1} ({date}):")
-        print(f"  Advances: {advances}")
-        print(f"  Declines: {declines}")
-        print(f"  Unchanged: {unchanged}")
+    days = data_gen.generate_n_days(5, volatilities=0.015).groupby(level='date', sort=False)
+    for i, (_, day_data) in enumerate(days):
+        # Show summary
+        summary = summarize_day(day_data)
         
-        # Calculate market return
-        market_return = ((day_data['close'] - day_data['open']) / day_data['open']).mean() * 100
-        print(f"  Market Return: {market_return:.2f}%")
-          # Show top gainer
-        day_data['return'] = (day_data['close'] - day_data['open']) / day_data['open'] * 100
-        top_gainer_idx = day_data['return'].idxmax()
-        top_gainer_symbol = top_gainer_idx[1] if isinstance(top_gainer_idx, tuple) else "Unknown"
-        top_gainer_return = day_data['return'].max()
-        print(f"  Top Gainer: {top_gainer_symbol} ({top_gainer_return:.2f}%)")
-        
-        # Show top loser
-        top_loser_idx = day_data['return'].idxmin()
-        top_loser_symbol = top_loser_idx[1] if isinstance(top_loser_idx, tuple) else "Unknown"
-        top_loser_return = day_data['return'].min()
-        print(f"  Top Loser: {top_loser_symbol} ({top_loser_return:.2f}%)")
+        print(f"Day {i+1} ({summary['date']}):")
+        print(f"  Advances: {summary['advances']}")
+        print(f"  Declines: {summary['declines']}")
+        print(f"  Unchanged: {summary['unchanged']}")
+        print(f"  Market Return: {summary['market_return']:.2f}%")
+        print(f"  Top Gainer: {summary['top_gainer']} ({summary['top_gainer_return']:.2f}%)")
+        print(f"  Top Loser: {summary['top_loser']} ({summary['top_loser_return']:.2f}%)")
         
         print()
-        time.sleep(1)  # Pause for readability
+        if pause:
+            time.sleep(pause)  # Pause for readability
     
     return data_gen
 
-def demo_custom_scenario():
-    """Demonstrate custom market scenario"""
+# Days of the custom scenario: (market sentiment, volatility, label, sentiment description)
+CRASH_RECOVERY_SCENARIO = [
+    (-0.8, 0.02, 'Market Crash', 'Very Negative'),
+    (-0.5, 0.025, 'Continued Decline', 'Negative'),
+    (0.0, 0.015, 'Market Stabilizes', 'Neutral'),
+    (0.4, 0.018, 'Recovery Begins', 'Positive'),
+    (0.7, 0.02, 'Strong Recovery', 'Very Positive')
+]
+
+def demo_custom_scenario(pause=1.0):
+    """
+    Demonstrate custom market scenario
+    
+    Args:
+        pause (float): Seconds to pause between simulated days for readability, 0 for none
+    """
     print("\n" + "=" * 50)
     print("DEMO: Custom Market Scenario")
     print("=" * 50)
@@ -289,76 +386,44 @@ def demo_custom_scenario():
     
     # Set initial market conditions
     print("\nScenario: Market Crash Followed by Recovery\n")
-      # Day 1: Strong negative sentiment
-    data_gen.initialize_market_factors(initial_sentiment=-0.8)
-    day1_data = data_gen.generate_next_day(volatility=0.02)
-    date1 = day1_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-    market_return1 = ((day1_data['close'] - day1_data['open']) / day1_data['open']).mean() * 100
-    print(f"Day 1 ({date1}) - Market Crash:")
-    print(f"  Market sentiment: Very Negative (-0.8)")
-    print(f"  Market Return: {market_return1:.2f}%")
-    print(f"  Advances: {(day1_data['close'] > day1_data['open']).sum()}")
-    print(f"  Declines: {(day1_data['close'] < day1_data['open']).sum()}")
-    print()
-    time.sleep(1)
-      # Day 2: Continued negative sentiment
-    data_gen.market_sentiment = -0.5
-    day2_data = data_gen.generate_next_day(volatility=0.025)
-    date2 = day2_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-    market_return2 = ((day2_data['close'] - day2_data['open']) / day2_data['open']).mean() * 100
-    print(f"Day 2 ({date2}) - Continued Decline:")
-    print(f"  Market sentiment: Negative (-0.5)")
-    print(f"  Market Return: {market_return2:.2f}%")
-    print(f"  Advances: {(day2_data['close'] > day2_data['open']).sum()}")
-    print(f"  Declines: {(day2_data['close'] < day2_data['open']).sum()}")
-    print()
-    time.sleep(1)
-      # Day 3: Neutral sentiment (market stabilizes)
-    data_gen.market_sentiment = 0.0
-    day3_data = data_gen.generate_next_day(volatility=0.015)
-    date3 = day3_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-    market_return3 = ((day3_data['close'] - day3_data['open']) / day3_data['open']).mean() * 100
-    print(f"Day 3 ({date3}) - Market Stabilizes:")
-    print(f"  Market sentiment: Neutral (0.0)")
-    print(f"  Market Return: {market_return3:.2f}%")
-    print(f"  Advances: {(day3_data['close'] > day3_data['open']).sum()}")
-    print(f"  Declines: {(day3_data['close'] < day3_data['open']).sum()}")
-    print()
-    time.sleep(1)
-      # Day 4: Positive sentiment begins (recovery)
-    data_gen.market_sentiment = 0.4
-    day4_data = data_gen.generate_next_day(volatility=0.018)
-    date4 = day4_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-    market_return4 = ((day4_data['close'] - day4_data['open']) / day4_data['open']).mean() * 100
-    print(f"Day 4 ({date4}) - Recovery Begins:")
-    print(f"  Market sentiment: Positive (0.4)")
-    print(f"  Market Return: {market_return4:.2f}%")
-    print(f"  Advances: {(day4_data['close'] > day4_data['open']).sum()}")
-    print(f"  Declines: {(day4_data['close'] < day4_data['open']).sum()}")
-    print()
-    time.sleep(1)
-      # Day 5: Strong positive sentiment (strong recovery)
-    data_gen.market_sentiment = 0.7
-    day5_data = data_gen.generate_next_day(volatility=0.02)
-    date5 = day5_data.index.get_level_values('date')[0].strftime('%Y-%m-%d')
-    market_return5 = ((day5_data['close'] - day5_data['open']) / day5_data['open']).mean() * 100
-    print(f"Day 5 ({date5}) - Strong Recovery:")
-    print(f"  Market sentiment: Very Positive (0.7)")
-    print(f"  Market Return: {market_return5:.2f}%")
-    print(f"  Advances: {(day5_data['close'] > day5_data['open']).sum()}")
-    print(f"  Declines: {(day5_data['close'] < day5_data['open']).sum()}")
-    print()
+    data_gen.initialize_market_factors(initial_sentiment=CRASH_RECOVERY_SCENARIO[0][0])
+    
+    sentiments, volatilities, labels, moods = zip(*CRASH_RECOVERY_SCENARIO)
+    days = data_gen.generate_n_days(len(CRASH_RECOVERY_SCENARIO), volatilities, sentiments)
+    
+    market_returns = np.empty(len(CRASH_RECOVERY_SCENARIO))
+    for i, (_, day_data) in enumerate(days.groupby(level='date', sort=False)):
+        sentiment, label, mood = sentiments[i], labels[i], moods[i]
+        summary = summarize_day(day_data)
+        market_returns[i] = summary['market_return']
+        
+        print(f"Day {i+1} ({summary['date']}) - {label}:")
+        print(f"  Market sentiment: {mood} ({sentiment})")
+        print(f"  Market Return: {summary['market_return']:.2f}%")
+        print(f"  Advances: {summary['advances']}")
+        print(f"  Declines: {summary['declines']}")
+        print()
+        if pause and i < len(CRASH_RECOVERY_SCENARIO) - 1:
+            time.sleep(pause)
     
     # Overall scenario summary
     print("Scenario Summary:")
-    print(f"  5-Day Cumulative Return: {market_return1+market_return2+market_return3+market_return4+market_return5:.2f}%")
-    print(f"  Crisis Depth: {min(market_return1, market_return2, market_return3, market_return4, market_return5):.2f}%")
-    print(f"  Recovery High: {max(market_return1, market_return2, market_return3, market_return4, market_return5):.2f}%")
+    print(f"  {len(market_returns)}-Day Cumulative Return: {market_returns.sum():.2f}%")
+    print(f"  Crisis Depth: {market_returns.min():.2f}%")
+    print(f"  Recovery High: {market_returns.max():.2f}%")
     
     return data_gen
 
 def main():
     """Main demo function"""
+    parser = argparse.ArgumentParser(description="NEPSEZEN feature demo")
+    parser.add_argument('--no-sleep', action='store_true',
+                        help='Do not pause between simulated days')
+    args = parser.parse_args()
+    
+    # Pauses only help someone reading along in a terminal
+    pause = 0.0 if args.no_sleep or not sys.stdout.isatty() else 1.0
+    
     print("\n" + "=" * 50)
     print("NEPSEZEN - Nepal Stock Exchange Simulator Demo")
     print("=" * 50)
@@ -366,7 +431,7 @@ def main():
     print("\nThis demo showcases key features of the NEPSEZEN simulator.")
     
     # Check if data exists
-    if not os.path.exists(os.path.join(config.DATA_DIR, 'historical', '1month.csv')):
+    if not os.path.exists(config.HISTORICAL_DATA_DIR / '1month.csv'):
         print("\nWARNING: Historical data files not found.")
         print("Please run the data generation script first:")
         print("  python -m scripts.generate_historical_data")
@@ -393,9 +458,9 @@ def main():
             elif choice == '2':
                 demo_technical_indicators()
             elif choice == '3':
-                demo_simulation()
+                demo_simulation(pause)
             elif choice == '4':
-                demo_custom_scenario()
+                demo_custom_scenario(pause)
             else:
                 print("Invalid choice. Please try again.")
         
@@ -24,125 +24,137 @@ def wait_for_input(message="Press Enter to continue..."):
     """Wait for user input to continue the demo"""
     input(f"\n{message}\n")
 
-def demo_flow():
-    """Main demo flow script"""
-    # Introduction
-    print_section("NEPSEZEN - Nepal Stock Exchange Simulator Demo")
-    print("""
-Welcome to the NEPSEZEN demonstration. This script will guide you through
+INTRO_TITLE = "NEPSEZEN - Nepal Stock Exchange Simulator Demo"
+INTRO = """Welcome to the NEPSEZEN demonstration. This script will guide you through
 recording a comprehensive video demo of the platform's key features.
 
 Please ensure:
 1. You have a screen recording software ready
 2. The simulator has been properly set up
 3. Historical data has been generated
-4. The dashboard is accessible
-    """)
-    wait_for_input("Press Enter to start the demo script...")
-    
-    # Start the demo
-    print_section("1. Launch the Dashboard")
-    print("""
-Step 1: Launch the NEPSEZEN dashboard by running:
-    
+4. The dashboard is accessible"""
+
+# Each step is (title, body, notes): notes are the checklist items shown after the body
+STEPS = [
+    ("1. Launch the Dashboard", """Step 1: Launch the NEPSEZEN dashboard by running:
+
     python main.py --mode dashboard
-    
+
 Wait for the dashboard to load completely in your browser.
 Explain that NEPSEZEN is a comprehensive stock market simulation 
-platform focused on the Nepal Stock Exchange.
-    """)
-    wait_for_input()
-    
-    # Market Overview
-    print_section("2. Market Overview Tab")
-    print("""
-Step 2: On the Market Overview tab:
+platform focused on the Nepal Stock Exchange.""", []),
+    ("2. Market Overview Tab", "Step 2: On the Market Overview tab:", [
+        "Highlight the market summary metrics (index value, volume, advances/declines)",
+        "Show the interactive market index chart",
+        "Demonstrate changing the time period (1D, 1W, 1M, 3M, 6M, 1Y)",
+        "Point out the sector performance visualization",
+        "Show the volume heatmap and explain its significance",
+        "Discuss the top gainers and losers section",
+    ]),
+    ("3. Stock Analysis Tab", "Step 3: Navigate to the Stock Analysis tab:", [
+        "Select a bank stock (e.g., NABIL) from the dropdown",
+        "Show the interactive candlestick chart",
+        "Add a technical indicator (e.g., RSI) and explain its significance",
+        "Add another indicator (e.g., Bollinger Bands)",
+        "Demonstrate the zoom and pan features of the chart",
+        "Show the historical performance metrics",
+        "Point out the circuit breaker status (if applicable)",
+    ]),
+    ("4. Portfolio Management Tab", "Step 4: Navigate to the Portfolio Management tab:", [
+        "Show the current portfolio composition",
+        "Demonstrate creating a new portfolio or reset the existing one",
+        "Execute a buy order for a stock (e.g., buy 100 shares of NABIL)",
+        "Execute a sell order for another stock (if available)",
+        "Show the portfolio performance chart",
+        "Point out the profit/loss calculation",
+        "Demonstrate the portfolio analytics features",
+    ]),
+    ("5. Analytics Dashboard Tab", "Step 5: Navigate to the Analytics Dashboard tab:", [
+        "Show the correlation matrix between different stocks",
+        "Demonstrate sector allocation analysis",
+        "Point out the circuit breaker analysis visualization",
+        "Show the volatility comparison chart",
+        "Explain how these analytics can help investors",
+    ]),
+    ("6. Simulation Controls Tab", "Step 6: Navigate to the Simulation Controls tab:", [
+        "Show the simulation configuration options",
+        "Adjust a parameter (e.g., volatility)",
+        "Run a short simulation (e.g., 5 market days)",
+        "Show how the change affected the market behavior",
+        "Demonstrate the news and events feature (if implemented)",
+        "Explain how the simulation can be used for scenario analysis",
+    ]),
+    ("7. Conclusion and Key Features Recap", "Step 7: Conclude the demo:", [
+        """Summarize the key features demonstrated:
+  * Realistic market simulation
+  * Technical analysis capabilities
+  * Interactive visualizations
+  * Portfolio management
+  * Advanced analytics
+  * Customization options""",
+        "Highlight the educational value of the platform",
+        "Mention potential use cases (investors, students, financial institutions)",
+        "Direct viewers to documentation for more information",
+    ]),
+]
 
-- Highlight the market summary metrics (index value, volume, advances/declines)
-- Show the interactive market index chart
-- Demonstrate changing the time period (1D, 1W, 1M, 3M, 6M, 1Y)
-- Point out the sector performance visualization
-- Show the volume heatmap and explain its significance
-- Discuss the top gainers and losers section
-    """)
-    wait_for_input()
-    
-    # Stock Analysis
-    print_section("3. Stock Analysis Tab")
-    print("""
-Step 3: Navigate to the Stock Analysis tab:
+def render(title, body, notes):
+    """Print one demo step to the console"""
+    print_section(title)
+    print(body)
+    if notes:
+        print()
+        for note in notes:
+            print(f"- {note}")
 
-- Select a bank stock (e.g., NABIL) from the dropdown
-- Show the interactive candlestick chart
-- Add a technical indicator (e.g., RSI) and explain its significance
-- Add another indicator (e.g., Bollinger Bands)
-- Demonstrate the zoom and pan features of the chart
-- Show the historical performance metrics
-- Point out the circuit breaker status (if applicable)
-    """)
-    wait_for_input()
+def export_markdown(path="demo.md"):
+    """
+    Write the whole demo script to a markdown file without prompting
     
-    # Portfolio Management
-    print_section("4. Portfolio Management Tab")
-    print("""
-Step 4: Navigate to the Portfolio Management tab:
-
-- Show the current portfolio composition
-- Demonstrate creating a new portfolio or reset the existing one
-- Execute a buy order for a stock (e.g., buy 100 shares of NABIL)
-- Execute a sell order for another stock (if available)
-- Show the portfolio performance chart
-- Point out the profit/loss calculation
-- Demonstrate the portfolio analytics features
-    """)
-    wait_for_input()
+    Args:
+        path (str): Output file path
+        
+    Returns:
+        str: Path of the written file
+    """
+    lines = [f"# {INTRO_TITLE}", "", INTRO, ""]
+    for title, body, notes in STEPS:
+        lines += [f"## {title}", "", body, ""]
+        if notes:
+            lines += [f"- {note}" for note in notes]
+            lines.append("")
     
-    # Analytics Dashboard
-    print_section("5. Analytics Dashboard Tab")
-    print("""
-Step 5: Navigate to the Analytics Dashboard tab:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
 
-- Show the correlation matrix between different stocks
-- Demonstrate sector allocation analysis
-- Point out the circuit breaker analysis visualization
-- Show the volatility comparison chart
-- Explain how these analytics can help investors
-    """)
-    wait_for_input()
+def demo_flow():
+    """Main demo flow script"""
+    print_section(INTRO_TITLE)
+    print(INTRO)
+    wait_for_input("Press Enter to start the demo script...")
     
-    # Simulation Controls
-    print_section("6. Simulation Controls Tab")
-    print("""
-Step 6: Navigate to the Simulation Controls tab:
-
-- Show the simulation configuration options
-- Adjust a parameter (e.g., volatility)
-- Run a short simulation (e.g., 5 market days)
-- Show how the change affected the market behavior
-- Demonstrate the news and events feature (if implemented)
-- Explain how the simulation can be used for scenario analysis
-    """)
-    wait_for_input()
+    last = len(STEPS) - 1
+    for i, (title, body, notes) in enumerate(STEPS):
+        render(title, body, notes)
+        if i < last:
+            wait_for_input()
     
-    # Conclusion
-    print_section("7. Conclusion and Key Features Recap")
-    print("""
-Step 7: Conclude the demo:
+    print("\nDemo script completed!")
 
-- Summarize the key features demonstrated:
-  * Realistic market simulation
-  * Technical analysis capabilities
-  * Interactive visualizations
-  * Portfolio management
-  * Advanced analytics
-  * Customization options
-  
-- Highlight the educational value of the platform
-- Mention potential use cases (investors, students, financial institutions)
-- Direct viewers to documentation for more information
-    """)
+def main():
+    import argparse
     
-    print("\nDemo script completed!")
+    parser = argparse.ArgumentParser(description="NEPSEZEN demo recording script")
+    parser.add_argument("--export-markdown", nargs="?", const="demo.md", metavar="PATH",
+                        help="Write the script to a markdown file (default: demo.md) and exit")
+    args = parser.parse_args()
+    
+    if args.export_markdown:
+        print(f"Demo script written to {export_markdown(args.export_markdown)}")
+        return
+    
+    demo_flow()
 
 if __name__ == "__main__":
-    demo_flow()
+    main()
@@ -21,155 +21,209 @@ class Colors:
     UNDERLINE = '\033[4m'
     END = '\033[0m'
 
+# ANSI colors are only useful on an interactive terminal that has not opted out
+USE_COLOR = not os.environ.get("NO_COLOR") and sys.stdout.isatty()
+
+def _style(template, *codes):
+    """Wrap a str.format template in color codes when USE_COLOR is set"""
+    if not USE_COLOR:
+        return template
+    return "".join(codes) + template + Colors.END
+
+# Preformatted templates, built once at import
+_HEADER_FMT = _style("{}", Colors.HEADER, Colors.BOLD)
+_SECTION_FMT = _style("▶ {}", Colors.BLUE, Colors.BOLD)
+_STEP_FMT = _style("✓ {}", Colors.GREEN)
+_SCRIPT_FMT = _style('Script: "{}"', Colors.CYAN)
+_NOTE_FMT = _style("Note: {}", Colors.YELLOW)
+_PROMPT = _style("[Press Enter to continue]", Colors.YELLOW)
+
 def print_header(text):
     """Print formatted header text"""
     print("\n" + "=" * 60)
-    print(f"{Colors.HEADER}{Colors.BOLD}{text}{Colors.END}")
+    print(_HEADER_FMT.format(text))
     print("=" * 60)
 
 def print_section(text):
     """Print formatted section text"""
-    print(f"\n{Colors.BLUE}{Colors.BOLD}▶ {text}{Colors.END}")
+    print("\n" + _SECTION_FMT.format(text))
     print("-" * 60)
 
 def print_step(text):
     """Print formatted step text"""
-    print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+    print(_STEP_FMT.format(text))
 
 def print_script(text):
     """Print formatted script to read"""
-    print(f"{Colors.CYAN}Script: \"{text}\"{Colors.END}")
+    print(_SCRIPT_FMT.format(text))
 
 def print_note(text):
     """Print formatted note"""
-    print(f"{Colors.YELLOW}Note: {text}{Colors.END}")
+    print(_NOTE_FMT.format(text))
 
 def wait_for_key():
     """Wait for user to press any key to continue"""
-    print(f"\n{Colors.YELLOW}[Press Enter to continue]{Colors.END}")
+    print("\n" + _PROMPT)
     input()
 
+# Each step is (title, body, notes): body pairs what to show with what to say
+STEPS = [
+    ("1. INTRODUCTION TO NEPSEZEN", [
+        ("Start with a brief introduction to the project",
+         "Welcome to the demonstration of NEPSEZEN - the Nepal Stock Exchange Simulator. "
+         "This project provides a realistic simulation of the Nepal Stock Exchange, "
+         "allowing users to analyze market trends, test trading strategies, and "
+         "understand market dynamics without financial risk."),
+        ("Mention the main components",
+         "NEPSEZEN consists of several components: a market simulator that generates "
+         "realistic stock data, an analytics engine for market analysis, technical indicators "
+         "for trading signals, and an interactive dashboard for visualization."),
+    ], [
+        "Show a high-level diagram if available",
+    ]),
+    ("2. DATA GENERATION & HISTORICAL DATA", [
+        ("Show the historical data generation process",
+         "Let's start by looking at how NEPSEZEN generates realistic market data. "
+         "The system uses historical patterns and configurable market factors to create "
+         "synthetic but realistic stock price movements for 75 companies listed on NEPSE."),
+        ("Run the data generation script",
+         "I'll run the script to generate historical data for different time periods. "
+         "You can see that it creates 1-month, 3-month, 6-month and 1-year datasets "
+         "with realistic price movements and volatility."),
+    ], [
+        "Run: python -m scripts.generate_historical_data",
+        "Show the generated CSV files in the data/historical directory",
+    ]),
+    ("3. MARKET ANALYTICS & TECHNICAL INDICATORS", [
+        ("Demonstrate the market analytics functionality",
+         "Now let's examine the market analytics capabilities. "
+         "NEPSEZEN can analyze market trends, identify top gainers and losers, "
+         "calculate technical indicators like RSI, MACD, and Bollinger Bands, "
+         "and provide trading signals based on these indicators."),
+        ("Show live demo of technical analysis",
+         "I'll run a demo that calculates these indicators for a selected stock. "
+         "Notice how the system identifies overbought and oversold conditions, "
+         "generates trading signals, and visualizes the indicators."),
+    ], [
+        "Run: python -m scripts.demo",
+        "Choose option 2 for Technical Indicators",
+    ]),
+    ("4. MARKET SIMULATION", [
+        ("Show the market simulation capabilities",
+         "One of the most powerful features of NEPSEZEN is its market simulation. "
+         "The system can simulate future trading days with realistic market movements, "
+         "including random events that affect specific sectors or the entire market."),
+        ("Run a simulation for 5 trading days",
+         "I'll run a simulation for 5 trading days. You can see how the system "
+         "tracks advances, declines, market return, and identifies the top gainer "
+         "and loser each day. It also occasionally generates market and sector events."),
+    ], [
+        "Run: python -m scripts.demo",
+        "Choose option 3 for Market Simulation",
+    ]),
+    ("5. CUSTOM MARKET SCENARIOS", [
+        ("Demonstrate custom market scenarios",
+         "NEPSEZEN also supports custom market scenarios. Let's demonstrate a 'Market Crash "
+         "Followed by Recovery' scenario, where we'll see a sharp decline followed by "
+         "stabilization and eventual recovery."),
+        ("Run the custom scenario",
+         "Watch how the system simulates a realistic market crash with very negative sentiment, "
+         "followed by gradual improvement in market conditions and eventual recovery."),
+    ], [
+        "Run: python -m scripts.demo",
+        "Choose option 4 for Custom Market Scenario",
+    ]),
+    ("6. INTERACTIVE DASHBOARD", [
+        ("Show the Streamlit dashboard",
+         "Finally, let's look at the interactive dashboard that provides visualizations "
+         "of all the market data. The dashboard shows market breadth, sector performance, "
+         "top gainers and losers, and volume leaders."),
+        ("Navigate through the dashboard",
+         "Users can explore different stocks, analyze technical indicators, and view "
+         "historical performance through this intuitive interface."),
+    ], [
+        "Run: python -m dashboard.simple_dashboard",
+        "Or run: python main.py dashboard (if fixed)",
+    ]),
+    ("7. CONCLUSION & FUTURE ENHANCEMENTS", [
+        ("Summarize the capabilities demonstrated",
+         "In this demonstration, we've seen the comprehensive capabilities of NEPSEZEN: "
+         "realistic data generation, market analytics, technical indicators, "
+         "market simulation, custom scenarios, and interactive visualization."),
+        ("Mention potential future enhancements",
+         "Future enhancements could include portfolio optimization strategies, "
+         "backtesting capabilities for trading algorithms, integration with real "
+         "market data feeds, and mobile applications for on-the-go analysis."),
+    ], [
+        "End with a call to action for viewers to explore the system themselves",
+    ]),
+]
+
+TITLE = "NEPSEZEN DEMONSTRATION VIDEO GUIDE"
+INTRO = ("This guide will help you record a comprehensive demo video",
+         "showcasing all the features of the NEPSEZEN system.")
+OUTRO = ("Follow this guide to create a comprehensive video demonstration of NEPSEZEN.",
+         "Adjust timing and emphasis based on your specific audience and requirements.")
+
+def render(title, body, notes):
+    """Print one guide step to the console"""
+    print_section(title)
+    for step, script in body:
+        print_step(step)
+        print_script(script)
+    
+    for note in notes:
+        print_note(note)
+
+def export_markdown(path="demo.md"):
+    """
+    Write the whole guide to a markdown file without prompting
+    
+    Args:
+        path (str): Output file path
+        
+    Returns:
+        str: Path of the written file
+    """
+    lines = [f"# {TITLE}", "", *INTRO, ""]
+    for title, body, notes in STEPS:
+        lines += [f"## {title}", ""]
+        for step, script in body:
+            lines += [f"- **{step}**", "", f"  > {script}", ""]
+        
+        for note in notes:
+            lines.append(f"*Note: {note}*")
+        lines.append("")
+    
+    lines += list(OUTRO)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
 def main():
-    # Introduction
-    print_header("NEPSEZEN DEMONSTRATION VIDEO GUIDE")
-    print("This guide will help you record a comprehensive demo video")
-    print("showcasing all the features of the NEPSEZEN system.")
-    wait_for_key()
-    
-    # Project Overview
-    print_section("1. INTRODUCTION TO NEPSEZEN")
-    print_step("Start with a brief introduction to the project")
-    print_script("Welcome to the demonstration of NEPSEZEN - the Nepal Stock Exchange Simulator. "
-                "This project provides a realistic simulation of the Nepal Stock Exchange, "
-                "allowing users to analyze market trends, test trading strategies, and "
-                "understand market dynamics without financial risk.")
-    
-    print_step("Mention the main components")
-    print_script("NEPSEZEN consists of several components: a market simulator that generates "
-                "realistic stock data, an analytics engine for market analysis, technical indicators "
-                "for trading signals, and an interactive dashboard for visualization.")
-    
-    print_note("Show a high-level diagram if available")
-    wait_for_key()
-    
-    # Data Generation
-    print_section("2. DATA GENERATION & HISTORICAL DATA")
-    print_step("Show the historical data generation process")
-    print_script("Let's start by looking at how NEPSEZEN generates realistic market data. "
-                "The system uses historical patterns and configurable market factors to create "
-                "synthetic but realistic stock price movements for 75 companies listed on NEPSE.")
-    
-    print_step("Run the data generation script")
-    print_script("I'll run the script to generate historical data for different time periods. "
-                "You can see that it creates 1-month, 3-month, 6-month and 1-year datasets "
-                "with realistic price movements and volatility.")
-    
-    print_note("Run: python -m scripts.generate_historical_data")
-    print_note("Show the generated CSV files in the data/historical directory")
-    wait_for_key()
+    import argparse
     
-    # Market Analytics
-    print_section("3. MARKET ANALYTICS & TECHNICAL INDICATORS")
-    print_step("Demonstrate the market analytics functionality")
-    print_script("Now let's examine the market analytics capabilities. "
-                "NEPSEZEN can analyze market trends, identify top gainers and losers, "
-                "calculate technical indicators like RSI, MACD, and Bollinger Bands, "
-                "and provide trading signals based on these indicators.")
+    parser = argparse.ArgumentParser(description="NEPSEZEN demo video recording guide")
+    parser.add_argument("--export-markdown", nargs="?", const="demo.md", metavar="PATH",
+                        help="Write the guide to a markdown file (default: demo.md) and exit")
+    args = parser.parse_args()
     
-    print_step("Show live demo of technical analysis")
-    print_script("I'll run a demo that calculates these indicators for a selected stock. "
-                "Notice how the system identifies overbought and oversold conditions, "
-                "generates trading signals, and visualizes the indicators.")
+    if args.export_markdown:
+        print(f"Guide written to {export_markdown(args.export_markdown)}")
+        return
     
-    print_note("Run: python -m scripts.demo")
-    print_note("Choose option 2 for Technical Indicators")
+    print_header(TITLE)
+    for line in INTRO:
+        print(line)
     wait_for_key()
     
-    # Market Simulation
-    print_section("4. MARKET SIMULATION")
-    print_step("Show the market simulation capabilities")
-    print_script("One of the most powerful features of NEPSEZEN is its market simulation. "
-                "The system can simulate future trading days with realistic market movements, "
-                "including random events that affect specific sectors or the entire market.")
-    
-    print_step("Run a simulation for 5 trading days")
-    print_script("I'll run a simulation for 5 trading days. You can see how the system "
-                "tracks advances, declines, market return, and identifies the top gainer "
-                "and loser each day. It also occasionally generates market and sector events.")
-    
-    print_note("Run: python -m scripts.demo")
-    print_note("Choose option 3 for Market Simulation")
-    wait_for_key()
-    
-    # Custom Market Scenarios
-    print_section("5. CUSTOM MARKET SCENARIOS")
-    print_step("Demonstrate custom market scenarios")
-    print_script("NEPSEZEN also supports custom market scenarios. Let's demonstrate a 'Market Crash "
-                "Followed by Recovery' scenario, where we'll see a sharp decline followed by "
-                "stabilization and eventual recovery.")
-    
-    print_step("Run the custom scenario")
-    print_script("Watch how the system simulates a realistic market crash with very negative sentiment, "
-                "followed by gradual improvement in market conditions and eventual recovery.")
-    
-    print_note("Run: python -m scripts.demo")
-    print_note("Choose option 4 for Custom Market Scenario")
-    wait_for_key()
-    
-    # Dashboard
-    print_section("6. INTERACTIVE DASHBOARD")
-    print_step("Show the Streamlit dashboard")
-    print_script("Finally, let's look at the interactive dashboard that provides visualizations "
-                "of all the market data. The dashboard shows market breadth, sector performance, "
-                "top gainers and losers, and volume leaders.")
-    
-    print_step("Navigate through the dashboard")
-    print_script("Users can explore different stocks, analyze technical indicators, and view "
-                "historical performance through this intuitive interface.")
-    
-    print_note("Run: python -m dashboard.simple_dashboard")
-    print_note("Or run: python main.py dashboard (if fixed)")
-    wait_for_key()
-    
-    # Conclusion
-    print_section("7. CONCLUSION & FUTURE ENHANCEMENTS")
-    print_step("Summarize the capabilities demonstrated")
-    print_script("In this demonstration, we've seen the comprehensive capabilities of NEPSEZEN: "
-                "realistic data generation, market analytics, technical indicators, "
-                "market simulation, custom scenarios, and interactive visualization.")
-    
-    print_step("Mention potential future enhancements")
-    print_script("Future enhancements could include portfolio optimization strategies, "
-                "backtesting capabilities for trading algorithms, integration with real "
-                "market data feeds, and mobile applications for on-the-go analysis.")
-    
-    print_note("End with a call to action for viewers to explore the system themselves")
-    wait_for_key()
+    for title, body, notes in STEPS:
+        render(title, body, notes)
+        wait_for_key()
     
-    # End
     print_header("END OF DEMONSTRATION GUIDE")
-    print("Follow this guide to create a comprehensive video demonstration of NEPSEZEN.")
-    print("Adjust timing and emphasis based on your specific audience and requirements.")
+    for line in OUTRO:
+        print(line)
 
 if __name__ == "__main__":
     main()
@@ -214,7 +214,7 @@ class DataGenerator:
         ]
         
         event = random.choice(events)
-        impact = random.choice(list(config.EVENT_IMPACT.values()))
+        impact = random.choice(config.EVENT_IMPACT_LEVELS)
         if random.random() < 0.5:
             impact = -impact  # 50% chance of negative impact
         
@@ -329,7 +329,7 @@ class DataGenerator:
         event = random.choice(sector_events)
         
         # Determine impact
-        impact = random.choice(list(config.EVENT_IMPACT.values()))
+        impact = random.choice(config.EVENT_IMPACT_LEVELS)
         if random.random() < 0.5:
             impact = -impact  # 50% chance of negative impact
         
@@ -364,7 +364,7 @@ class DataGenerator:
         ]
         
         event = random.choice(events)
-        impact = random.choice(list(config.EVENT_IMPACT.values()))
+        impact = random.choice(config.EVENT_IMPACT_LEVELS)
         if random.random() < 0.6:  # 60% chance of positive impact for company-specific events
             impact = abs(impact)
         else:
@@ -437,11 +437,11 @@ class DataGenerator:
             combined_factor = market_factor + sector_factor + company_factor
             
             # Apply circuit breaker logic if needed
-            if combined_factor > config.CIRCUIT_BREAKER_THRESHOLD['upper']:
-                combined_factor = config.CIRCUIT_BREAKER_THRESHOLD['upper']
+            if combined_factor > config.CIRCUIT_BREAKER_THRESHOLD.upper:
+                combined_factor = config.CIRCUIT_BREAKER_THRESHOLD.upper
                 circuit_status = "Upper"
-            elif combined_factor < config.CIRCUIT_BREAKER_THRESHOLD['lower']:
-                combined_factor = config.CIRCUIT_BREAKER_THRESHOLD['lower']
+            elif combined_factor < config.CIRCUIT_BREAKER_THRESHOLD.lower:
+                combined_factor = config.CIRCUIT_BREAKER_THRESHOLD.lower
                 circuit_status = "Lower"
             else:
                 circuit_status = "None"
@@ -506,7 +506,7 @@ class DataGenerator:
     
     def save_historical_data(self, file_path):
         """
-        Save generated historical data to HDF5 format.
+        Save generated historical data to HDF5 or, for a .parquet path, Parquet format.
         
         Args:
             file_path (str): Path to save the data file
@@ -519,7 +519,10 @@ class DataGenerator:
             return False
         
         try:
-            self.stock_data.to_hdf(file_path, key='stock_data')
+            if str(file_path).endswith('.parquet'):
+                self.stock_data.to_parquet(file_path, compression='snappy')
+            else:
+                self.stock_data.to_hdf(file_path, key='stock_data')
             logger.info(f"Historical data saved to {file_path}")
             return True
         except Exception as e:
@@ -528,7 +531,7 @@ class DataGenerator:
     
     def load_historical_data(self, file_path):
         """
-        Load historical data from HDF5 format.
+        Load historical data from HDF5 or, for a .parquet path, Parquet format.
         
         Args:
             file_path (str): Path to the data file
@@ -537,7 +540,10 @@ class DataGenerator:
             bool: True if loading successful, False otherwise
         """
         try:
-            self.stock_data = pd.read_hdf(file_path, key='stock_data')
+            if str(file_path).endswith('.parquet'):
+                self.stock_data = pd.read_parquet(file_path)
+            else:
+                self.stock_data = pd.read_hdf(file_path, key='stock_data')
             # Update current date to the last date in the data
             self.current_date = self.stock_data.index.get_level_values(0).max()
             logger.info(f"Historical data loaded from {file_path} up to {self.current_date}")
@@ -645,6 +651,145 @@ class DataGenerator:
             logger.warning("No data generated")
             return None
     
+    def generate_n_days(self, n, volatilities=0.015, sentiments=None):
+        """
+        Generate data for several trading days in one batch.
+        
+        Follows the same price model as generate_next_day, but only the market
+        factors and events are stepped day by day; every company's prices for
+        all days are drawn and built with NumPy array operations.
+        
+        Args:
+            n (int): Number of trading days to generate
+            volatilities (float or array-like, optional): Base volatility, either one
+                value or one per day, defaults to 0.015
+            sentiments (array-like, optional): Market sentiment to set at the start of
+                each day, exactly n values (ValueError otherwise), defaults to None
+                (sentiment evolves on its own)
+        
+        Returns:
+            pd.DataFrame: DataFrame with hierarchical index (date, symbol) and OHLCV columns,
+                or None if no days were generated
+        """
+        if not self.company_info:
+            logger.error("No company information available. Load company info first.")
+            return None
+        
+        if n < 1:
+            logger.warning("No data generated")
+            return None
+        
+        symbols = list(self.company_info.keys())
+        infos = list(self.company_info.values())
+        n_companies = len(symbols)
+        volatilities = np.broadcast_to(np.asarray(volatilities, dtype=np.float64), (n,))
+        if sentiments is not None and len(sentiments) != n:
+            raise ValueError(f"Expected {n} sentiments, got {len(sentiments)}")
+        
+        # Previous close: latest stored price, then company info, then a default
+        prev_close = np.array([
+            info['price']['close'] if 'price' in info and 'close' in info['price']
+            else random.uniform(500, 1500)
+            for info in infos
+        ], dtype=np.float64)
+        if self.stock_data is not None:
+            last_close = self.stock_data.groupby(level=1)['close'].last().reindex(symbols).to_numpy()
+            known = ~np.isnan(last_close)
+            prev_close[known] = last_close[known]
+        
+        base_volume = np.array([info.get('volume', 500000) for info in infos], dtype=np.float64)
+        
+        # Sector of each company as a column into the daily trend matrix, the
+        # extra last column (always 0) is for companies without a tracked sector
+        sectors = list(self.sector_trends)
+        sector_codes = np.array([
+            sectors.index(info['sector']) if info.get('sector') in self.sector_trends else len(sectors)
+            for info in infos
+        ])
+        
+        # Step market factors and events one day at a time
+        market_factor = np.empty(n)
+        sector_trend = np.zeros((n, len(sectors) + 1))
+        for d in range(n):
+            if sentiments is not None:
+                self.market_sentiment = float(sentiments[d])
+            self._update_market_factors()
+            
+            if random.random() < config.MARKET_EVENT_PROBABILITY:
+                self._generate_market_event()
+            
+            if random.random() < config.SECTOR_EVENT_PROBABILITY:
+                self._generate_sector_event()
+            
+            market_factor[d] = self.market_sentiment * 0.3
+            sector_trend[d, :-1] = [self.sector_trends[sector] for sector in sectors]
+        
+        # Company factor: events plus per-company noise, all days at once
+        company_volatility = volatilities[:, None] * np.random.uniform(0.7, 1.3, (n, n_companies))
+        company_factor = np.random.standard_normal((n, n_companies)) * company_volatility
+        event_days, event_companies = np.nonzero(
+            np.random.random((n, n_companies)) < config.COMPANY_EVENT_PROBABILITY)
+        first_day = self.trading_day_counter
+        for d, c in zip(event_days, event_companies):
+            self.trading_day_counter = first_day + d
+            company_factor[d, c] += self._generate_company_event(symbols[c])
+        self.trading_day_counter = first_day
+        
+        combined_factor = market_factor[:, None] + sector_trend[:, sector_codes] * 0.4 + company_factor
+        threshold = config.CIRCUIT_BREAKER_THRESHOLD
+        upper_hit = combined_factor > threshold.upper
+        lower_hit = combined_factor < threshold.lower
+        np.clip(combined_factor, threshold.lower, threshold.upper, out=combined_factor)
+        
+        # Close prices compound day over day (never below 10% of the previous close)
+        close = prev_close * np.cumprod(np.maximum(1 + combined_factor, 0.1), axis=0)
+        open_base = np.vstack([prev_close, close[:-1]])
+        
+        price_range = np.maximum(close * company_volatility, 1)
+        open_ = open_base * (1 + np.random.standard_normal((n, n_companies)) * company_volatility * 0.5)
+        high = np.maximum(open_, close) + np.abs(np.random.standard_normal((n, n_companies)) * price_range * 0.3)
+        low = np.minimum(open_, close) - np.abs(np.random.standard_normal((n, n_companies)) * price_range * 0.3)
+        low = np.maximum(low, 0.1)  # Ensure price is positive
+        
+        # Volume builds on the previous day's volume like in generate_next_day
+        volume_factor = (1 + np.abs(combined_factor) * 5) * np.random.uniform(0.7, 1.3, (n, n_companies))
+        volume_factor[upper_hit | lower_hit] *= 1.5
+        volume = (base_volume * np.cumprod(volume_factor, axis=0)).astype(np.int64)
+        
+        dates = pd.bdate_range(self.current_date + timedelta(days=1), periods=n)
+        index = pd.MultiIndex.from_product([dates, symbols], names=['date', 'symbol'])
+        df = pd.DataFrame({
+            'open': open_.ravel(),
+            'high': high.ravel(),
+            'low': low.ravel(),
+            'close': close.ravel(),
+            'volume': volume.ravel()
+        }, index=index)
+        
+        # Update company info with the last day's prices and circuit status
+        circuit_status = np.where(upper_hit[-1], "Upper", np.where(lower_hit[-1], "Lower", "None"))
+        for c, symbol in enumerate(symbols):
+            self.company_info[symbol]['price'] = {
+                'open': float(open_[-1, c]),
+                'high': float(high[-1, c]),
+                'low': float(low[-1, c]),
+                'close': float(close[-1, c])
+            }
+            self.company_info[symbol]['volume'] = int(volume[-1, c])
+            self.company_info[symbol]['circuit_status'] = str(circuit_status[c])
+        
+        if self.stock_data is not None:
+            self.stock_data = pd.concat([self.stock_data, df])
+        else:
+            self.stock_data = df
+        
+        self.current_date = dates[-1]
+        self.trading_day_counter += n
+        
+        logger.info(f"Generated data for {n} trading days for {n_companies} companies")
+        
+        return df
+    
     def get_latest_company_data(self):
         """
         Get the latest data for all companies.
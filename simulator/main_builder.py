@@ -52,6 +52,7 @@ class MarketSimulation:
         
         # Simulation state
         self.mode = "historical"  # 'historical' or 'realtime'
+        self.data_version = 0  # Bumped whenever the market data or prices change
         
         logger.info("NEPSEZEN Market Simulation initialized")
     
@@ -117,6 +118,7 @@ class MarketSimulation:
                 while next_date.weekday() >= 5:  # Skip weekends
                     next_date += timedelta(days=1)
                 self.realtime_simulator.set_current_date(next_date)
+                self.data_version += 1
                 
                 logger.info(f"Market simulation initialized with {historical_days} days of historical data")
                 return True
@@ -129,10 +131,10 @@ class MarketSimulation:
     
     def load_historical_data(self, file_path, update_company_info=True):
         """
-        Load historical data from an HDF5 file instead of generating it.
+        Load historical data from an HDF5 or Parquet file instead of generating it.
         
         Args:
-            file_path (str): Path to the HDF5 file
+            file_path (str): Path to the HDF5 or .parquet file
             update_company_info (bool, optional): Whether to update company info with latest data
             
         Returns:
@@ -171,6 +173,7 @@ class MarketSimulation:
                             }
                             self.company_info[symbol]['volume'] = data['volume']
                 
+                self.data_version += 1
                 logger.info(f"Loaded historical data from {file_path}")
                 return True
             else:
@@ -180,12 +183,13 @@ class MarketSimulation:
             logger.error(f"Error loading historical data: {str(e)}")
             return False
     
-    def save_historical_data(self, file_path=None):
+    def save_historical_data(self, file_path=None, format='hdf5'):
         """
-        Save historical data to an HDF5 file.
+        Save historical data to an HDF5 or Parquet file.
         
         Args:
-            file_path (str, optional): Path to save the HDF5 file
+            file_path (str, optional): Path to save the file
+            format (str, optional): 'hdf5' or 'parquet', used to name the file when no path is given
             
         Returns:
             bool: True if saving successful, False otherwise
@@ -198,7 +202,8 @@ class MarketSimulation:
             # Create a file path based on the date range
             start_date = self.data_generator.stock_data.index.get_level_values(0).min().strftime('%Y%m%d')
             end_date = self.data_generator.stock_data.index.get_level_values(0).max().strftime('%Y%m%d')
-            file_path = os.path.join(config.HISTORICAL_DATA_DIR, f"nepse_{start_date}_{end_date}.h5")
+            extension = 'parquet' if format == 'parquet' else 'h5'
+            file_path = config.HISTORICAL_DATA_DIR / f"nepse_{start_date}_{end_date}.{extension}"
         
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -222,8 +227,7 @@ class MarketSimulation:
         if file_path is None:
             # Create a backup of the original file
             current_date = datetime.now().strftime('%Y%m%d')
-            file_path = os.path.join(os.path.dirname(config.COMPANIES_DATA_FILE), 
-                                     f"companies_{current_date}.json")
+            file_path = config.COMPANIES_DATA_FILE.parent / f"companies_{current_date}.json"
         
         try:
             with open(file_path, 'w') as f:
@@ -256,6 +260,7 @@ class MarketSimulation:
             if new_data is not None:
                 # Update market analyzer
                 self.market_analyzer.load_data(self.data_generator.stock_data, self.company_info)
+                self.data_version += 1
                 
                 # Save data if requested
                 if save_data:
@@ -310,6 +315,7 @@ class MarketSimulation:
                         minutes_elapsed=minutes_elapsed,
                         volatility_factor=volatility_factor
                     )
+                    self.data_version += 1
                     
                     # Notify callbacks of the update
                     self._notify_callbacks('price_update', update_data)
@@ -437,6 +443,9 @@ class MarketSimulation:
         """
         Get historical stock data for a symbol or all symbols.
         
+        Without a symbol or dates this returns the simulation's own DataFrame,
+        not a copy, so it costs nothing per call; callers must not mutate it.
+        
         Args:
             symbol (str, optional): Company symbol, defaults to None (all companies)
             start_date (str, optional): Start date for data, defaults to earliest date
@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from analytics.analyzer import MarketAnalyzer
+from utils._ranking import top_n_positions
 
 class TestMarketAnalyzer(unittest.TestCase):
     """Test cases for the market analyzer"""
@@ -72,6 +73,174 @@ class TestMarketAnalyzer(unittest.TestCase):
         self.assertIn('unchanged', summary)
         self.assertIn('market_index', summary)
         
+    def test_market_breadth_counts(self):
+        """Test advancing/declining counts against the last two closes"""
+        self.analyzer.rsi_values = {'NABIL': 50.0}
+        breadth = self.analyzer.get_market_summary()['market_breadth']
+        
+        dates = self.market_data.index.get_level_values('date').unique().sort_values()
+        prev = self.market_data.xs(dates[-2], level='date')['close']
+        curr = self.market_data.xs(dates[-1], level='date')['close']
+        
+        self.assertEqual(breadth['advancing'], int((curr > prev).sum()))
+        self.assertEqual(breadth['declining'], int((curr < prev).sum()))
+        self.assertEqual(breadth['total'], 5)
+        
+    def test_rankers_match_full_sort(self):
+        """Test that gainers, losers and volume leaders match a full sort"""
+        latest_date = self.market_data.index.get_level_values('date').max()
+        latest = self.market_data.xs(latest_date, level='date')
+        pct = (latest['close'] - latest['open']) / latest['open'] * 100
+        
+        gainers = self.analyzer.get_top_gainers(3)
+        losers = self.analyzer.get_top_losers(3)
+        leaders = self.analyzer.get_volume_leaders(3)
+        
+        self.assertEqual(list(gainers), list(pct.sort_values(ascending=False).index[:3]))
+        self.assertEqual(list(losers), list(pct.sort_values().index[:3]))
+        self.assertEqual(list(leaders), list(latest['volume'].sort_values(ascending=False).index[:3]))
+        self.assertAlmostEqual(gainers[pct.idxmax()], pct.max(), places=4)
+        
+    def test_rankers_do_not_mutate_data(self):
+        """Test that percent changes are computed without adding DataFrame columns"""
+        columns = list(self.market_data.columns)
+        self.analyzer.get_top_gainers(n=3)
+        self.analyzer.get_top_losers(n=3)
+        
+        latest_date, latest_data = self.analyzer._get_latest()
+        self.assertNotIn('pct_change', latest_data.columns)
+        self.assertEqual(list(self.market_data.columns), columns)
+        
+    def test_top_n_ties_match_nlargest(self):
+        """Test that tied values are ranked like Series.nlargest(keep='first')"""
+        values = np.array([5, 1, 7, 5, 7, 3, 5, 0])
+        series = pd.Series(values)
+        
+        for n in range(len(values) + 1):
+            self.assertEqual(list(top_n_positions(values, n)), list(series.nlargest(n).index))
+            self.assertEqual(list(top_n_positions(values, n, largest=False)), list(series.nsmallest(n).index))
+        
+    def test_rsi_metrics(self):
+        """Test RSI distribution statistics in the market summary"""
+        rsi = {'NABIL': 30.0, 'NLIC': 50.0, 'NRIC': 70.0, 'EBL': 40.0}
+        self.analyzer.rsi_values = rsi
+        metrics = self.analyzer.get_market_summary()['rsi_metrics']
+        
+        values = list(rsi.values())
+        self.assertAlmostEqual(metrics['mean'], np.mean(values))
+        self.assertAlmostEqual(metrics['median'], np.median(values))
+        self.assertAlmostEqual(metrics['std'], np.std(values))
+        self.assertEqual(metrics['min'], 30.0)
+        self.assertEqual(metrics['max'], 70.0)
+        
+    def test_sector_metrics(self):
+        """Test best/worst sector selection in the market summary"""
+        self.analyzer.analysis_results = {
+            'sector_performance': {'Commercial Bank': 1.5, 'Insurance': -2.0, 'Development Bank': 0.5}
+        }
+        metrics = self.analyzer.get_market_summary()['sector_metrics']
+        
+        self.assertEqual(metrics['best_sector'], 'Commercial Bank')
+        self.assertEqual(metrics['worst_sector'], 'Insurance')
+        self.assertAlmostEqual(metrics['market_return'], 0.0)
+        
+    def test_circuit_and_volume_metrics(self):
+        """Test circuit breaker and volume spike totals in the market summary"""
+        self.analyzer.circuit_breakers = {'upper': {'NABIL': 2, 'EBL': 1}, 'lower': {'NLIC': 3}}
+        self.analyzer.volume_spikes = {'NABIL': 4, 'ADBL': 0}
+        summary = self.analyzer.get_market_summary()
+        
+        self.assertEqual(summary['circuit_metrics'], {
+            'total_upper_circuits': 3,
+            'total_lower_circuits': 3,
+            'companies_hit_upper': 2,
+            'companies_hit_lower': 1
+        })
+        self.assertEqual(summary['volume_metrics'], {'total_spikes': 4, 'companies_with_spikes': 1})
+        self.assertEqual(self.analyzer.circuit_breakers['lower'], {'NLIC': 3})
+        self.assertEqual(self.analyzer.volume_spikes, {'NABIL': 4})
+        
+    def test_legacy_analysis_results(self):
+        """Test that results stored under the per-key layout feed the market summary"""
+        self.analyzer.analysis_results = {
+            'rsi': {'NABIL': 30.0, 'NLIC': 70.0},
+            'upper_circuit_counts': {'NABIL': 2},
+            'lower_circuit_counts': {'NLIC': 1, 'EBL': 1},
+            'volume_spike_counts': {'ADBL': 3}
+        }
+        summary = self.analyzer.get_market_summary()
+        
+        self.assertAlmostEqual(summary['rsi_metrics']['mean'], 50.0)
+        self.assertEqual(summary['circuit_metrics'], {
+            'total_upper_circuits': 2,
+            'total_lower_circuits': 2,
+            'companies_hit_upper': 1,
+            'companies_hit_lower': 2
+        })
+        self.assertEqual(summary['volume_metrics'], {'total_spikes': 3, 'companies_with_spikes': 1})
+        
+    def test_calculate_rsi_values(self):
+        """Test batch RSI calculation against the per-company indicator"""
+        from utils.indicators import calculate_rsi
+        
+        rsi_values = self.analyzer.calculate_rsi_values(period=14)
+        self.assertEqual(set(rsi_values), {'NABIL', 'NLIC', 'NRIC', 'EBL', 'ADBL'})
+        
+        nabil_close = self.market_data.xs('NABIL', level='symbol')['close']
+        expected = calculate_rsi(nabil_close, 14).dropna().iloc[-1]
+        self.assertAlmostEqual(rsi_values['NABIL'], expected, places=3)
+        
+    def test_detect_circuit_breakers(self):
+        """Test that circuit breaker counts match per-company detection"""
+        counts = self.analyzer.detect_circuit_breakers(threshold={'upper': 0.5, 'lower': -0.5})
+        
+        for symbol in ['NABIL', 'NLIC', 'NRIC', 'EBL', 'ADBL']:
+            returns = self.market_data.xs(symbol, level='symbol')['close'].pct_change()
+            self.assertEqual(counts['upper'].get(symbol, 0), int((returns > 0.5).sum()))
+            self.assertEqual(counts['lower'].get(symbol, 0), int((returns < -0.5).sum()))
+        
+        summary = self.analyzer.get_market_summary()
+        self.assertEqual(summary['circuit_metrics']['total_upper_circuits'], sum(counts['upper'].values()))
+        self.assertEqual(summary['circuit_metrics']['companies_hit_lower'], len(counts['lower']))
+        
+    def test_run_comprehensive_analysis(self):
+        """Test that the comprehensive analysis feeds every summary section"""
+        results = self.analyzer.run_comprehensive_analysis()
+        
+        self.assertEqual(set(results), {'rsi_values', 'circuit_breakers', 'volume_spikes', 'sector_performance'})
+        self.assertEqual(set(results['sector_performance']), {'Commercial Bank', 'Insurance', 'Development Bank'})
+        
+        # ADBL is the only development bank
+        adbl = self.market_data.xs('ADBL', level='symbol')['close']
+        expected = (adbl.iloc[-1] - adbl.iloc[0]) / adbl.iloc[0] * 100
+        self.assertAlmostEqual(results['sector_performance']['Development Bank'], expected, places=2)
+        
+        summary = self.analyzer.get_market_summary()
+        for key in ('market_breadth', 'rsi_metrics', 'sector_metrics'):
+            self.assertIn(key, summary)
+        
+    def test_market_summary_cache_invalidation(self):
+        """Test that the cached summary is refreshed when results are replaced"""
+        self.analyzer.rsi_values = {'NABIL': 40.0}
+        first = self.analyzer.get_market_summary()
+        self.assertIs(self.analyzer.get_market_summary(), first)
+        
+        self.analyzer.rsi_values = {'NABIL': 60.0}
+        self.assertEqual(self.analyzer.get_market_summary()['rsi_metrics']['mean'], 60.0)
+        
+    def test_analysis_results_read_only(self):
+        """Test that analysis results can't be edited in place behind the summary cache"""
+        self.analyzer.analysis_results = {'sector_performance': {'Insurance': 1.0}}
+        self.assertEqual(self.analyzer.get_market_summary()['sector_metrics']['best_sector'], 'Insurance')
+        
+        with self.assertRaises(TypeError):
+            self.analyzer.analysis_results['sector_performance'] = {'Commercial Bank': 2.0}
+        with self.assertRaises(AttributeError):
+            self.analyzer.analysis_results.update(sector_performance={'Commercial Bank': 2.0})
+        
+        self.analyzer.analysis_results = {'sector_performance': {'Commercial Bank': 2.0}}
+        self.assertEqual(self.analyzer.get_market_summary()['sector_metrics']['best_sector'], 'Commercial Bank')
+        
     def test_get_sector_performance(self):
         """Test sector performance calculation"""
         sector_perf = self.analyzer.get_sector_performance()
@@ -58,7 +58,8 @@ class TestDataGeneration(unittest.TestCase):
             'Commercial Bank': {'trend': 0.002, 'volatility': 0.015},
             'Insurance': {'trend': -0.001, 'volatility': 0.02}
         }
-          def test_data_generator_init(self):
+        
+    def test_data_generator_init(self):
         """Test DataGenerator initialization"""
         data_gen = DataGenerator(self.company_data)
         
@@ -120,6 +121,43 @@ class TestDataGeneration(unittest.TestCase):
         self.assertTrue(all(data['high'] >= data['close']))
         self.assertTrue(all(data['low'] <= data['open']))
         self.assertTrue(all(data['low'] <= data['close']))
+        
+    def test_generate_n_days(self):
+        """Test batched generation of several trading days"""
+        data_gen = DataGenerator(self.company_data)
+        data_gen.initialize_market_factors(start_date="2023-01-06")
+        
+        # Generate 5 days with per-day volatility and sentiment
+        data = data_gen.generate_n_days(5, [0.02, 0.025, 0.015, 0.018, 0.02],
+                                        [-0.8, -0.5, 0.0, 0.4, 0.7])
+        
+        # Check the (date, symbol) index covers every company on every weekday
+        self.assertEqual(list(data.index.names), ['date', 'symbol'])
+        self.assertEqual(len(data), 5 * len(self.company_data))
+        dates = data.index.get_level_values('date').unique()
+        self.assertEqual(dates[0], pd.Timestamp("2023-01-09"))
+        self.assertTrue(all(dates.weekday < 5))
+        
+        # Check price ordering
+        self.assertTrue(all(data['high'] >= data[['open', 'close']].max(axis=1)))
+        self.assertTrue(all(data['low'] <= data[['open', 'close']].min(axis=1)))
+        
+        # Check generator state advanced past the batch
+        self.assertEqual(data_gen.current_date, dates[-1])
+        self.assertEqual(data_gen.trading_day_counter, 5)
+        self.assertEqual(data_gen.company_info['NABIL']['price']['close'],
+                         data.loc[(dates[-1], 'NABIL'), 'close'])
+        
+        # Check an empty batch generates nothing
+        self.assertIsNone(data_gen.generate_n_days(0))
+        self.assertEqual(data_gen.trading_day_counter, 5)
+        
+        # Check a sentiment per day is required, before any state changes
+        sentiment = data_gen.market_sentiment
+        with self.assertRaises(ValueError):
+            data_gen.generate_n_days(3, 0.015, [0.1, 0.2])
+        self.assertEqual(data_gen.trading_day_counter, 5)
+        self.assertEqual(data_gen.market_sentiment, sentiment)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,226 @@
+"""
+Unit tests for the data filtering module
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.filters import (
+    filter_by_sector, filter_by_market_cap, filter_by_pe_ratio, filter_by_eps,
+    filter_by_rsi, filter_by_volume, filter_by_price_change, filter_by_macd_signal,
+    filter_by_circuit_breakers,
+    combine_filters, company_info_to_df, CompanyFilterBuilder
+)
+from utils.indicators import calculate_rsi, calculate_macd
+
+class TestFilters(unittest.TestCase):
+    """Test cases for company filters"""
+    
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(42)
+        self.dates = pd.bdate_range(start='2023-01-02', periods=60)
+        self.symbols = ['NABIL', 'NLIC', 'NRIC', 'EBL', 'ADBL', 'UPPER']
+        
+        data = []
+        for symbol in self.symbols:
+            # UPPER only starts trading late, so it has a shorter history
+            dates = self.dates[50:] if symbol == 'UPPER' else self.dates
+            prices = 200 + rng.normal(0, 3, len(dates)).cumsum()
+            for date, price in zip(dates, prices):
+                data.append({
+                    'date': date,
+                    'symbol': symbol,
+                    'open': price * 0.99,
+                    'high': price * 1.01,
+                    'low': price * 0.98,
+                    'close': price,
+                    'volume': int(rng.integers(1000, 10000))
+                })
+        
+        self.stock_data = pd.DataFrame(data).set_index(['date', 'symbol']).sort_index()
+        
+        self.company_info = {
+            'NABIL': {'sector': 'Commercial Bank', 'market_cap': 9e10, 'pe_ratio': 18.0, 'eps': 35.0},
+            'NLIC': {'sector': 'Insurance', 'market_cap': 6e10, 'pe_ratio': 42.0, 'eps': 12.0},
+            'NRIC': {'sector': 'Insurance', 'market_cap': 4e10, 'pe_ratio': None, 'eps': 8.0},
+            'EBL': {'sector': 'Commercial Bank', 'market_cap': 7e10, 'pe_ratio': 15.0, 'eps': 40.0},
+            'ADBL': {'sector': 'Development Bank', 'pe_ratio': 11.0, 'eps': 22.0},
+            'UPPER': {'sector': 'Hydropower', 'market_cap': 1e10, 'pe_ratio': 60.0, 'eps': 2.5}
+        }
+    
+    def test_company_info_filters(self):
+        """Test sector and fundamental filters, including missing values"""
+        self.assertEqual(sorted(filter_by_sector(self.company_info, 'Insurance')), ['NLIC', 'NRIC'])
+        self.assertEqual(sorted(filter_by_sector(self.company_info, ['Hydropower', 'Development Bank'])),
+                         ['ADBL', 'UPPER'])
+        
+        # ADBL has no market cap and NRIC has no P/E ratio
+        self.assertEqual(sorted(filter_by_market_cap(self.company_info, min_market_cap=5e10)),
+                         ['EBL', 'NABIL', 'NLIC'])
+        self.assertEqual(sorted(filter_by_market_cap(self.company_info)), ['EBL', 'NABIL', 'NLIC', 'NRIC', 'UPPER'])
+        self.assertEqual(sorted(filter_by_pe_ratio(self.company_info, max_pe=20)), ['ADBL', 'EBL', 'NABIL'])
+        self.assertEqual(sorted(filter_by_eps(self.company_info, min_eps=12, max_eps=35)), ['ADBL', 'NABIL', 'NLIC'])
+    
+    def test_company_info_to_df(self):
+        """Test typed conversion of company information and filtering on the result"""
+        company_df = company_info_to_df(self.company_info)
+        
+        self.assertEqual(company_df['pe_ratio'].dtype, np.float64)
+        self.assertEqual(company_df['sector'].dtype, 'category')
+        self.assertTrue(np.isnan(company_df.loc['NRIC', 'pe_ratio']))
+        
+        self.assertEqual(filter_by_pe_ratio(company_df, max_pe=20), filter_by_pe_ratio(self.company_info, max_pe=20))
+        self.assertEqual(filter_by_sector(company_df, 'Insurance'), filter_by_sector(self.company_info, 'Insurance'))
+    
+    def _latest_rsi(self, symbol, period=14):
+        """Calculate the latest valid RSI of one company"""
+        close = self.stock_data.xs(symbol, level=1)['close']
+        return calculate_rsi(close, period).dropna().iloc[-1]
+    
+    def test_filter_by_rsi(self):
+        """Test that the RSI filter matches per-company RSI values"""
+        expected = [s for s in self.symbols if s != 'UPPER' and 40 <= self._latest_rsi(s) <= 60]
+        
+        self.assertEqual(sorted(filter_by_rsi(self.stock_data, min_rsi=40, max_rsi=60)), sorted(expected))
+        
+        # Companies without enough history for an RSI value are excluded
+        self.assertNotIn('UPPER', filter_by_rsi(self.stock_data, min_rsi=0, max_rsi=100))
+        
+        # As-of date filtering only considers RSI values on that date
+        as_of = self.dates[30]
+        rsi_on_date = filter_by_rsi(self.stock_data, min_rsi=0, max_rsi=100, as_of_date=as_of)
+        self.assertEqual(sorted(rsi_on_date), sorted(s for s in self.symbols if s != 'UPPER'))
+
+    
+    def test_as_of_date_snaps_to_previous_trading_day(self):
+        """Test that as-of dates without trading use the previous trading day"""
+        trading_day = self.dates[34]
+        between_days = trading_day + pd.Timedelta(hours=12)
+        
+        self.assertEqual(filter_by_rsi(self.stock_data, max_rsi=50, as_of_date=between_days),
+                         filter_by_rsi(self.stock_data, max_rsi=50, as_of_date=trading_day))
+        self.assertEqual(filter_by_volume(self.stock_data, min_volume=5000, as_of_date=between_days),
+                         filter_by_volume(self.stock_data, min_volume=5000, as_of_date=trading_day))
+        self.assertEqual(filter_by_macd_signal(self.stock_data, 'positive', as_of_date=between_days),
+                         filter_by_macd_signal(self.stock_data, 'positive', as_of_date=trading_day))
+        
+        # Dates before the first trading day match nothing
+        self.assertEqual(filter_by_rsi(self.stock_data, min_rsi=0, as_of_date='2022-12-01'), [])
+    
+    def test_filter_by_volume(self):
+        """Test that the volume filter uses each company's moving average volume"""
+        avg_volume = {
+            s: self.stock_data.xs(s, level=1)['volume'].rolling(20).mean().dropna()
+            for s in self.symbols
+        }
+        expected = [s for s, avg in avg_volume.items() if not avg.empty and 5000 <= avg.iloc[-1] <= 6000]
+        
+        self.assertEqual(sorted(filter_by_volume(self.stock_data, min_volume=5000, max_volume=6000)), sorted(expected))
+        
+        # UPPER has fewer days than the averaging period
+        self.assertNotIn('UPPER', filter_by_volume(self.stock_data, min_volume=0))
+    
+    def test_filter_by_price_change(self):
+        """Test that the price change filter compares first and last close in the period"""
+        start, end = self.dates[10], self.dates[40]
+        expected = []
+        for symbol in self.symbols:
+            close = self.stock_data.xs(symbol, level=1)['close'].loc[start:end]
+            if len(close) >= 2 and (close.iloc[-1] / close.iloc[0] - 1) * 100 >= 0:
+                expected.append(symbol)
+        
+        result = filter_by_price_change(self.stock_data, min_change=0, start_date=start, end_date=end)
+        self.assertEqual(sorted(result), sorted(expected))
+    
+    def test_filter_by_macd_signal(self):
+        """Test that MACD signals match per-company MACD lines, including gapped histories"""
+        # Drop a few trading days for some companies
+        gapped = self.stock_data.drop([(self.dates[d], 'NABIL') for d in (20, 58)] +
+                                      [(self.dates[57], 'EBL')])
+        
+        for as_of_date in (None, self.dates[40], self.dates[58]):
+            for signal_type in ('crossover', 'crossunder', 'positive', 'negative'):
+                expected = []
+                for symbol in self.symbols:
+                    close = gapped.xs(symbol, level=1)['close']
+                    if as_of_date is not None and as_of_date not in close.index:
+                        continue
+                    macd_line, signal_line, _ = calculate_macd(close)
+                    idx = close.index.get_loc(as_of_date) if as_of_date is not None else len(close) - 1
+                    if idx < 1:
+                        continue
+                    prev = macd_line.iloc[idx - 1] - signal_line.iloc[idx - 1]
+                    cur = macd_line.iloc[idx] - signal_line.iloc[idx]
+                    hit = {'crossover': prev <= 0 < cur, 'crossunder': prev >= 0 > cur,
+                           'positive': cur > 0, 'negative': cur < 0}[signal_type]
+                    if hit:
+                        expected.append(symbol)
+                
+                result = filter_by_macd_signal(gapped, signal_type, as_of_date)
+                self.assertEqual(sorted(result), sorted(expected), (signal_type, as_of_date))
+    
+    def test_filter_by_circuit_breakers(self):
+        """Test circuit breaker counting per company"""
+        circuit_data = pd.DataFrame({
+            'NABIL': ['None', 'Upper', 'Upper', 'None'],
+            'NLIC': ['Lower', 'None', 'None', 'None'],
+            'EBL': ['None', 'None', 'None', 'None'],
+            'ADBL': ['Upper', 'Lower', 'None', 'None']
+        }, index=self.dates[:4])
+        
+        self.assertEqual(filter_by_circuit_breakers(circuit_data, 'Upper', min_count=2), ['NABIL'])
+        self.assertEqual(filter_by_circuit_breakers(circuit_data, 'Lower'), ['NLIC', 'ADBL'])
+        self.assertEqual(filter_by_circuit_breakers(circuit_data), ['NABIL', 'NLIC', 'ADBL'])
+        self.assertEqual(filter_by_circuit_breakers(circuit_data.astype('category'), min_count=2), ['NABIL', 'ADBL'])
+    
+    def test_combine_filters(self):
+        """Test combining filter lists with 'and' and 'or'"""
+        lists = [['NABIL', 'EBL', 'ADBL'], ['EBL', 'NLIC', 'EBL'], ['EBL', 'ADBL']]
+        
+        self.assertEqual(combine_filters(lists, 'and'), ['EBL'])
+        self.assertEqual(sorted(combine_filters(lists, 'or')), ['ADBL', 'EBL', 'NABIL', 'NLIC'])
+        self.assertEqual(combine_filters([['NABIL'], []], 'and'), [])
+        self.assertEqual(combine_filters(lists, 'xor'), [])
+    
+    def test_builder_streaming_update(self):
+        """Test that streamed RSI and MACD state matches a rebuild on the full data"""
+        idx = pd.IndexSlice
+        history = self.stock_data.loc[idx[:self.dates[51], :], :]
+        streaming = CompanyFilterBuilder(history, self.company_info)
+        
+        for date in self.dates[52:]:
+            streaming.update(self.stock_data.xs(date, level=0)['close'])
+        
+        rebuilt = CompanyFilterBuilder(self.stock_data, self.company_info)
+        for min_rsi, max_rsi in ((None, 50), (50, None), (40, 60)):
+            streaming.filters, rebuilt.filters = [], []
+            self.assertEqual(streaming.by_rsi(min_rsi, max_rsi).build(),
+                             rebuilt.by_rsi(min_rsi, max_rsi).build())
+        for signal_type in ('crossover', 'crossunder', 'positive', 'negative'):
+            streaming.filters, rebuilt.filters = [], []
+            self.assertEqual(streaming.by_macd_signal(signal_type).build(),
+                             rebuilt.by_macd_signal(signal_type).build())
+    
+    def test_builder_combines_filters(self):
+        """Test that the builder matches combining the standalone filter results"""
+        builder = CompanyFilterBuilder(self.stock_data.sample(frac=1, random_state=0), self.company_info)
+        sector_banks = filter_by_sector(self.company_info, ['Commercial Bank', 'Development Bank'])
+        active = filter_by_volume(self.stock_data, min_volume=5000)
+        cheap = filter_by_pe_ratio(self.company_info, max_pe=20)
+        
+        result = builder.by_sector(['Commercial Bank', 'Development Bank']).by_volume(min_volume=5000).build()
+        self.assertEqual(sorted(result), sorted(combine_filters([sector_banks, active], 'and')))
+        
+        builder.filters = []
+        result = builder.by_volume(min_volume=5000).by_pe_ratio(max_pe=20).build('or')
+        self.assertEqual(sorted(result), sorted(combine_filters([active, cheap], 'or')))
+
+if __name__ == '__main__':
+    unittest.main()
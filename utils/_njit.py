@@ -0,0 +1,30 @@
+"""
+NEPSEZEN - Nepal Stock Exchange Simulator
+Optional Numba Support
+
+This module re-exports numba's njit and prange when numba is installed and
+falls back to no-op equivalents otherwise, so numeric kernels can be written
+once and still run (more slowly) without the optional dependency.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit that returns the function unchanged.
+
+        Supports both the bare (@njit) and the parameterized (@njit(...)) forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+    prange = range
@@ -0,0 +1,40 @@
+"""
+NEPSEZEN - Nepal Stock Exchange Simulator
+Ranking Helpers
+
+Partial-selection top-n ranking shared by the market analyzer and the simple
+dashboard analysis.
+"""
+
+import numpy as np
+
+
+def top_n_positions(values, n, largest=True):
+    """
+    Get the positions of the n largest (or smallest) values, in ranked order.
+    
+    Uses np.argpartition for an O(N) selection and only sorts the selected
+    entries, instead of sorting the whole array. Ties are ranked by position,
+    matching Series.nlargest/nsmallest(keep='first').
+    
+    Args:
+        values (np.ndarray): 1-D array of values to rank
+        n (int): Number of positions to return
+        largest (bool): Whether to select the largest values, defaults to True
+        
+    Returns:
+        np.ndarray: Integer positions into values
+    """
+    k = min(max(n, 0), values.size)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    
+    keys = -values if largest else values
+    idx = np.argpartition(keys, k - 1)[:k]
+    
+    # argpartition picks arbitrarily among entries tied with the k-th key, so
+    # widen the selection to all of them before ranking (NaN cutoffs excluded)
+    cutoff = keys[idx].max()
+    if cutoff == cutoff:
+        idx = np.flatnonzero(keys <= cutoff)
+    return idx[np.lexsort((idx, keys[idx]))[:k]]
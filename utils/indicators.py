@@ -14,6 +14,58 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+from utils._njit import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _rsi_kernel(close, periods):
+    """
+    Calculate the RSI of one price array in a single compiled loop.
+    
+    Produces the same values as the pandas implementation in calculate_rsi:
+    simple moving averages of gains and losses, missing changes counted as
+    zero, and no value before `periods` prices are available.
+    
+    Args:
+        close (np.ndarray): 1-D float64 array of prices
+        periods (int): The number of periods to use for RSI calculation
+        
+    Returns:
+        np.ndarray: RSI values
+    """
+    n = close.size
+    rsi = np.full(n, np.nan)
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+    
+    sum_gain = 0.0
+    sum_loss = 0.0
+    count = 0
+    for i in range(n):
+        sum_gain += gains[i]
+        sum_loss += losses[i]
+        if i >= periods:
+            sum_gain -= gains[i - periods]
+            sum_loss -= losses[i - periods]
+        
+        if np.isnan(close[i]):
+            continue
+        count += 1
+        
+        if count >= periods:
+            if sum_loss > 0:
+                rsi[i] = 100 - (100 / (1 + sum_gain / sum_loss))
+            elif sum_gain > 0:
+                rsi[i] = 100.0
+    
+    return rsi
 
 
 def calculate_rsi(prices, periods=None):
@@ -21,18 +73,25 @@ def calculate_rsi(prices, periods=None):
     Calculate the Relative Strength Index (RSI) for a given price series.
     
     Args:
-        prices (list/Series): A list or pandas Series of price data
+        prices (list/Series/DataFrame): A list or pandas Series of price data, or a
+            DataFrame with one price column per company
         periods (int, optional): The number of periods to use for RSI calculation, defaults to config.RSI_PERIOD
         
     Returns:
-        pandas.Series: RSI values for the given price series
+        pandas.Series or pandas.DataFrame: RSI values, shaped like the input
     """
     if periods is None:
         periods = config.RSI_PERIOD
         
     # Convert to pandas Series if input is a list
-    if not isinstance(prices, pd.Series):
+    if not isinstance(prices, (pd.Series, pd.DataFrame)):
         prices = pd.Series(prices)
+    
+    # Single price series are handled by the compiled kernel when numba is
+    # installed (the pure-Python fallback would be slower than pandas)
+    if NUMBA_AVAILABLE and isinstance(prices, pd.Series):
+        rsi = _rsi_kernel(prices.to_numpy(dtype=np.float64), periods)
+        return pd.Series(rsi, index=prices.index, name=prices.name)
         
     # Calculate price changes
     delta = prices.diff()
@@ -51,35 +110,155 @@ def calculate_rsi(prices, periods=None):
     # Calculate RSI
     rsi = 100 - (100 / (1 + rs))
     
+    # Missing prices count as zero change above, so only keep RSI values on
+    # rows with a price and at least `periods` prices so far (this matters
+    # for DataFrame columns of companies with shorter or gapped histories)
+    has_price = prices.notna()
+    rsi = rsi.where(has_price & (has_price.cumsum() >= periods))
+    
     return rsi
 
 
+@njit(cache=True, parallel=True)
+def _latest_rsi_kernel(closes, periods):
+    """
+    Calculate the latest valid RSI of every company, one company per thread.
+    
+    Args:
+        closes (np.ndarray): 2-D float64 (dates x companies) array of prices
+        periods (int): The number of periods to use for RSI calculation
+        
+    Returns:
+        np.ndarray: Latest non-NaN RSI of each company, NaN if there is none
+    """
+    n_dates, n_companies = closes.shape
+    latest = np.full(n_companies, np.nan)
+    
+    for j in prange(n_companies):
+        rsi = _rsi_kernel(np.ascontiguousarray(closes[:, j]), periods)
+        for i in range(n_dates - 1, -1, -1):
+            if not np.isnan(rsi[i]):
+                latest[j] = rsi[i]
+                break
+    
+    return latest
+
+
+def calculate_latest_rsi(prices, periods=None):
+    """
+    Calculate the latest valid RSI of every company.
+    
+    Args:
+        prices (pd.DataFrame): DataFrame with date index and one price column per company
+        periods (int, optional): The number of periods to use for RSI calculation, defaults to config.RSI_PERIOD
+        
+    Returns:
+        pd.Series: Latest RSI indexed by company, NaN for companies without enough history
+    """
+    if periods is None:
+        periods = config.RSI_PERIOD
+    
+    # All companies are handled in one parallel compiled pass when numba is
+    # installed; otherwise use the vectorized pandas RSI
+    if NUMBA_AVAILABLE:
+        latest = _latest_rsi_kernel(prices.to_numpy(dtype=np.float64), periods)
+        return pd.Series(latest, index=prices.columns)
+    
+    return calculate_rsi(prices, periods).ffill().iloc[-1]
+
+
+@njit(cache=True)
+def _ema(values, span):
+    """
+    Calculate the exponential moving average of one array in a single loop.
+    
+    Matches pandas' ewm(span=span, adjust=False, ignore_na=True).mean(): missing
+    values repeat the previous average instead of decaying it.
+    
+    Args:
+        values (np.ndarray): 1-D float64 array of values
+        span (int): The span of the moving average
+        
+    Returns:
+        np.ndarray: EMA values, NaN before the first non-missing value
+    """
+    alpha = 2.0 / (span + 1.0)
+    ema = np.full(values.size, np.nan)
+    average = np.nan
+    
+    for i in range(values.size):
+        value = values[i]
+        if not np.isnan(value):
+            if np.isnan(average):
+                average = value
+            else:
+                average = (1.0 - alpha) * average + alpha * value
+        ema[i] = average
+    
+    return ema
+
+
+@njit(cache=True)
+def _macd_kernel(close, fast_period, slow_period, signal_period):
+    """
+    Calculate the MACD of one price array with EMA recurrences.
+    
+    Produces the same values as the pandas implementation in calculate_macd.
+    
+    Args:
+        close (np.ndarray): 1-D float64 array of prices
+        fast_period (int): The period for the fast EMA
+        slow_period (int): The period for the slow EMA
+        signal_period (int): The period for the signal line
+        
+    Returns:
+        tuple: (MACD line, Signal line, MACD histogram) arrays
+    """
+    macd_line = _ema(close, fast_period) - _ema(close, slow_period)
+    for i in range(close.size):
+        if np.isnan(close[i]):
+            macd_line[i] = np.nan
+    
+    signal_line = _ema(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
 def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
     """
     Calculate the Moving Average Convergence Divergence (MACD) for a given price series.
     
     Args:
-        prices (list/Series): A list or pandas Series of price data
+        prices (list/Series/DataFrame): A list or pandas Series of price data, or a
+            DataFrame with one price column per company
         fast_period (int, optional): The period for the fast EMA, defaults to 12
         slow_period (int, optional): The period for the slow EMA, defaults to 26
         signal_period (int, optional): The period for the signal line, defaults to 9
         
     Returns:
-        tuple: (MACD line, Signal line, MACD histogram)
+        tuple: (MACD line, Signal line, MACD histogram), shaped like the input
     """
     # Convert to pandas Series if input is a list
-    if not isinstance(prices, pd.Series):
+    if not isinstance(prices, (pd.Series, pd.DataFrame)):
         prices = pd.Series(prices)
+    
+    # Single price series are handled by the compiled kernel when numba is
+    # installed
+    if NUMBA_AVAILABLE and isinstance(prices, pd.Series):
+        lines = _macd_kernel(prices.to_numpy(dtype=np.float64), fast_period, slow_period, signal_period)
+        return tuple(pd.Series(line, index=prices.index) for line in lines)
         
-    # Calculate fast and slow EMAs
-    ema_fast = prices.ewm(span=fast_period, adjust=False).mean()
-    ema_slow = prices.ewm(span=slow_period, adjust=False).mean()
+    # Calculate fast and slow EMAs; missing prices are skipped rather than
+    # decaying the average, so each DataFrame column matches the EMA of the
+    # company's own price series
+    ema_fast = prices.ewm(span=fast_period, adjust=False, ignore_na=True).mean()
+    ema_slow = prices.ewm(span=slow_period, adjust=False, ignore_na=True).mean()
     
-    # Calculate MACD line
-    macd_line = ema_fast - ema_slow
+    # Calculate MACD line (only where there is a price, so the gaps are
+    # skipped by the signal line EMA as well)
+    macd_line = (ema_fast - ema_slow).where(prices.notna())
     
     # Calculate Signal line
-    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal_period, adjust=False, ignore_na=True).mean()
     
     # Calculate MACD histogram
     macd_histogram = macd_line - signal_line
@@ -87,6 +266,62 @@ def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
     return macd_line, signal_line, macd_histogram
 
 
+@njit(cache=True)
+def _bollinger_kernel(close, window, num_std):
+    """
+    Calculate the Bollinger Bands of one price array in a single pass.
+    
+    The rolling mean and sample standard deviation are updated as prices enter
+    and leave the window (Welford's method, as pandas uses), so the cost does
+    not depend on the window size. Like calculate_bollinger_bands, there is no
+    value for windows with missing prices.
+    
+    Args:
+        close (np.ndarray): 1-D float64 array of prices
+        window (int): The moving average window
+        num_std (float): Number of standard deviations for the bands
+        
+    Returns:
+        tuple: (Upper band, Middle band, Lower band) arrays
+    """
+    n = close.size
+    upper = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    
+    nobs = 0
+    mean = 0.0
+    ssqdm = 0.0
+    for i in range(n):
+        value = close[i]
+        if not np.isnan(value):
+            nobs += 1
+            delta = value - mean
+            mean += delta / nobs
+            ssqdm += ((nobs - 1) * delta * delta) / nobs
+        
+        if i >= window:
+            old = close[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    ssqdm -= ((nobs + 1) * delta * delta) / nobs
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+        
+        if nobs == window:
+            # The sample standard deviation of a single price is undefined
+            std = np.sqrt(max(ssqdm, 0.0) / (nobs - 1)) if nobs > 1 else np.nan
+            middle[i] = mean
+            upper[i] = mean + std * num_std
+            lower[i] = mean - std * num_std
+    
+    return upper, middle, lower
+
+
 def calculate_bollinger_bands(prices, window=20, num_std=2):
     """
     Calculate Bollinger Bands for a given price series.
@@ -103,6 +338,11 @@ def calculate_bollinger_bands(prices, window=20, num_std=2):
     if not isinstance(prices, pd.Series):
         prices = pd.Series(prices)
     
+    # Use the compiled single-pass kernel when numba is installed
+    if NUMBA_AVAILABLE:
+        bands = _bollinger_kernel(prices.to_numpy(dtype=np.float64), window, num_std)
+        return tuple(pd.Series(band, index=prices.index) for band in bands)
+    
     # Calculate middle band (simple moving average)
     middle_band = prices.rolling(window=window).mean()
     
@@ -219,14 +459,15 @@ def calculate_average_volume(volumes, periods=20):
     Calculate average volume over a specified period.
     
     Args:
-        volumes (list/Series): A list or pandas Series of volume data
+        volumes (list/Series/DataFrame): A list or pandas Series of volume data, or a
+            DataFrame with one volume column per company
         periods (int, optional): The number of periods to average over, defaults to 20
         
     Returns:
-        pandas.Series: Average volume values
+        pandas.Series or pandas.DataFrame: Average volume values, shaped like the input
     """
     # Convert to pandas Series if input is a list
-    if not isinstance(volumes, pd.Series):
+    if not isinstance(volumes, (pd.Series, pd.DataFrame)):
         volumes = pd.Series(volumes)
         
     # Calculate moving average of volume
@@ -240,15 +481,16 @@ def is_volume_spike(volumes, threshold=2.0, periods=20):
     Detect volume spikes based on a threshold multiple of average volume.
     
     Args:
-        volumes (list/Series): A list or pandas Series of volume data
+        volumes (list/Series/DataFrame): A list or pandas Series of volume data, or a
+            DataFrame with one volume column per company
         threshold (float, optional): Multiple of average volume to consider a spike, defaults to 2.0
         periods (int, optional): The number of periods to average over, defaults to 20
         
     Returns:
-        pandas.Series: Boolean series indicating volume spikes
+        pandas.Series or pandas.DataFrame: Boolean values indicating volume spikes, shaped like the input
     """
     # Convert to pandas Series if input is a list
-    if not isinstance(volumes, pd.Series):
+    if not isinstance(volumes, (pd.Series, pd.DataFrame)):
         volumes = pd.Series(volumes)
         
     # Calculate average volume
@@ -272,7 +514,9 @@ def detect_circuit_breaker_events(prices, threshold=None):
         tuple: (Upper circuit events, Lower circuit events)
     """
     if threshold is None:
-        threshold = config.CIRCUIT_BREAKER_THRESHOLD
+        upper, lower = config.CIRCUIT_BREAKER_THRESHOLD.upper, config.CIRCUIT_BREAKER_THRESHOLD.lower
+    else:
+        upper, lower = threshold['upper'], threshold['lower']
         
     # Convert to pandas Series if input is a list
     if not isinstance(prices, pd.Series):
@@ -282,7 +526,7 @@ def detect_circuit_breaker_events(prices, threshold=None):
     returns = prices.pct_change()
     
     # Detect upper and lower circuit breaker events
-    upper_circuit = returns > threshold['upper']
-    lower_circuit = returns < threshold['lower']
+    upper_circuit = returns > upper
+    lower_circuit = returns < lower
     
     return upper_circuit, lower_circuit